@@ -33,6 +33,22 @@ class Settings(BaseModel):
     MAIL_PORT: int = int(os.getenv("MAIL_PORT", "587"))
     MAIL_SERVER: str = os.getenv("MAIL_SERVER", "smtp.gmail.com")
     
+    # Matching
+    MATCHING_CANDIDATE_INDEX_ENABLED: bool = os.getenv("MATCHING_CANDIDATE_INDEX_ENABLED", "false").lower() == "true"  # preselección por habilidades comunes
+    MATCHING_CANDIDATE_MIN: int = int(os.getenv("MATCHING_CANDIDATE_MIN", "50"))  # menos candidatos -> recorrido completo
+    MATCHING_CANDIDATE_RECALL_FACTOR: int = int(os.getenv("MATCHING_CANDIDATE_RECALL_FACTOR", "4"))  # candidatos mínimos por resultado pedido
+    MATCHING_SKILL_MATRICES_ENABLED: bool = os.getenv("MATCHING_SKILL_MATRICES_ENABLED", "false").lower() == "true"  # matrices CSR en memoria
+    MATCHING_LANGUAGE_FEATURES_ENABLED: bool = os.getenv("MATCHING_LANGUAGE_FEATURES_ENABLED", "false").lower() == "true"  # idiomas por usuario en memoria
+    MATCHING_PRUNING_ENABLED: bool = os.getenv("MATCHING_PRUNING_ENABLED", "false").lower() == "true"  # top-k con poda por cota superior
+    MATCHING_PRUNING_MIN_CANDIDATES: int = int(os.getenv("MATCHING_PRUNING_MIN_CANDIDATES", "500"))  # menos candidatos -> se puntúan todos
+    MATCHING_PROFILER_ENABLED: bool = os.getenv("MATCHING_PROFILER_ENABLED", "false").lower() == "true"  # cabecera X-Matching-Profile y métricas
+    MATCHING_ANN_ENABLED: bool = os.getenv("MATCHING_ANN_ENABLED", "false").lower() == "true"  # índice aproximado de mentores
+    MATCHING_ANN_INDEX_PATH: str = os.getenv("MATCHING_ANN_INDEX_PATH", "profile_embeddings.npz")
+    MATCHING_ANN_NPROBE: int = int(os.getenv("MATCHING_ANN_NPROBE", "16"))  # listas recorridas por consulta
+    MATCHING_ANN_CANDIDATE_FACTOR: int = int(os.getenv("MATCHING_ANN_CANDIDATE_FACTOR", "20"))  # candidatos re-puntuados por resultado pedido
+    MATCHING_LEARNED_WEIGHTS_ENABLED: bool = os.getenv("MATCHING_LEARNED_WEIGHTS_ENABLED", "false").lower() == "true"  # pesos aprendidos del feedback
+    MATCHING_WEIGHTS_DIR: str = os.getenv("MATCHING_WEIGHTS_DIR", "matching_weights")
+    
     # Firebase
     FIREBASE_CREDENTIALS_PATH: str = os.getenv("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
 
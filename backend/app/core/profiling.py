@@ -0,0 +1,157 @@
+"""
+Perfilado opcional de los componentes del emparejamiento.
+
+Los métodos instrumentados (`calculate_*`, `_calculate_*` y los que se indiquen) registran
+tiempo, número de llamadas y sentencias SQL solo cuando hay un perfil activo en el contexto
+de la petición. Sin perfil activo el coste es una lectura de ContextVar por llamada.
+"""
+import json
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PROFILE_HEADER = "X-Matching-Profile"
+PROFILED_PREFIXES = ("calculate_", "_calculate_")
+
+
+class RequestProfile:
+    """
+    Acumulado de una petición: por componente, llamadas, segundos y sentencias SQL.
+    El tiempo incluye las llamadas anidadas; cada sentencia se atribuye solo al componente
+    más interno en ejecución.
+    """
+
+    def __init__(self):
+        self.components: Dict[str, List[float]] = {}
+        self.stack: List[str] = []
+        self.queries = 0
+
+    def record(self, component: str, seconds: float) -> None:
+        stats = self.components.setdefault(component, [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += seconds
+
+    def count_query(self) -> None:
+        self.queries += 1
+        if self.stack:
+            self.components.setdefault(self.stack[-1], [0, 0.0, 0])[2] += 1
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            component: {"calls": int(calls), "ms": round(seconds * 1000, 3), "queries": int(queries)}
+            for component, (calls, seconds, queries) in sorted(self.components.items())
+        }
+
+    def header_value(self) -> str:
+        return json.dumps({"queries": self.queries, "components": self.as_dict()}, separators=(",", ":"))
+
+
+class ProfilerMetrics:
+    """Agregado en memoria del proceso de todos los perfiles registrados."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.components: Dict[str, List[float]] = {}
+
+    def record(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self.requests += 1
+            for component, (calls, seconds, queries) in profile.components.items():
+                stats = self.components.setdefault(component, [0, 0.0, 0, 0])
+                stats[0] += calls
+                stats[1] += seconds
+                stats[2] += queries
+                stats[3] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "components": {
+                    component: {
+                        "requests": int(requests),
+                        "calls": int(calls),
+                        "total_ms": round(seconds * 1000, 3),
+                        "mean_ms_per_request": round(seconds * 1000 / requests, 3),
+                        "queries": int(queries)
+                    }
+                    for component, (calls, seconds, queries, requests) in sorted(self.components.items())
+                }
+            }
+
+
+profiler_metrics = ProfilerMetrics()
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("matching_profile", default=None)
+
+
+@contextmanager
+def profile_scope() -> Iterator[RequestProfile]:
+    """Activa un perfil nuevo para el código ejecutado dentro del bloque."""
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def profiled(component: str):
+    """Decorador: registra la función como `component` en el perfil activo, si lo hay."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            profile.stack.append(component)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.record(component, time.perf_counter() - started)
+                profile.stack.pop()
+        return wrapper
+    return decorator
+
+
+def profile_components(*names: str):
+    """
+    Decorador de clase: instrumenta los métodos `calculate_*`/`_calculate_*` y los nombrados
+    en `names`. Los componentes se llaman `<módulo>.<Clase>.<método>` para distinguir clases
+    homónimas entre módulos.
+    """
+    def decorator(cls):
+        module = cls.__module__.rsplit(".", 1)[-1]
+        for name, attribute in list(vars(cls).items()):
+            if not (name.startswith(PROFILED_PREFIXES) or name in names):
+                continue
+            component = f"{module}.{cls.__name__}.{name}"
+            if isinstance(attribute, staticmethod):
+                setattr(cls, name, staticmethod(profiled(component)(attribute.__func__)))
+            elif callable(attribute):
+                setattr(cls, name, profiled(component)(attribute))
+        return cls
+    return decorator
+
+
+def _count_query(*args, **kwargs) -> None:
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.count_query()
+
+
+def install_query_counter() -> None:
+    """Cuenta las sentencias SQL de cualquier engine en el perfil activo."""
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import settings
 from app.core.database import engine
+from app.core.profiling import PROFILE_HEADER, profile_scope, profiler_metrics, install_query_counter
 from app.models.base import Base
 from app.routers import users, auth, matching, calendar, statistics
 
@@ -28,6 +30,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Perfilado de componentes del emparejamiento (solo si está activado)
+if settings.MATCHING_PROFILER_ENABLED:
+    install_query_counter()
+
+    @app.middleware("http")
+    async def matching_profiler(request, call_next):
+        with profile_scope() as profile:
+            response = await call_next(request)
+        if profile.components:
+            response.headers[PROFILE_HEADER] = profile.header_value()
+            profiler_metrics.record(profile)
+        return response
+
 # API Version prefix
 api_v1_prefix = "/api/v1"
 
@@ -1,7 +1,7 @@
 from .base import Base
 from .user import User, Mentor, Mentee
 from .skill import Skill, MentorSkill, MenteeInterest
-from .availability import Availability, CalendarIntegration  # Importar desde availability.py
+from .availability import Availability, AvailabilityBitmap, CalendarIntegration  # Importar desde availability.py
 from .session import Session, SessionFeedback
 from .notification import Notification
 
@@ -14,6 +14,7 @@ __all__ = [
     "MentorSkill",
     "MenteeInterest",
     "Availability",
+    "AvailabilityBitmap",
     "CalendarIntegration",
     "Session",
     "SessionFeedback",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -16,6 +16,15 @@ class Availability(Base, TimestampMixin):
     # Relaciones
     user = relationship("User", back_populates="availability")
 
+class AvailabilityBitmap(Base, TimestampMixin):
+    __tablename__ = "availability_bitmaps"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    season = Column(String, primary_key=True, default="january")  # Semana de referencia: "january" o "july"
+    timezone = Column(String)  # Zona horaria del usuario al compilar; si cambia, el mapa está obsoleto
+    bitmap = Column(LargeBinary, nullable=False)  # 672 bits en UTC: semana en franjas de 15 minutos
+    intervals = Column(JSON, nullable=False)  # [[inicio, fin], ...] en minutos UTC desde el domingo 00:00
+
 class CalendarIntegration(Base):
     __tablename__ = "calendar_integrations"
 
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, JSON, String, Text
+from sqlalchemy import Column, Integer, Float, ForeignKey, JSON, String, Text, Index
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
 class MatchScore(Base, TimestampMixin):
     __tablename__ = "match_scores"
+    __table_args__ = (
+        # Un registro por par; permite el upsert masivo de sugerencias
+        Index("uq_match_scores_pair", "mentor_id", "mentee_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mentor_id = Column(Integer, ForeignKey("users.id"))
@@ -30,7 +34,7 @@ class MatchPreference(Base):
     __tablename__ = "match_preferences"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     
     # Matching weights (0-1)
     skill_weight = Column(Float, default=0.3)
@@ -56,10 +60,72 @@ class MatchFeedback(Base, TimestampMixin):
 
     id = Column(Integer, primary_key=True, index=True)
     match_id = Column(Integer, ForeignKey("match_scores.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     rating = Column(Integer)  # 1-5 rating
     feedback = Column(Text)
     suggestions = Column(Text)
     
     match = relationship("MatchScore")
     user = relationship("User")
+
+class ProfileVersion(Base, TimestampMixin):
+    __tablename__ = "profile_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)  # Se incrementa con cada cambio de perfil
+
+class PairScore(Base, TimestampMixin):
+    __tablename__ = "pair_scores"
+
+    # Puntuaciones materializadas por par; válidas mientras coincidan las versiones de perfil
+    # y la variante de horario de verano (SEASON_WEEKS) con la que se compiló cada horario
+    scorer = Column(String, primary_key=True)  # "batch", "suggestions"
+    mentor_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    mentee_id = Column(Integer, ForeignKey("users.id"), primary_key=True, index=True)
+    mentor_version = Column(Integer, nullable=False)
+    mentee_version = Column(Integer, nullable=False)
+    mentor_season = Column(String, nullable=False, default="january")
+    mentee_season = Column(String, nullable=False, default="january")
+
+    skills_score = Column(Float)
+    language_score = Column(Float)
+    career_score = Column(Float)
+    industry_score = Column(Float)
+    style_score = Column(Float)
+    goals_score = Column(Float)
+    schedule_score = Column(Float)
+    profile_score = Column(Float)
+    total_score = Column(Float)
+
+class MentorSuccessStats(Base, TimestampMixin):
+    __tablename__ = "mentor_success_stats"
+
+    # Agregado mantenido en /matching/feedback y /matching/reject; se reconcilia periódicamente
+    mentor_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+    rejection_count = Column(Integer, nullable=False, default=0)
+
+class PairRejectionStats(Base, TimestampMixin):
+    __tablename__ = "pair_rejection_stats"
+
+    mentor_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    mentee_id = Column(Integer, ForeignKey("users.id"), primary_key=True, index=True)
+    rejection_count = Column(Integer, nullable=False, default=0)
+
+class TopMatch(Base, TimestampMixin):
+    __tablename__ = "top_matches"
+
+    # Mejores candidatos de cada usuario según la matriz completa mentores × mentiles.
+    # side = "mentee": mejores mentores de user_id; side = "mentor": mejores mentiles de user_id
+    side = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = mejor candidato
+    mentor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    mentee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    total_score = Column(Float)
+    skill_match_score = Column(Float)
+    availability_score = Column(Float)
+    style_match_score = Column(Float)
+    goals_alignment_score = Column(Float)
@@ -8,13 +8,14 @@ class Industry(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
+    category = Column(String, index=True)  # e.g., "Technical", "Leadership", matches MentorshipGoal.category
     description = Column(Text)
 
 class UserIndustryExperience(Base):
     __tablename__ = "user_industry_experience"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     industry_id = Column(Integer, ForeignKey("industries.id"))
     years_experience = Column(Integer, default=0)
     is_current = Column(Boolean, default=True)
@@ -33,7 +34,7 @@ class MentoringPreference(Base):
     __tablename__ = "mentoring_preferences"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     preferred_style = Column(Enum(MentoringStyle))
     structured_sessions = Column(Boolean, default=True)  # Prefers structured vs. informal sessions
     meeting_frequency = Column(Integer)  # Preferred meetings per month
@@ -47,7 +48,7 @@ class MentorshipGoal(Base):
     __tablename__ = "mentorship_goals"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     title = Column(String)
     description = Column(Text)
     timeline_months = Column(Integer)
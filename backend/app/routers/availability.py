@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 from app import schemas
 from app.core.database import get_db
 from app.models import Availability, User
+from app.services.availability_bitmap import AvailabilityBitmapService
+from app.services.pair_score_cache import bump_profile_version
 
 router = APIRouter()
 
@@ -58,6 +60,8 @@ def create_user_availability(
         **availability_in.dict()
     )
     db.add(availability)
+    bump_profile_version(db, user_id)
+    AvailabilityBitmapService(db).rebuild(user_id)
     db.commit()
     db.refresh(availability)
     return availability
@@ -99,6 +103,8 @@ def update_availability(
     for field, value in update_data.items():
         setattr(availability, field, value)
     
+    bump_profile_version(db, availability.user_id)
+    AvailabilityBitmapService(db).rebuild(availability.user_id)
     db.commit()
     db.refresh(availability)
     return availability
@@ -117,6 +123,9 @@ def delete_availability(
             detail="Availability not found",
         )
     
+    user_id = availability.user_id
     db.delete(availability)
+    bump_profile_version(db, user_id)
+    AvailabilityBitmapService(db).rebuild(user_id)
     db.commit()
     return availability
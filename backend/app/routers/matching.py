@@ -2,15 +2,27 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Any, List
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_admin_user
 from app.models.user import User
 from app.models.match_algorithm import MatchScore, MatchPreference, MatchFeedback
 from app.schemas.matching import (
     MatchPreferenceCreate, MatchPreferenceUpdate,
     MatchScoreCreate, MatchScore as MatchScoreSchema,
-    MatchFeedbackCreate, MatchFeedback as MatchFeedbackSchema
+    MatchFeedbackCreate, MatchFeedback as MatchFeedbackSchema,
+    CohortAssignmentRequest, CohortAssignmentResult, MatchExplanation,
+    SuggestionRerankRequest, WeightedMatch,
+    TopMatchesRequest, TopMatchesResult, TopMatch as TopMatchSchema,
+    WeightSimulationRequest, WeightSimulationResult
 )
 from app.services.matching import MatchingService
+from app.services.cohort_assignment import CohortAssignmentService
+from app.services.all_pairs import AllPairsService
+from app.services.mentor_success import MentorSuccessService
+from app.services.match_explanations import MatchExplainer
+from app.services.weighted_ranking import component_matrices, weight_vector
+from app.core.profiling import profiler_metrics
+from app.services.pruned_top_k import pruning_stats
+from app.services.weight_simulation import weight_simulators, GROUP_SIDES
 
 router = APIRouter()
 
@@ -30,6 +42,7 @@ def create_match_preferences(
     db_preferences = MatchPreference(user_id=user.id, **preferences.dict())
     db.add(db_preferences)
     db.commit()
+    component_matrices.invalidate(user.id)
     db.refresh(db_preferences)
     return db_preferences
 
@@ -53,6 +66,7 @@ def update_match_preferences(
         setattr(user_preferences, field, value)
     
     db.commit()
+    component_matrices.invalidate(user_preferences.user_id)
     db.refresh(user_preferences)
     return user_preferences
 
@@ -72,6 +86,33 @@ def get_match_suggestions(
     matches = matching_service.get_suggestions(user)
     return matches
 
+@router.post("/suggestions/rerank", response_model=List[WeightedMatch])
+def rerank_match_suggestions(
+    request: SuggestionRerankRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Re-rank the current user's candidates with a different weight vector, using the in-memory
+    component matrix built for the same limit. Nothing is persisted. The matrix lives in this
+    worker only, so after a preference or match status change handled by another worker it
+    can be up to MATRIX_MAX_AGE seconds stale.
+    """
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if request.weights is not None:
+        weights = weight_vector(request.weights.dict())
+    else:
+        weights = weight_vector(db.query(MatchPreference).filter(MatchPreference.user_id == user.id).first())
+    
+    matching_service = MatchingService(db)
+    matrix = component_matrices.get(
+        user.id, lambda: matching_service.build_component_matrix(user, request.limit), recall=request.limit
+    )
+    return matching_service.rank(matrix, weights, request.limit)
+
 @router.post("/accept/{match_id}", response_model=MatchScoreSchema)
 def accept_match(
     match_id: int,
@@ -89,8 +130,11 @@ def accept_match(
     if current_user["user_id"] not in [match.mentor_id, match.mentee_id]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    MentorSuccessService(db).record_status_change(match.mentor_id, match.mentee_id, match.status, "accepted")
     match.status = "accepted"
     db.commit()
+    component_matrices.invalidate(match.mentor_id)
+    component_matrices.invalidate(match.mentee_id)
     db.refresh(match)
     return match
 
@@ -111,11 +155,43 @@ def reject_match(
     if current_user["user_id"] not in [match.mentor_id, match.mentee_id]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    MentorSuccessService(db).record_status_change(match.mentor_id, match.mentee_id, match.status, "rejected")
     match.status = "rejected"
     db.commit()
+    component_matrices.invalidate(match.mentor_id)
+    component_matrices.invalidate(match.mentee_id)
     db.refresh(match)
     return match
 
+@router.get("/{match_id}/explain", response_model=MatchExplanation)
+def explain_match(
+    match_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Explain a match: shared skills and weekly hours of common availability, computed on demand.
+    """
+    match = db.query(MatchScore).filter(MatchScore.id == match_id).first()
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    
+    # Verificar que el usuario es parte del match
+    if current_user.id not in [match.mentor_id, match.mentee_id]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    return {
+        "match_id": match.id,
+        "mentor_id": match.mentor_id,
+        "mentee_id": match.mentee_id,
+        "total_score": match.total_score,
+        "skill_match_score": match.skill_match_score,
+        "availability_score": match.availability_score,
+        "style_match_score": match.style_match_score,
+        "goals_alignment_score": match.goals_alignment_score,
+        "match_details": {**(match.match_details or {}), **MatchExplainer(db).explain(match.mentor_id, match.mentee_id)}
+    }
+
 @router.post("/feedback", response_model=MatchFeedbackSchema)
 def create_match_feedback(
     feedback: MatchFeedbackCreate,
@@ -138,6 +214,115 @@ def create_match_feedback(
         **feedback.dict()
     )
     db.add(db_feedback)
+    MentorSuccessService(db).record_feedback(match.mentor_id, feedback.rating)
     db.commit()
     db.refresh(db_feedback)
     return db_feedback
+
+@router.post("/cohort-assignment", response_model=CohortAssignmentResult)
+def assign_cohort(
+    request: CohortAssignmentRequest,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Assign a cohort of mentees to mentors respecting each mentor's free capacity (admin only).
+    """
+    return CohortAssignmentService(db).assign(
+        mentee_ids=request.mentee_ids,
+        mentor_ids=request.mentor_ids,
+        min_score=request.min_score,
+        persist=request.persist
+    )
+
+@router.post("/top-matches", response_model=TopMatchesResult)
+def compute_top_matches(
+    request: TopMatchesRequest,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Recompute the platform-wide best mentors per mentee and best mentees per mentor from the
+    full compatibility matrix, replacing the stored lists (admin only).
+    """
+    result = AllPairsService(db).compute(k=request.k, block_size=request.block_size)
+    db.commit()
+    return result
+
+@router.get("/top-matches/mentee/{mentee_id}", response_model=List[TopMatchSchema])
+def get_top_mentors(
+    mentee_id: int,
+    limit: int = 10,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Stored best mentors for a mentee, from the last all-pairs computation (admin only).
+    """
+    return AllPairsService(db).top_for_mentee(mentee_id, limit)
+
+@router.get("/top-matches/mentor/{mentor_id}", response_model=List[TopMatchSchema])
+def get_top_mentees(
+    mentor_id: int,
+    limit: int = 10,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Stored best mentees for a mentor, from the last all-pairs computation (admin only).
+    """
+    return AllPairsService(db).top_for_mentor(mentor_id, limit)
+
+@router.post("/simulate", response_model=WeightSimulationResult)
+def simulate_weights(
+    request: WeightSimulationRequest,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Offline precision@k and NDCG@k of each candidate weight vector when re-ranking the historical
+    matches of every mentee (or mentor), next to the default weights (admin only). Nothing is persisted.
+    """
+    if request.group_by not in GROUP_SIDES:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(GROUP_SIDES)}")
+    if request.k <= 0:
+        raise HTTPException(status_code=400, detail="k must be positive")
+    simulator = weight_simulators.get(db, request.group_by)
+    return simulator.simulate([weights.dict() for weights in request.weights], k=request.k)
+
+@router.get("/profiler")
+def get_profiler_metrics(
+    current_user: User = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Per-component scoring time, calls and SQL statements aggregated since the last reset (admin only).
+    Empty unless MATCHING_PROFILER_ENABLED is set.
+    """
+    return profiler_metrics.snapshot()
+
+@router.delete("/profiler", status_code=status.HTTP_204_NO_CONTENT)
+def reset_profiler_metrics(
+    current_user: User = Depends(get_current_admin_user)
+) -> None:
+    """
+    Reset the aggregated profiler metrics (admin only).
+    """
+    profiler_metrics.reset()
+
+@router.get("/pruning")
+def get_pruning_stats(
+    current_user: User = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Candidates seen, fully scored and pruned by the top-k searches since the last reset (admin only).
+    """
+    return pruning_stats.snapshot()
+
+@router.delete("/pruning", status_code=status.HTTP_204_NO_CONTENT)
+def reset_pruning_stats(
+    current_user: User = Depends(get_current_admin_user)
+) -> None:
+    """
+    Reset the pruning counters (admin only).
+    """
+    pruning_stats.reset()
@@ -1,6 +1,8 @@
 from typing import Any, List, Dict
+import json
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -24,6 +26,8 @@ def find_matches_for_mentee(
         )
     
     matches = MatchmakingService.find_matches_for_mentee(mentee_id, db, limit)
+    # Guarda las puntuaciones por par recalculadas; la caché solo hace flush
+    db.commit()
     return matches
 
 @router.get("/mentor/{mentor_id}", response_model=List[Dict[str, Any]])
@@ -41,4 +45,41 @@ def find_matches_for_mentor(
         )
     
     matches = MatchmakingService.find_matches_for_mentor(mentor_id, db, limit)
+    # Guarda las puntuaciones por par recalculadas; la caché solo hace flush
+    db.commit()
     return matches
+
+@router.get("/mentor/{mentor_id}/stream")
+def stream_matches_for_mentor(
+    mentor_id: int,
+    limit: int = 5,
+    chunk_size: int = Query(500, ge=1),
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Stream the best mentee matches for a mentor as NDJSON or server-sent events.
+    Each event carries the current top matches after scoring another chunk of candidates.
+    """
+    mentor = db.query(Mentor).filter(Mentor.user_id == mentor_id).first()
+    if not mentor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Mentor not found",
+        )
+    
+    def events():
+        # get_db cierra la sesión antes de enviar la respuesta; una sesión cerrada se puede
+        # reutilizar, así que el stream la sigue usando y la vuelve a cerrar al terminar
+        try:
+            for event in MatchmakingService.stream_matches_for_mentor(mentor_id, db, limit, chunk_size):
+                if stream_format == "sse":
+                    yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+                else:
+                    yield json.dumps(event) + "\n"
+            db.commit()
+        finally:
+            db.close()
+    
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type)
@@ -6,6 +6,9 @@ from sqlalchemy.orm import Session, joinedload
 from app import schemas
 from app.core.database import get_db
 from app.models import Skill, MentorSkill, MenteeInterest, Mentor, Mentee
+from app.services.skill_index import skill_index
+from app.services.skill_matrices import skill_matrices
+from app.services.pair_score_cache import bump_profile_version
 
 router = APIRouter()
 
@@ -170,8 +173,11 @@ def add_mentor_skill(
         proficiency_level=skill_in.proficiency_level
     )
     db.add(mentor_skill)
+    bump_profile_version(db, mentor_id)
     db.commit()
     db.refresh(mentor_skill)
+    skill_index.add_mentor_skill(mentor_id, skill_in.skill_id)
+    skill_matrices.set_mentor_skill(mentor_id, skill_in.skill_id, mentor_skill.proficiency_level)
     return mentor_skill
 
 @router.put("/mentor/{mentor_id}/{skill_id}", response_model=schemas.MentorSkill)
@@ -196,8 +202,10 @@ def update_mentor_skill(
     for field, value in update_data.items():
         setattr(mentor_skill, field, value)
     
+    bump_profile_version(db, mentor_id)
     db.commit()
     db.refresh(mentor_skill)
+    skill_matrices.set_mentor_skill(mentor_id, skill_id, mentor_skill.proficiency_level)
     return mentor_skill
 
 @router.delete("/mentor/{mentor_id}/{skill_id}", response_model=schemas.MentorSkill)
@@ -219,7 +227,10 @@ def delete_mentor_skill(
         )
     
     db.delete(mentor_skill)
+    bump_profile_version(db, mentor_id)
     db.commit()
+    skill_index.remove_mentor_skill(mentor_id, skill_id)
+    skill_matrices.remove_mentor_skill(mentor_id, skill_id)
     return mentor_skill
 
 @router.post("/mentee/{mentee_id}", response_model=schemas.MenteeInterest)
@@ -261,8 +272,11 @@ def add_mentee_interest(
         interest_level=interest_in.interest_level
     )
     db.add(mentee_interest)
+    bump_profile_version(db, mentee_id)
     db.commit()
     db.refresh(mentee_interest)
+    skill_index.add_mentee_interest(mentee_id, interest_in.skill_id)
+    skill_matrices.set_mentee_interest(mentee_id, interest_in.skill_id, mentee_interest.interest_level)
     return mentee_interest
 
 @router.put("/mentee/{mentee_id}/{skill_id}", response_model=schemas.MenteeInterest)
@@ -287,8 +301,10 @@ def update_mentee_interest(
     for field, value in update_data.items():
         setattr(mentee_interest, field, value)
     
+    bump_profile_version(db, mentee_id)
     db.commit()
     db.refresh(mentee_interest)
+    skill_matrices.set_mentee_interest(mentee_id, skill_id, mentee_interest.interest_level)
     return mentee_interest
 
 @router.delete("/mentee/{mentee_id}/{skill_id}", response_model=schemas.MenteeInterest)
@@ -310,5 +326,8 @@ def delete_mentee_interest(
         )
     
     db.delete(mentee_interest)
+    bump_profile_version(db, mentee_id)
     db.commit()
+    skill_index.remove_mentee_interest(mentee_id, skill_id)
+    skill_matrices.remove_mentee_interest(mentee_id, skill_id)
     return mentee_interest
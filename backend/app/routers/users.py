@@ -4,6 +4,10 @@ from typing import Any, List
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User, Mentor, Mentee
+from app.services.skill_index import skill_index
+from app.services.language_features import language_features
+from app.services.pair_score_cache import bump_profile_version
+from app.services.availability_bitmap import AvailabilityBitmapService
 from app.schemas.user import (
     UserUpdate, UserComplete, 
     MentorProfileCreate, MentorProfileUpdate,
@@ -38,11 +42,17 @@ def update_user_me(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    for field, value in user_in.dict(exclude_unset=True).items():
+    changes = user_in.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(user, field, value)
     
+    bump_profile_version(db, user.id)
+    if "timezone" in changes:
+        AvailabilityBitmapService(db).rebuild(user.id)
     db.commit()
     db.refresh(user)
+    if "languages" in changes:
+        language_features.set_languages(user.id, user.languages)
     return user
 
 @router.post("/me/mentor-profile", response_model=UserComplete)
@@ -62,8 +72,10 @@ def create_mentor_profile(
     
     mentor = Mentor(user_id=user.id, **profile.dict())
     db.add(mentor)
+    bump_profile_version(db, user.id)
     db.commit()
     db.refresh(user)
+    skill_index.refresh_user(db, user.id)
     return user
 
 @router.put("/me/mentor-profile", response_model=UserComplete)
@@ -82,8 +94,10 @@ def update_mentor_profile(
     for field, value in profile.dict(exclude_unset=True).items():
         setattr(user.mentor, field, value)
     
+    bump_profile_version(db, user.id)
     db.commit()
     db.refresh(user)
+    skill_index.refresh_user(db, user.id)
     return user
 
 @router.post("/me/mentee-profile", response_model=UserComplete)
@@ -103,8 +117,10 @@ def create_mentee_profile(
     
     mentee = Mentee(user_id=user.id, **profile.dict())
     db.add(mentee)
+    bump_profile_version(db, user.id)
     db.commit()
     db.refresh(user)
+    skill_index.refresh_user(db, user.id)
     return user
 
 @router.put("/me/mentee-profile", response_model=UserComplete)
@@ -123,8 +139,10 @@ def update_mentee_profile(
     for field, value in profile.dict(exclude_unset=True).items():
         setattr(user.mentee, field, value)
     
+    bump_profile_version(db, user.id)
     db.commit()
     db.refresh(user)
+    skill_index.refresh_user(db, user.id)
     return user
 
 @router.get("/mentors", response_model=List[UserComplete])
@@ -62,4 +62,86 @@ class MatchFeedback(MatchFeedbackBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True  # Actualizado de orm_mode a from_attributes
\ No newline at end of file
+        from_attributes = True  # Actualizado de orm_mode a from_attributes
+
+class CohortAssignmentRequest(BaseModel):
+    mentee_ids: Optional[List[int]] = None  # None = todos los mentiles
+    mentor_ids: Optional[List[int]] = None  # None = todos los mentores
+    min_score: float = 0.0
+    persist: bool = True
+
+class WeightedMatch(BaseModel):
+    mentor_id: int
+    mentee_id: int
+    total_score: float
+    skill_match_score: float
+    availability_score: float
+    style_match_score: float
+    goals_alignment_score: float
+
+class CohortAssignment(WeightedMatch):
+    pass
+
+class CohortAssignmentResult(BaseModel):
+    assignments: List[CohortAssignment]
+    unassigned_mentee_ids: List[int]
+    total_score: float
+    mentor_count: int
+    mentee_count: int
+
+class TopMatchesRequest(BaseModel):
+    k: int = 10  # Candidatos guardados por usuario en cada lado
+    block_size: int = 256
+
+class TopMatchesResult(BaseModel):
+    mentor_count: int
+    mentee_count: int
+    k: int
+    rows_written: int
+
+class TopMatch(WeightedMatch):
+    rank: int
+
+    class Config:
+        from_attributes = True
+
+class MatchExplanation(BaseModel):
+    match_id: int
+    mentor_id: int
+    mentee_id: int
+    total_score: Optional[float] = None
+    skill_match_score: Optional[float] = None
+    availability_score: Optional[float] = None
+    style_match_score: Optional[float] = None
+    goals_alignment_score: Optional[float] = None
+    match_details: Dict
+
+class MatchWeights(BaseModel):
+    skill_weight: Optional[float] = None
+    availability_weight: Optional[float] = None
+    style_weight: Optional[float] = None
+    goals_weight: Optional[float] = None
+
+class SuggestionRerankRequest(BaseModel):
+    weights: Optional[MatchWeights] = None  # None = pesos guardados en las preferencias del usuario
+    limit: int = 5
+
+class WeightSimulationRequest(BaseModel):
+    weights: List[MatchWeights]  # Vectores candidatos; los pesos que faltan toman el valor por defecto
+    k: int = 5
+    group_by: str = "mentee"  # Usuario que recibe la lista: "mentee" o "mentor"
+
+class WeightSimulationMetrics(BaseModel):
+    weights: Dict[str, float]  # Normalizados (suma 1)
+    precision_at_k: float
+    ndcg_at_k: float
+
+class WeightSimulationResult(BaseModel):
+    group_by: str
+    k: int
+    pairs: int  # Pares históricos con resultado
+    groups: int
+    base_rate: float  # Tasa de éxito de todos los pares con resultado
+    baseline: WeightSimulationMetrics  # Pesos por defecto
+    results: List[WeightSimulationMetrics]
+    seconds: float
@@ -0,0 +1,135 @@
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.match_algorithm import TopMatch
+from app.services.batch_scoring import BatchScoringService
+from app.services.match_exclusions import MatchExclusions
+from app.services.match_store import SCORE_COLUMNS
+
+DEFAULT_TOP_K = 10
+
+# Filas por sentencia INSERT al guardar las listas
+INSERT_CHUNK = 5000
+
+
+class AllPairsService:
+    """
+    Matriz completa de compatibilidad mentores × mentiles calculada por bloques de mentiles.
+    En una sola pasada se obtienen los mejores mentores de cada mentil (por filas) y los
+    mejores mentiles de cada mentor (por columnas, fusionando el top-k acumulado con cada
+    bloque), sin materializar nunca la matriz completa.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.engine = BatchScoringService(db)
+
+    def compute(
+        self,
+        k: int = DEFAULT_TOP_K,
+        block_size: int = 256,
+        mentor_ids: Optional[List[int]] = None,
+        mentee_ids: Optional[List[int]] = None,
+        persist: bool = True
+    ) -> Dict:
+        """
+        Calcula el top-k de ambos lados. Los pares activos, rechazados o excluidos no entran
+        en ninguna lista. Si persist es True, las listas sustituyen a las guardadas en TopMatch;
+        con un subconjunto de ids solo se sustituyen las de esos usuarios. No hace commit.
+        """
+        pool = self.engine.load_pool(mentor_ids, mentee_ids)
+        mentors, mentees = pool.mentors, pool.mentees
+        exclusions = MatchExclusions.load_for_users(self.db, mentors.user_ids.tolist(), mentees.user_ids.tolist())
+
+        # Top-k acumulado por mentor (k × mentores); fila de mentil -1 = hueco libre
+        column_rows = np.full((k, len(mentors)), -1, dtype=np.int64)
+        column_scores = {key: np.full((k, len(mentors)), -np.inf, dtype=np.float32) for key in SCORE_COLUMNS.values()}
+        rows: List[Dict] = []
+
+        for start in range(0, len(mentees), block_size):
+            block_rows = np.arange(start, min(start + block_size, len(mentees)))
+            block = mentees.take(block_rows)
+            scores = self.engine.score_block(mentors, block)
+            scores["total"] = np.where(
+                exclusions.mask(mentors.user_ids, block.user_ids), -np.inf, scores["total"]
+            ).astype(np.float32)
+
+            # Por filas: mejores mentores de cada mentil del bloque
+            order = np.argsort(-scores["total"], axis=1, kind="stable")[:, :k]
+            best = {key: np.take_along_axis(scores[key], order, axis=1) for key in SCORE_COLUMNS.values()}
+            for i, mentee_id in enumerate(block.user_ids):
+                rows.extend(self._rows("mentee", int(mentee_id), mentors.user_ids[order[i]], [mentee_id],
+                                       {key: values[i] for key, values in best.items()}))
+
+            # Por columnas: el top-k acumulado va primero, así los empates conservan el mentil de menor id
+            candidate_rows = np.concatenate([column_rows, np.broadcast_to(block_rows[:, None], scores["total"].shape)])
+            candidate_scores = {
+                key: np.concatenate([column_scores[key], scores[key]]) for key in SCORE_COLUMNS.values()
+            }
+            order = np.argsort(-candidate_scores["total"], axis=0, kind="stable")[:k]
+            column_rows = np.take_along_axis(candidate_rows, order, axis=0)
+            column_scores = {
+                key: np.take_along_axis(values, order, axis=0) for key, values in candidate_scores.items()
+            }
+
+        for j, mentor_id in enumerate(mentors.user_ids):
+            filled = column_rows[:, j] >= 0
+            rows.extend(self._rows("mentor", int(mentor_id), [mentor_id], mentees.user_ids[column_rows[filled, j]],
+                                   {key: values[filled, j] for key, values in column_scores.items()}))
+
+        if persist:
+            subset = mentor_ids is not None or mentee_ids is not None
+            self._write(rows, (mentors.user_ids.tolist(), mentees.user_ids.tolist()) if subset else None)
+
+        return {
+            "mentor_count": len(mentors),
+            "mentee_count": len(mentees),
+            "k": k,
+            "rows_written": len(rows) if persist else 0
+        }
+
+    @staticmethod
+    def _rows(side: str, user_id: int, mentor_ids, mentee_ids, scores: Dict[str, np.ndarray]) -> List[Dict]:
+        """Filas de TopMatch de una lista ya ordenada; los candidatos excluidos (-inf) se descartan."""
+        valid = np.isfinite(scores["total"])
+        mentor_ids = np.broadcast_to(mentor_ids, valid.shape)
+        mentee_ids = np.broadcast_to(mentee_ids, valid.shape)
+        return [
+            {
+                "side": side,
+                "user_id": user_id,
+                "rank": rank,
+                "mentor_id": int(mentor_ids[position]),
+                "mentee_id": int(mentee_ids[position]),
+                **{column: float(scores[key][position]) for column, key in SCORE_COLUMNS.items()}
+            }
+            for rank, position in enumerate(np.flatnonzero(valid))
+        ]
+
+    def _write(self, rows: List[Dict], users: Optional[Tuple[List[int], List[int]]] = None) -> None:
+        """Sustituye las listas guardadas: todas, o solo las de (mentores, mentiles) de users. Solo flush."""
+        if users is None:
+            self.db.query(TopMatch).delete(synchronize_session=False)
+        else:
+            for side, user_ids in zip(("mentor", "mentee"), users):
+                for start in range(0, len(user_ids), INSERT_CHUNK):
+                    self.db.query(TopMatch).filter(
+                        TopMatch.side == side, TopMatch.user_id.in_(user_ids[start:start + INSERT_CHUNK])
+                    ).delete(synchronize_session=False)
+        for start in range(0, len(rows), INSERT_CHUNK):
+            self.db.execute(insert(TopMatch), rows[start:start + INSERT_CHUNK])
+        self.db.flush()
+
+    def top_for_mentee(self, mentee_id: int, limit: int = DEFAULT_TOP_K) -> List[TopMatch]:
+        """Mejores mentores guardados para un mentil."""
+        return self._top("mentee", mentee_id, limit)
+
+    def top_for_mentor(self, mentor_id: int, limit: int = DEFAULT_TOP_K) -> List[TopMatch]:
+        """Mejores mentiles guardados para un mentor."""
+        return self._top("mentor", mentor_id, limit)
+
+    def _top(self, side: str, user_id: int, limit: int) -> List[TopMatch]:
+        return self.db.query(TopMatch).filter(
+            TopMatch.side == side, TopMatch.user_id == user_id
+        ).order_by(TopMatch.rank).limit(limit).all()
@@ -0,0 +1,290 @@
+from typing import List, Dict, Iterable, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.availability import Availability, AvailabilityBitmap
+
+# Semana completa a resolución de 15 minutos: 7 días × 96 franjas = 672 bits (84 bytes)
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = 7 * SLOTS_PER_DAY
+BITMAP_BYTES = WEEK_SLOTS // 8
+
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+# Semanas de referencia (empiezan en domingo, día 0) de las variantes de horario de verano.
+# Enero es horario de invierno en el hemisferio norte y de verano en el sur; julio, al revés.
+SEASON_WEEKS = {"january": date(2024, 1, 7), "july": date(2024, 7, 7)}
+DEFAULT_SEASON = "january"
+
+# Número de bits a 1 de cada byte, para contar bits sobre arreglos uint8
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+# (intervalos UTC [inicio, fin) en minutos de la semana, mapa de bits empaquetado)
+Compiled = Tuple[List[Tuple[int, int]], bytes]
+
+
+def time_to_minutes(time_str: str) -> int:
+    """Convierte una hora en formato HH:MM a minutos desde medianoche."""
+    hours, minutes = map(int, time_str.split(':'))
+    return hours * 60 + minutes
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: Optional[str]):
+    """Zona horaria IANA por nombre; UTC si no hay nombre o no se reconoce."""
+    if not name:
+        return dt_timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return dt_timezone.utc
+
+
+@lru_cache(maxsize=65536)
+def utc_offset(timezone: Optional[str], season: str, minute: int) -> int:
+    """Desfase UTC en minutos de la zona en el minuto local `minute` de la semana de referencia."""
+    local = datetime.combine(SEASON_WEEKS[season], time()) + timedelta(minutes=minute)
+    return int(local.replace(tzinfo=get_zone(timezone)).utcoffset().total_seconds()) // 60
+
+
+def current_season(timezone: Optional[str], moment: Optional[datetime] = None) -> str:
+    """Variante cuyo desfase coincide con el de la zona en `moment` (ahora, por defecto)."""
+    moment = moment or datetime.now(dt_timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt_timezone.utc)
+    offset = int(moment.astimezone(get_zone(timezone)).utcoffset().total_seconds()) // 60
+    for season in SEASON_WEEKS:
+        if utc_offset(timezone, season, 3 * DAY_MINUTES + 12 * 60) == offset:
+            return season
+    return DEFAULT_SEASON
+
+
+def week_intervals(intervals: Iterable[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """
+    Franjas (día, minuto inicial, minuto final) como intervalos [inicio, fin) en minutos desde
+    el domingo 00:00. Si el final es anterior al inicio la franja continúa en el día siguiente,
+    y el fin puede pasar de WEEK_MINUTES cuando la franja cruza el final de la semana.
+    """
+    result = []
+    for day, start, end in intervals:
+        day, start, end = int(day), int(start), int(end)
+        if end <= start:
+            end += DAY_MINUTES
+        result.append((day * DAY_MINUTES + start, day * DAY_MINUTES + end))
+    return result
+
+
+def to_utc(intervals: Iterable[Tuple[int, int, int]], timezone: Optional[str] = None,
+           season: str = DEFAULT_SEASON) -> List[Tuple[int, int]]:
+    """
+    Franjas locales (día, minuto inicial, minuto final) de un usuario en `timezone` como
+    intervalos semanales UTC, con el desfase de la zona en la semana de referencia de `season`.
+    El inicio queda en [0, WEEK_MINUTES); el intervalo conserva su duración.
+    """
+    result = []
+    for start, end in week_intervals(intervals):
+        utc_start = (start - utc_offset(timezone, season, start)) % WEEK_MINUTES
+        result.append((utc_start, utc_start + end - start))
+    return result
+
+
+def compile_week(intervals: Iterable[Tuple[int, int]]) -> np.ndarray:
+    """
+    Compila intervalos [inicio, fin) en minutos de la semana en un mapa de bits empaquetado.
+    Los límites se redondean hacia fuera a la franja de 15 minutos.
+    """
+    bits = np.zeros(WEEK_SLOTS, dtype=bool)
+    for start, end in intervals:
+        bits[np.arange(start // SLOT_MINUTES, -(-end // SLOT_MINUTES)) % WEEK_SLOTS] = True
+    return np.packbits(bits)
+
+
+def compile_intervals(intervals: Iterable[Tuple[int, int, int]]) -> np.ndarray:
+    """
+    Compila franjas (día, minuto inicial, minuto final) en un mapa de bits semanal empaquetado.
+    Los límites se redondean hacia fuera a la franja de 15 minutos; si el final es anterior
+    al inicio la franja continúa en el día siguiente.
+    """
+    return compile_week(week_intervals(intervals))
+
+
+def slot_intervals(slots: Iterable[Availability]) -> List[Tuple[int, int, int]]:
+    """Filas de Availability como franjas locales (día, minuto inicial, minuto final)."""
+    return [
+        (slot.day_of_week, time_to_minutes(slot.start_time), time_to_minutes(slot.end_time))
+        for slot in slots
+    ]
+
+
+def compile_availability(slots: Iterable[Availability], timezone: Optional[str] = None,
+                         season: str = DEFAULT_SEASON) -> np.ndarray:
+    """Compila las filas de Availability de un usuario en su mapa de bits semanal en UTC."""
+    return compile_week(to_utc(slot_intervals(slots), timezone, season))
+
+
+def week_overlaps(a_start, a_end, b_start, b_end) -> np.ndarray:
+    """
+    Solapamiento de intervalos semanales [inicio, fin) con difusión de numpy. Los intervalos
+    que cruzan el final de la semana se comparan también desplazados una semana.
+    """
+    overlaps = np.maximum(a_start, b_start) < np.minimum(a_end, b_end)
+    if (np.asarray(a_end) > WEEK_MINUTES).any():
+        overlaps |= np.maximum(a_start, b_start + WEEK_MINUTES) < np.minimum(a_end, b_end + WEEK_MINUTES)
+    if (np.asarray(b_end) > WEEK_MINUTES).any():
+        overlaps |= np.maximum(a_start, b_start - WEEK_MINUTES) < np.minimum(a_end, b_end - WEEK_MINUTES)
+    return overlaps
+
+
+def day_counts(intervals: Iterable[Tuple[int, int]]) -> np.ndarray:
+    """Intervalos que tocan cada día de la semana; uno que cruza medianoche cuenta en ambos días."""
+    counts = np.zeros(7, dtype=np.float32)
+    for start, end in intervals:
+        counts[np.unique(np.arange(start // DAY_MINUTES, -(-end // DAY_MINUTES)) % 7)] += 1
+    return counts
+
+
+def popcount(bitmaps: np.ndarray) -> np.ndarray:
+    """Bits a 1 en cada mapa (última dimensión = bytes)."""
+    return POPCOUNT[bitmaps].sum(axis=-1)
+
+
+def overlap_slots(query: np.ndarray, bitmaps: np.ndarray) -> np.ndarray:
+    """Franjas comunes entre un mapa (o varios) y una matriz de mapas, en una sola llamada."""
+    return popcount(np.bitwise_and(query, bitmaps))
+
+
+def union_slots(query: np.ndarray, bitmaps: np.ndarray) -> np.ndarray:
+    return popcount(np.bitwise_or(query, bitmaps))
+
+
+def jaccard(query: np.ndarray, bitmaps: np.ndarray) -> np.ndarray:
+    """Índice de Jaccard entre mapas de bits; 0 cuando ambos están vacíos."""
+    overlap = overlap_slots(query, bitmaps).astype(np.float64)
+    union = union_slots(query, bitmaps).astype(np.float64)
+    return np.divide(overlap, union, out=np.zeros_like(overlap), where=union > 0)
+
+
+class AvailabilityBitmapService:
+    """
+    Mantiene la disponibilidad semanal de cada usuario compilada a UTC: intervalos en minutos
+    de la semana y mapa de bits, con una variante por semana de referencia (SEASON_WEEKS).
+    Se compila y se guarda al cambiar la disponibilidad o la zona horaria (rebuild, dentro de
+    la transacción del cambio); al leer se elige la variante vigente de la zona de cada usuario,
+    así que comparar dos usuarios es una operación entera o de bits, sin conversiones de zona.
+    Las lecturas nunca escriben: lo que falta o quedó obsoleto se compila solo en memoria.
+    """
+
+    def __init__(self, db: Session, moment: Optional[datetime] = None):
+        self.db = db
+        self.moment = moment
+
+    def get_compiled(self, user_ids: Iterable[int]) -> Dict[int, Compiled]:
+        """
+        Intervalos UTC y mapa de bits de la variante vigente de cada usuario. Los que aún no
+        existen, o se compilaron con otra zona horaria, se compilan en memoria a partir de
+        Availability, sin guardarlos.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return {}
+
+        stored: Dict[int, Dict[str, Compiled]] = {}
+        timezones: Dict[int, Optional[str]] = {}
+        stale = set()
+        for row in self.db.query(
+            AvailabilityBitmap.user_id, AvailabilityBitmap.season, AvailabilityBitmap.timezone,
+            AvailabilityBitmap.intervals, AvailabilityBitmap.bitmap, User.timezone.label("user_timezone")
+        ).join(User, User.id == AvailabilityBitmap.user_id).filter(AvailabilityBitmap.user_id.in_(user_ids)):
+            timezones[row.user_id] = row.user_timezone
+            if row.timezone != row.user_timezone:
+                stale.add(row.user_id)
+            stored.setdefault(row.user_id, {})[row.season] = (
+                [tuple(interval) for interval in row.intervals], row.bitmap
+            )
+
+        missing = [user_id for user_id in user_ids if user_id not in stored or user_id in stale
+                   or len(stored[user_id]) < len(SEASON_WEEKS)]
+        if missing:
+            for user_id, (timezone, variants) in self._compile(missing).items():
+                timezones[user_id] = timezone
+                stored[user_id] = variants
+
+        seasons: Dict[Optional[str], str] = {}
+        result = {}
+        for user_id, variants in stored.items():
+            timezone = timezones[user_id]
+            if timezone not in seasons:
+                seasons[timezone] = current_season(timezone, self.moment)
+            result[user_id] = variants[seasons[timezone]]
+        return result
+
+    def get_bitmaps(self, user_ids: List[int]) -> np.ndarray:
+        """Matriz (usuarios × 84 bytes) de mapas UTC vigentes, en el orden de user_ids."""
+        result = np.zeros((len(user_ids), BITMAP_BYTES), dtype=np.uint8)
+        compiled = self.get_compiled(user_ids)
+        for i, user_id in enumerate(user_ids):
+            result[i] = np.frombuffer(compiled[user_id][1], dtype=np.uint8)
+        return result
+
+    def get_bitmap(self, user_id: int) -> np.ndarray:
+        return self.get_bitmaps([user_id])[0]
+
+    def get_intervals(self, user_id: int) -> List[Tuple[int, int]]:
+        return self.get_compiled([user_id])[user_id][0]
+
+    def rebuild(self, user_id: int) -> np.ndarray:
+        """
+        Recompila y guarda todas las variantes de un usuario; se llama al modificar su
+        disponibilidad o su zona horaria, antes del commit del cambio (solo hace flush).
+        Devuelve el mapa de la variante vigente.
+        """
+        # Las franjas del cambio todavía sin enviar tienen que verse en la compilación
+        self.db.flush()
+        compiled = self._compile([user_id])
+        self._store(compiled)
+        timezone, variants = compiled[user_id]
+        return np.frombuffer(variants[current_season(timezone, self.moment)][1], dtype=np.uint8)
+
+    def _compile(self, user_ids: List[int]) -> Dict[int, Tuple[Optional[str], Dict[str, Compiled]]]:
+        slots: Dict[int, List[Availability]] = {user_id: [] for user_id in user_ids}
+        for slot in self.db.query(Availability).filter(
+            Availability.user_id.in_(user_ids)
+        ).order_by(Availability.id).all():
+            slots[slot.user_id].append(slot)
+        timezones = dict(self.db.query(User.id, User.timezone).filter(User.id.in_(user_ids)).all())
+
+        compiled = {}
+        for user_id, user_slots in slots.items():
+            timezone = timezones.get(user_id)
+            local = slot_intervals(user_slots)
+            variants = {}
+            for season in SEASON_WEEKS:
+                intervals = to_utc(local, timezone, season)
+                variants[season] = (intervals, compile_week(intervals).tobytes())
+            compiled[user_id] = (timezone, variants)
+        return compiled
+
+    def _store(self, compiled: Dict[int, Tuple[Optional[str], Dict[str, Compiled]]]) -> None:
+        existing = {
+            (row.user_id, row.season): row for row in
+            self.db.query(AvailabilityBitmap).filter(AvailabilityBitmap.user_id.in_(list(compiled))).all()
+        }
+        for user_id, (timezone, variants) in compiled.items():
+            for season, (intervals, bitmap) in variants.items():
+                values = {
+                    "timezone": timezone,
+                    "intervals": [list(interval) for interval in intervals],
+                    "bitmap": bitmap
+                }
+                row = existing.get((user_id, season))
+                if row is not None:
+                    for field, value in values.items():
+                        setattr(row, field, value)
+                else:
+                    self.db.add(AvailabilityBitmap(user_id=user_id, season=season, **values))
+        self.db.flush()
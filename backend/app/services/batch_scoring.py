@@ -0,0 +1,431 @@
+from typing import List, Dict, Iterable, Optional
+import os
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session
+from app.models import Mentor, Mentee, MentorSkill, MenteeInterest, Skill
+from app.models.matching import Industry, UserIndustryExperience, MentoringPreference, MentorshipGoal
+from app.services.categorical import (
+    MENTORING_STYLES, LEARNING_STYLES, CAREER_STAGES, POSITION_LEVELS, SENIOR_POSITION
+)
+from app.services.availability_bitmap import AvailabilityBitmapService, day_counts, BITMAP_BYTES, DAY_MINUTES
+from app.services.scorers import SCORING_PROFILES, ScoringProfile
+from app.services.skill_matrices import skill_matrices, build_csr
+from app.services.language_features import language_features
+from app.core.config import settings
+from app.core.profiling import profile_components
+
+
+class FeatureBlock:
+    """
+    Perfiles de un lado del emparejamiento (mentores o mentiles) cargados como arreglos columnares.
+    La fila i de cada arreglo corresponde a user_ids[i].
+    """
+
+    def __init__(self, user_ids: List[int]):
+        self.user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.index = {user_id: i for i, user_id in enumerate(user_ids)}
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def take(self, rows) -> "FeatureBlock":
+        """Nuevo bloque con las filas indicadas de todos los arreglos por usuario."""
+        rows = np.asarray(rows, dtype=np.int64)
+        block = FeatureBlock(self.user_ids[rows].tolist())
+        for name, value in vars(self).items():
+            if name in ("user_ids", "index"):
+                continue
+            if (isinstance(value, np.ndarray) and value.ndim or sparse.issparse(value)) and value.shape[0] == len(self):
+                setattr(block, name, value[rows])
+            else:
+                setattr(block, name, value)
+        return block
+
+    def save(self, directory: str) -> None:
+        """
+        Guarda cada arreglo del bloque como <nombre>.npy en el directorio (ya existente) y cada
+        matriz dispersa como <nombre>.npz.
+        """
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                np.save(os.path.join(directory, f"{name}.npy"), value)
+            elif sparse.issparse(value):
+                sparse.save_npz(os.path.join(directory, f"{name}.npz"), value, compressed=False)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r") -> "FeatureBlock":
+        """
+        Bloque guardado con save. Con mmap_mode los arreglos se proyectan en memoria y varios
+        procesos comparten las mismas páginas sin copiarlas; las matrices dispersas se leen completas.
+        """
+        block = cls(np.load(os.path.join(directory, "user_ids.npy")).tolist())
+        for filename in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(filename)
+            if extension == ".npy" and name != "user_ids":
+                setattr(block, name, np.load(os.path.join(directory, filename), mmap_mode=mmap_mode))
+            elif extension == ".npz":
+                setattr(block, name, sparse.load_npz(os.path.join(directory, filename)))
+        return block
+
+
+class MatchingPool:
+    """Bloques de mentores y mentiles que comparten el mismo vocabulario de habilidades y categorías."""
+
+    def __init__(self, mentors: FeatureBlock, mentees: FeatureBlock, skill_ids: List[int], categories: List[str]):
+        self.mentors = mentors
+        self.mentees = mentees
+        self.skill_ids = skill_ids
+        self.categories = categories
+
+
+@profile_components("load_pool")
+class BatchScoringService:
+    """
+    Motor de puntuación por lotes: carga el conjunto de candidatos una sola vez
+    y calcula todos los componentes de compatibilidad con operaciones de NumPy.
+
+    Los componentes los calculan los plugins del perfil de puntuación (ver scorers.py);
+    solo se cargan los campos de perfil que esos plugins declaran.
+    """
+
+    def __init__(self, db: Session, profile="matchmaking"):
+        self.db = db
+        # Nombre de un perfil de SCORING_PROFILES o un ScoringProfile (por ejemplo, un subconjunto)
+        self.profile: ScoringProfile = profile if isinstance(profile, ScoringProfile) else SCORING_PROFILES[profile]
+
+    # ------------------------------------------------------------------
+    # Carga de datos
+    # ------------------------------------------------------------------
+
+    def load_pool(
+        self,
+        mentor_ids: Optional[List[int]] = None,
+        mentee_ids: Optional[List[int]] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> MatchingPool:
+        """
+        Carga mentores y mentiles (todos si no se indican ids) con un número fijo de consultas,
+        independiente del tamaño del conjunto de candidatos. `fields` sustituye a los campos
+        del perfil de puntuación.
+        """
+        if mentor_ids is None:
+            mentor_ids = self.all_mentor_ids()
+        if mentee_ids is None:
+            mentee_ids = self.all_mentee_ids()
+
+        fields = self.profile.fields if fields is None else set(fields)
+        mentors = FeatureBlock(mentor_ids)
+        mentees = FeatureBlock(mentee_ids)
+
+        skill_ids: List[int] = []
+        if "skills" in fields:
+            skill_ids = [row[0] for row in self.db.query(Skill.id).order_by(Skill.id)]
+            self._load_skills(mentors, mentees, {skill_id: i for i, skill_id in enumerate(skill_ids)})
+
+        categories: List[str] = []
+        if "industry" in fields:
+            experiences = self._query_industry_experience(mentor_ids)
+            goals = self._query_goals(mentee_ids)
+            categories = sorted(
+                {row.category for row in experiences if row.category} |
+                {row.category for row in goals if row.category}
+            )
+            category_index = {category: i for i, category in enumerate(categories)}
+            self._load_industry(mentors, experiences, category_index)
+            self._load_goals(mentees, goals, category_index)
+
+        if "preferences" in fields:
+            self._load_styles(mentors)
+            self._load_styles(mentees)
+
+        if "languages" in fields:
+            self._load_languages(mentors)
+            self._load_languages(mentees)
+
+        if "availability" in fields:
+            self._load_availability(mentors)
+            self._load_availability(mentees)
+
+        if "profile" in fields:
+            self._load_profiles(mentors, mentees)
+
+        if "slot_counts" in fields:
+            self._load_slot_counts(mentors)
+            self._load_slot_counts(mentees)
+
+        return MatchingPool(mentors, mentees, skill_ids, categories)
+
+    def all_mentor_ids(self) -> List[int]:
+        return [row[0] for row in self.db.query(Mentor.user_id).order_by(Mentor.user_id)]
+
+    def all_mentee_ids(self) -> List[int]:
+        return [row[0] for row in self.db.query(Mentee.user_id).order_by(Mentee.user_id)]
+
+    def score_ids(self, mentor_ids: List[int], mentee_ids: List[int]) -> Dict[str, np.ndarray]:
+        """Carga y puntúa los usuarios indicados; firma compatible con PairScoreCache.get_scores."""
+        pool = self.load_pool(mentor_ids, mentee_ids)
+        return self.score_block(pool.mentors, pool.mentees)
+
+    def _query_industry_experience(self, user_ids: List[int]):
+        if not user_ids:
+            return []
+        return self.db.query(
+            UserIndustryExperience.user_id,
+            UserIndustryExperience.years_experience,
+            UserIndustryExperience.is_current,
+            UserIndustryExperience.position_level,
+            Industry.category
+        ).join(Industry, Industry.id == UserIndustryExperience.industry_id).filter(
+            UserIndustryExperience.user_id.in_(user_ids)
+        ).order_by(UserIndustryExperience.id).all()
+
+    def _query_goals(self, user_ids: List[int]):
+        if not user_ids:
+            return []
+        return self.db.query(
+            MentorshipGoal.user_id,
+            MentorshipGoal.category,
+            MentorshipGoal.priority,
+            MentorshipGoal.timeline_months
+        ).filter(
+            MentorshipGoal.user_id.in_(user_ids)
+        ).order_by(MentorshipGoal.id).all()
+
+    def _load_skills(self, mentors: FeatureBlock, mentees: FeatureBlock, skill_index: Dict[int, int]) -> None:
+        """
+        Matrices CSR usuario × habilidad con nivel de dominio (mentores) o de interés (mentiles).
+        Con MATCHING_SKILL_MATRICES_ENABLED las filas salen de las matrices en memoria, mantenidas
+        con cada edición de habilidades, en lugar de leer MentorSkill y MenteeInterest.
+        """
+        if settings.MATCHING_SKILL_MATRICES_ENABLED:
+            skill_matrices.ensure_built(self.db)
+            mentors.skills = skill_matrices.rows("mentor", mentors.user_ids.tolist(), skill_index)
+            mentees.skills = skill_matrices.rows("mentee", mentees.user_ids.tolist(), skill_index)
+            return
+
+        mentor_rows = self.db.query(
+            MentorSkill.mentor_id, MentorSkill.skill_id, MentorSkill.proficiency_level
+        ).filter(MentorSkill.mentor_id.in_(mentors.user_ids.tolist())).all() if len(mentors) else []
+        mentee_rows = self.db.query(
+            MenteeInterest.mentee_id, MenteeInterest.skill_id, MenteeInterest.interest_level
+        ).filter(MenteeInterest.mentee_id.in_(mentees.user_ids.tolist())).all() if len(mentees) else []
+        mentors.skills = build_csr(mentor_rows, mentors.index, skill_index)
+        mentees.skills = build_csr(mentee_rows, mentees.index, skill_index)
+
+    def _load_industry(self, block: FeatureBlock, experiences, category_index: Dict[str, int]) -> None:
+        """
+        Por cada usuario y categoría de industria se conserva la primera experiencia registrada,
+        igual que el `next(...)` de MatchmakingService. La última columna queda vacía y sirve
+        como destino de las categorías desconocidas (índice -1).
+        """
+        shape = (len(block), len(category_index) + 1)
+        block.industry_has = np.zeros(shape, dtype=bool)
+        block.industry_current = np.zeros(shape, dtype=bool)
+        block.industry_years = np.zeros(shape, dtype=np.float32)
+        block.industry_senior = np.zeros(shape, dtype=bool)
+
+        for row in experiences:
+            i = block.index[row.user_id]
+            c = category_index.get(row.category)
+            if c is None or block.industry_has[i, c]:
+                continue
+            block.industry_has[i, c] = True
+            block.industry_current[i, c] = bool(row.is_current)
+            block.industry_years[i, c] = row.years_experience or 0
+            block.industry_senior[i, c] = SENIOR_POSITION[POSITION_LEVELS.encode(row.position_level)]
+
+    def _load_goals(self, block: FeatureBlock, goals, category_index: Dict[str, int]) -> None:
+        """Objetivos de cada usuario en arreglos rellenados (usuario × objetivo); la categoría -1 es relleno."""
+        per_user: Dict[int, list] = {}
+        for row in goals:
+            per_user.setdefault(row.user_id, []).append(row)
+
+        width = max((len(rows) for rows in per_user.values()), default=0)
+        block.goal_category = np.full((len(block), width), -1, dtype=np.int32)
+        block.goal_priority = np.zeros((len(block), width), dtype=np.float32)
+        block.goal_timeline = np.zeros((len(block), width), dtype=np.float32)
+        block.goal_count = np.zeros(len(block), dtype=np.float32)
+
+        for user_id, rows in per_user.items():
+            i = block.index[user_id]
+            block.goal_count[i] = len(rows)
+            for j, row in enumerate(rows):
+                block.goal_category[i, j] = category_index.get(row.category, -1)
+                block.goal_priority[i, j] = row.priority or 0
+                block.goal_timeline[i, j] = row.timeline_months or 0
+
+    def _load_styles(self, block: FeatureBlock) -> None:
+        """
+        Preferencias de mentoría. `structured` usa -1 cuando no está definido; las preferencias
+        numéricas ausentes quedan como NaN y no suman puntos.
+        """
+        block.has_preferences = np.zeros(len(block), dtype=bool)
+        block.style = np.full(len(block), MENTORING_STYLES.missing, dtype=np.int32)
+        block.structured = np.full(len(block), -1, dtype=np.int8)
+        block.meeting_frequency = np.full(len(block), np.nan, dtype=np.float32)
+        block.session_duration = np.full(len(block), np.nan, dtype=np.float32)
+        if not len(block):
+            return
+
+        rows = self.db.query(
+            MentoringPreference.user_id,
+            MentoringPreference.preferred_style,
+            MentoringPreference.structured_sessions,
+            MentoringPreference.meeting_frequency,
+            MentoringPreference.session_duration
+        ).filter(
+            MentoringPreference.user_id.in_(block.user_ids.tolist())
+        ).order_by(MentoringPreference.id).all()
+
+        for row in rows:
+            i = block.index[row.user_id]
+            if block.has_preferences[i]:
+                continue
+            block.has_preferences[i] = True
+            block.style[i] = MENTORING_STYLES.encode(row.preferred_style)
+            if row.structured_sessions is not None:
+                block.structured[i] = int(row.structured_sessions)
+            if row.meeting_frequency is not None:
+                block.meeting_frequency[i] = row.meeting_frequency
+            if row.session_duration is not None:
+                block.session_duration[i] = row.session_duration
+
+    def _load_profiles(self, mentors: FeatureBlock, mentees: FeatureBlock) -> None:
+        """
+        Campos categóricos de Mentor y Mentee codificados una vez, más las áreas de experiencia de
+        los mentores y las áreas de los objetivos de los mentiles como matrices booleanas sobre un
+        vocabulario de temas común.
+        """
+        mentor_rows = []
+        if len(mentors):
+            mentor_rows = self.db.query(
+                Mentor.user_id, Mentor.mentoring_style, Mentor.experience_years, Mentor.expertise_areas
+            ).filter(Mentor.user_id.in_(mentors.user_ids.tolist())).all()
+        mentee_rows = []
+        if len(mentees):
+            mentee_rows = self.db.query(
+                Mentee.user_id, Mentee.learning_style, Mentee.career_stage, Mentee.specific_goals
+            ).filter(Mentee.user_id.in_(mentees.user_ids.tolist())).all()
+
+        expertise = {row.user_id: set(row.expertise_areas or []) for row in mentor_rows}
+        goal_areas = {
+            row.user_id: {goal["category"] for goal in row.specific_goals or []} for row in mentee_rows
+        }
+        topics = sorted(set().union(*expertise.values(), *goal_areas.values()), key=str)
+        topic_index = {topic: i for i, topic in enumerate(topics)}
+
+        mentors.mentoring_style = np.full(len(mentors), MENTORING_STYLES.missing, dtype=np.int32)
+        mentors.experience_years = np.zeros(len(mentors), dtype=np.float32)
+        mentors.expertise_areas = np.zeros((len(mentors), len(topics)), dtype=bool)
+        for row in mentor_rows:
+            i = mentors.index[row.user_id]
+            mentors.mentoring_style[i] = MENTORING_STYLES.encode(row.mentoring_style)
+            mentors.experience_years[i] = row.experience_years or 0
+            mentors.expertise_areas[i, [topic_index[topic] for topic in expertise[row.user_id]]] = True
+
+        mentees.learning_style = np.full(len(mentees), LEARNING_STYLES.missing, dtype=np.int32)
+        mentees.career_stage = np.full(len(mentees), CAREER_STAGES.missing, dtype=np.int32)
+        mentees.goal_areas = np.zeros((len(mentees), len(topics)), dtype=bool)
+        for row in mentee_rows:
+            i = mentees.index[row.user_id]
+            mentees.learning_style[i] = LEARNING_STYLES.encode(row.learning_style)
+            mentees.career_stage[i] = CAREER_STAGES.encode(row.career_stage)
+            mentees.goal_areas[i, [topic_index[topic] for topic in goal_areas[row.user_id]]] = True
+
+    def _load_languages(self, block: FeatureBlock) -> None:
+        """Códigos de idioma y nivel (usuario × LANGUAGE_SLOTS); ver language_features.py."""
+        block.language_codes, block.language_levels = language_features.rows(self.db, block.user_ids.tolist())
+
+    def _load_availability(self, block: FeatureBlock) -> None:
+        """
+        Franjas semanales compiladas a UTC en arreglos rellenados (usuario × franja): día UTC del
+        inicio e intervalo [inicio, fin) en minutos desde el domingo 00:00 UTC, más el mapa de
+        bits semanal en UTC de cada usuario (usuario × 84 bytes).
+        """
+        compiled = AvailabilityBitmapService(self.db).get_compiled(block.user_ids.tolist()) if len(block) else {}
+
+        width = max((len(intervals) for intervals, _ in compiled.values()), default=0)
+        block.slot_day = np.full((len(block), width), -1, dtype=np.int16)
+        block.slot_start = np.zeros((len(block), width), dtype=np.int16)
+        block.slot_end = np.zeros((len(block), width), dtype=np.int16)
+        block.slot_count = np.zeros(len(block), dtype=np.float32)
+        block.availability_bitmap = np.zeros((len(block), BITMAP_BYTES), dtype=np.uint8)
+
+        for user_id, (intervals, bitmap) in compiled.items():
+            i = block.index[user_id]
+            block.slot_count[i] = len(intervals)
+            if intervals:
+                starts, ends = np.array(intervals, dtype=np.int16).T
+                block.slot_day[i, :len(intervals)] = starts // DAY_MINUTES
+                block.slot_start[i, :len(intervals)] = starts
+                block.slot_end[i, :len(intervals)] = ends
+            block.availability_bitmap[i] = np.frombuffer(bitmap, dtype=np.uint8)
+
+    def _load_slot_counts(self, block: FeatureBlock) -> None:
+        """
+        Franjas por día UTC de la semana y en total, a partir de los intervalos compilados; una
+        franja que cruza la medianoche UTC cuenta en los dos días.
+        """
+        block.day_slot_counts = np.zeros((len(block), 7), dtype=np.float32)
+        block.slot_count = np.zeros(len(block), dtype=np.float32)
+        if len(block):
+            for user_id, (intervals, _) in AvailabilityBitmapService(self.db).get_compiled(
+                block.user_ids.tolist()
+            ).items():
+                block.day_slot_counts[block.index[user_id]] = day_counts(intervals)
+                block.slot_count[block.index[user_id]] = len(intervals)
+
+    def score_block(self, mentors: FeatureBlock, mentees: FeatureBlock) -> Dict[str, np.ndarray]:
+        """
+        Calcula los componentes del perfil de puntuación para cada par (mentil, mentor) del bloque.
+        Devuelve matrices de forma (mentiles, mentores).
+        """
+        return self.profile.score(mentors, mentees)
+
+    def score_totals(self, mentors: FeatureBlock, mentees: FeatureBlock, block_size: int = 256) -> np.ndarray:
+        """
+        Matriz completa de puntuaciones totales (mentiles × mentores), calculada por bloques
+        de mentiles para acotar la memoria de los componentes intermedios.
+        """
+        totals = np.zeros((len(mentees), len(mentors)), dtype=np.float32)
+        for start in range(0, len(mentees), block_size):
+            rows = np.arange(start, min(start + block_size, len(mentees)))
+            totals[rows] = self.score_block(mentors, mentees.take(rows))["total"]
+        return totals
+
+    def score_pairs(
+        self,
+        mentors: FeatureBlock,
+        mentees: FeatureBlock,
+        mentor_rows: np.ndarray,
+        mentee_rows: np.ndarray,
+        block_size: int = 256
+    ) -> Dict[str, np.ndarray]:
+        """Componentes solo para los pares (mentee_rows[i], mentor_rows[i]); un valor por par."""
+        mentor_rows = np.asarray(mentor_rows, dtype=np.int64)
+        mentee_rows = np.asarray(mentee_rows, dtype=np.int64)
+        result: Dict[str, np.ndarray] = {}
+        for start in range(0, len(mentor_rows), block_size):
+            chunk = slice(start, start + block_size)
+            scores = self.score_block(mentors.take(mentor_rows[chunk]), mentees.take(mentee_rows[chunk]))
+            for key, matrix in scores.items():
+                result.setdefault(key, []).append(np.diagonal(matrix))
+        return {
+            key: np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+            for key, parts in result.items()
+        }
+
+    @staticmethod
+    def top_k(totals: np.ndarray, limit: int) -> np.ndarray:
+        """Índices de los `limit` mejores valores, en orden descendente y estable ante empates."""
+        if limit <= 0 or not len(totals):
+            return np.array([], dtype=np.int64)
+        if limit < len(totals):
+            candidates = np.argpartition(-totals, limit - 1)[:limit]
+            threshold = totals[candidates].min()
+            candidates = np.nonzero(totals >= threshold)[0]
+        else:
+            candidates = np.arange(len(totals))
+        order = np.argsort(-totals[candidates], kind="stable")
+        return candidates[order][:limit]
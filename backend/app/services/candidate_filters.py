@@ -0,0 +1,164 @@
+from typing import Iterable, List, Optional
+from sqlalchemy import Integer, String, and_, case, cast, exists, func, literal, literal_column, or_, select, true
+from sqlalchemy.orm import Session, aliased
+from app.models import User, Mentor, Mentee
+from app.models.match_algorithm import MatchScore, MatchPreference
+from app.models.matching import Industry, UserIndustryExperience
+from app.services.match_exclusions import EXCLUDED_STATUSES, preference_exclusions
+from app.services.cohort_assignment import DEFAULT_MAX_MENTEES
+
+# Función SQL que despliega un arreglo JSON en filas con una columna "value"
+JSON_ARRAY_ELEMENTS = {
+    "sqlite": func.json_each,
+    "postgresql": func.json_array_elements_text
+}
+
+
+def json_elements(dialect: str, column, key: Optional[str] = None):
+    """Filas ("value") del arreglo JSON de la columna, o del que guarda bajo `key` si se indica."""
+    if key is None:
+        return JSON_ARRAY_ELEMENTS[dialect](column).table_valued("value")
+    if dialect == "sqlite":
+        return func.json_each(column, f"$.{key}").table_valued("value")
+    return JSON_ARRAY_ELEMENTS[dialect](column[key]).table_valued("value")
+
+
+def language_codes(dialect: str, column):
+    """
+    Filas de un arreglo User.languages y el código en minúsculas de cada una. Como en
+    language_features, una entrada es un código suelto ("es") o {"code": "es", ...}.
+    """
+    if dialect == "sqlite":
+        elements = func.json_each(column).table_valued("value", "type")
+        code = case(
+            (elements.c.type == "object", func.coalesce(
+                func.json_extract(elements.c.value, "$.code"), func.json_extract(elements.c.value, "$.language")
+            )),
+            else_=elements.c.value
+        )
+    else:
+        elements = func.json_array_elements(column).table_valued("value")
+        code = case(
+            (func.json_typeof(elements.c.value) == "object", func.coalesce(
+                elements.c.value.op("->>")(literal("code")), elements.c.value.op("->>")(literal("language"))
+            )),
+            else_=elements.c.value.op("#>>")(literal_column("'{}'::text[]"))
+        )
+    return elements, func.lower(cast(code, String))
+
+
+def normalize_codes(languages) -> List[str]:
+    """Códigos en minúsculas de language_preferences (códigos sueltos o entradas con "code")."""
+    codes = set()
+    for entry in languages or ():
+        code = entry.get("code") or entry.get("language") if isinstance(entry, dict) else entry
+        if code:
+            codes.add(str(code).lower())
+    return sorted(codes)
+
+
+class CandidateFilter:
+    """
+    Restricciones duras de un usuario compiladas a cláusulas WHERE sobre sus candidatos, para
+    que solo los candidatos elegibles salgan de la base de datos y lleguen al motor de puntuación:
+
+    - usuario activo
+    - plazas libres (solo candidatos mentores)
+    - par no activo ni rechazado (NOT EXISTS sobre el índice único de match_scores)
+    - candidato no excluido en las preferencias del usuario, ni usuario excluido en las del candidato
+    - al menos un idioma de MatchPreference.language_preferences en User.languages
+    - experiencia en alguna industria (nombre o categoría) de MatchPreference.industry_preferences
+
+    Las exclusiones del candidato y el filtro de idiomas necesitan desplegar arreglos JSON y
+    solo se aplican en SQLite y PostgreSQL.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        candidate_role: str,
+        languages: Optional[Iterable[str]] = None,
+        industries: Optional[Iterable[str]] = None,
+        excluded_ids: Iterable[int] = ()
+    ):
+        self.user_id = user_id
+        self.candidate_role = candidate_role
+        self.languages = normalize_codes(languages)
+        self.industries = sorted(set(industries or ()))
+        self.excluded_ids = sorted(set(excluded_ids))
+
+    @classmethod
+    def for_user(cls, db: Session, user_id: int, candidate_role: str) -> "CandidateFilter":
+        """Filtro con las preferencias guardadas del usuario (una consulta)."""
+        preference = db.query(
+            MatchPreference.language_preferences,
+            MatchPreference.industry_preferences,
+            MatchPreference.exclusions
+        ).filter(MatchPreference.user_id == user_id).first()
+        if not preference:
+            return cls(user_id, candidate_role)
+        return cls(
+            user_id,
+            candidate_role,
+            languages=preference.language_preferences,
+            industries=preference.industry_preferences,
+            excluded_ids=preference_exclusions(preference.exclusions)
+        )
+
+    @property
+    def model(self):
+        return Mentor if self.candidate_role == "mentor" else Mentee
+
+    def clauses(self, dialect: str) -> List:
+        candidate_id = self.model.user_id
+        clauses = [User.is_active.is_not(False), candidate_id != self.user_id]
+
+        if self.candidate_role == "mentor":
+            clauses.append(
+                func.coalesce(Mentor.max_mentees, DEFAULT_MAX_MENTEES) > func.coalesce(Mentor.current_mentee_count, 0)
+            )
+            pair = and_(MatchScore.mentor_id == candidate_id, MatchScore.mentee_id == self.user_id)
+        else:
+            pair = and_(MatchScore.mentor_id == self.user_id, MatchScore.mentee_id == candidate_id)
+        clauses.append(~exists().where(pair, MatchScore.status.in_(EXCLUDED_STATUSES)))
+
+        if self.excluded_ids:
+            clauses.append(candidate_id.notin_(self.excluded_ids))
+
+        if dialect in JSON_ARRAY_ELEMENTS:
+            # El arreglo se despliega desde la fila de preferencias del propio subquery (JOIN ... ON true)
+            preference = aliased(MatchPreference)
+            excluded = json_elements(dialect, preference.exclusions, "user_ids")
+            clauses.append(~exists(
+                select(excluded.c.value).select_from(preference).join(excluded, true()).where(
+                    preference.user_id == candidate_id,
+                    cast(excluded.c.value, Integer) == self.user_id
+                )
+            ))
+
+        if self.languages and dialect in JSON_ARRAY_ELEMENTS:
+            languages, code = language_codes(dialect, User.languages)
+            clauses.append(exists(select(languages.c.value).where(code.in_(self.languages))))
+
+        if self.industries:
+            clauses.append(exists().where(
+                UserIndustryExperience.user_id == candidate_id,
+                Industry.id == UserIndustryExperience.industry_id,
+                or_(Industry.name.in_(self.industries), Industry.category.in_(self.industries))
+            ))
+
+        return clauses
+
+    def query(self, db: Session, restrict_to: Optional[Iterable[int]] = None):
+        """Consulta de ids de candidatos elegibles, ordenados por id."""
+        candidate_id = self.model.user_id
+        query = db.query(candidate_id).join(User, User.id == candidate_id).filter(
+            *self.clauses(db.get_bind().dialect.name)
+        )
+        if restrict_to is not None:
+            query = query.filter(candidate_id.in_(list(restrict_to)))
+        return query.order_by(candidate_id)
+
+    def candidate_ids(self, db: Session, restrict_to: Optional[Iterable[int]] = None) -> List[int]:
+        """Ids elegibles; restrict_to limita la búsqueda (por ejemplo, a los candidatos del índice)."""
+        return [row[0] for row in self.query(db, restrict_to)]
@@ -0,0 +1,87 @@
+"""
+Codificación entera de los atributos categóricos del perfil y tablas de compatibilidad
+precompiladas. Cada perfil se codifica una vez al cargarse; la compatibilidad de toda una
+columna de candidatos se obtiene indexando las tablas con los códigos.
+"""
+from enum import Enum
+from typing import Iterable
+import numpy as np
+from app.models.matching import MentoringStyle
+
+
+class Vocabulary:
+    """
+    Valores conocidos de un atributo -> códigos 0..n-1. Se reservan dos códigos más: `missing`
+    (valor vacío) y `other` (valor no reconocido), de modo que las tablas tienen n + 2 filas.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+        self.missing = len(self.values)
+        self.other = len(self.values) + 1
+
+    def __len__(self) -> int:
+        return len(self.values) + 2
+
+    def encode(self, value) -> int:
+        if isinstance(value, Enum):
+            value = value.value
+        if value is None or value == "":
+            return self.missing
+        return self._codes.get(value, self.other)
+
+    def encode_many(self, values: Iterable) -> np.ndarray:
+        return np.fromiter((self.encode(value) for value in values), dtype=np.int32)
+
+
+MENTORING_STYLES = Vocabulary(style.value for style in MentoringStyle)
+LEARNING_STYLES = Vocabulary(["structured", "self_directed", "collaborative"])
+CAREER_STAGES = Vocabulary(["student", "early-career", "mid-career", "senior"])
+POSITION_LEVELS = Vocabulary(["Junior", "Mid", "Senior", "Lead", "Manager"])
+LANGUAGE_LEVELS = Vocabulary(["basic", "intermediate", "advanced", "native"])
+
+
+def _table(rows: Vocabulary, cols: Vocabulary, entries, default: float) -> np.ndarray:
+    table = np.full((len(rows), len(cols)), default, dtype=np.float32)
+    for row_value, values in entries.items():
+        for col_value, score in values.items():
+            table[rows.encode(row_value), cols.encode(col_value)] = score
+    return table
+
+
+# [estilo del mentor, estilo de aprendizaje del mentil]; 0.5 neutral si falta o no se reconoce
+LEARNING_STYLE_COMPAT = _table(MENTORING_STYLES, LEARNING_STYLES, {
+    "directive": {"structured": 0.9, "self_directed": 0.3, "collaborative": 0.6},
+    "collaborative": {"structured": 0.6, "self_directed": 0.8, "collaborative": 0.9},
+    "supportive": {"structured": 0.7, "self_directed": 0.7, "collaborative": 0.8}
+}, default=0.5)
+
+# [estilo preferido por el mentil, estilo preferido por el mentor]; 1 si son compatibles
+PREFERRED_STYLE_COMPAT = _table(MENTORING_STYLES, MENTORING_STYLES, {
+    "directive": {"directive": 1.0, "challenging": 1.0},
+    "collaborative": {"collaborative": 1.0, "supportive": 1.0},
+    "supportive": {"supportive": 1.0, "collaborative": 1.0},
+    "challenging": {"challenging": 1.0, "directive": 1.0}
+}, default=0.0)
+
+# Años de experiencia del mentor deseados por etapa de carrera [mínimo, máximo]; sin etapa no
+# hay rango (NaN) y una etapa no reconocida acepta cualquier experiencia
+STAGE_EXPERIENCE_YEARS = np.array(
+    [(0, 3), (2, 5), (4, 10), (8, np.inf), (np.nan, np.nan), (0, np.inf)], dtype=np.float32
+)
+
+# Niveles de puesto que cuentan como experiencia sénior
+SENIOR_POSITION = np.zeros(len(POSITION_LEVELS), dtype=bool)
+SENIOR_POSITION[[POSITION_LEVELS.encode(level) for level in ("Senior", "Lead", "Manager")]] = True
+
+
+def experience_match(stage_codes, experience_years) -> np.ndarray:
+    """
+    1.0 si los años del mentor están en el rango de la etapa del mentil y 0.5 en otro caso
+    (también sin etapa o sin años de experiencia). Admite escalares o arreglos difundibles.
+    """
+    years = np.asarray(experience_years, dtype=np.float32)
+    bounds = STAGE_EXPERIENCE_YEARS[stage_codes]
+    in_range = (bounds[..., 0] <= years) & (years <= bounds[..., 1]) & (years > 0)
+    return np.where(in_range, 1.0, 0.5).astype(np.float32)
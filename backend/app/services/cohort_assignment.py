@@ -0,0 +1,185 @@
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+from sqlalchemy.orm import Session
+from app.models import Mentor
+from app.services.batch_scoring import BatchScoringService
+from app.services.match_store import upsert_match_scores
+from app.services.match_exclusions import MatchExclusions
+
+# Costo de una arista = 1 + EPSILON - puntuación. Todas las aristas quedan estrictamente
+# positivas (scipy trata los ceros como aristas ausentes) y "sin asignar" cuesta lo mismo
+# que una puntuación 0, así que minimizar el costo equivale a maximizar la puntuación total.
+EPSILON = 1e-6
+DEFAULT_MAX_MENTEES = 3
+
+
+class CohortAssignmentService:
+    """
+    Asignación global de una cohorte de mentiles a mentores respetando la capacidad de cada
+    mentor (max_mentees - current_mentee_count). Cada mentor se replica en tantas plazas como
+    capacidad libre tenga y se resuelve una asignación bipartita de costo mínimo.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.engine = BatchScoringService(db)
+
+    def assign(
+        self,
+        mentee_ids: Optional[List[int]] = None,
+        mentor_ids: Optional[List[int]] = None,
+        min_score: float = 0.0,
+        persist: bool = True,
+        block_size: int = 256
+    ) -> Dict:
+        """
+        Calcula la asignación óptima de la cohorte y, si persist es True, guarda los pares
+        como MatchScore con estado "suggested" mediante un upsert masivo.
+        """
+        pool = self.engine.load_pool(mentor_ids, mentee_ids)
+        capacity = self.remaining_capacity(pool.mentors.user_ids.tolist())
+
+        totals = self.engine.score_totals(pool.mentors, pool.mentees, block_size)
+        # Los pares activos, rechazados o excluidos quedan sin arista (puntuación 0)
+        totals[MatchExclusions.load_for_users(
+            self.db, pool.mentors.user_ids.tolist(), pool.mentees.user_ids.tolist()
+        ).mask(pool.mentors.user_ids, pool.mentees.user_ids)] = 0
+        mentee_rows, mentor_rows = self.solve(totals, capacity, min_score, block_size)
+        components = self.engine.score_pairs(pool.mentors, pool.mentees, mentor_rows, mentee_rows, block_size)
+
+        assignments = [
+            {
+                "mentor_id": int(pool.mentors.user_ids[m]),
+                "mentee_id": int(pool.mentees.user_ids[i]),
+                "total_score": float(components["total"][k]),
+                "skill_match_score": float(components["skills"][k]),
+                "availability_score": float(components["schedule"][k]),
+                "style_match_score": float(components["style"][k]),
+                "goals_alignment_score": float(components["goals"][k])
+            }
+            for k, (i, m) in enumerate(zip(mentee_rows, mentor_rows))
+        ]
+
+        assigned = set(int(i) for i in mentee_rows)
+        unassigned = [
+            int(user_id) for i, user_id in enumerate(pool.mentees.user_ids) if i not in assigned
+        ]
+
+        if persist and assignments:
+            self._write_matches(assignments)
+
+        return {
+            "assignments": assignments,
+            "unassigned_mentee_ids": unassigned,
+            "total_score": float(sum(a["total_score"] for a in assignments)),
+            "mentor_count": len(pool.mentors),
+            "mentee_count": len(pool.mentees)
+        }
+
+    def remaining_capacity(self, mentor_ids: List[int]) -> np.ndarray:
+        """Plazas libres de cada mentor, en el orden de mentor_ids."""
+        rows = {
+            user_id: (max_mentees, current) for user_id, max_mentees, current in
+            self.db.query(Mentor.user_id, Mentor.max_mentees, Mentor.current_mentee_count)
+            .filter(Mentor.user_id.in_(mentor_ids))
+        }
+        capacity = np.zeros(len(mentor_ids), dtype=np.int64)
+        for j, mentor_id in enumerate(mentor_ids):
+            max_mentees, current = rows.get(mentor_id, (0, 0))
+            if max_mentees is None:
+                max_mentees = DEFAULT_MAX_MENTEES
+            capacity[j] = max(0, max_mentees - (current or 0))
+        return capacity
+
+    @staticmethod
+    def solve(
+        totals: np.ndarray,
+        capacity: np.ndarray,
+        min_score: float = 0.0,
+        block_size: int = 256
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Asignación de máxima puntuación total (mentiles × mentores) con capacidades por mentor.
+        Devuelve (filas de mentiles, columnas de mentores) de los pares asignados; los mentiles
+        sin un mentor con puntuación > min_score y plaza libre quedan sin asignar.
+        """
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        n_mentees, n_mentors = totals.shape
+        capacity = np.clip(np.asarray(capacity, dtype=np.int64), 0, n_mentees)
+        if n_mentees == 0 or capacity.sum() == 0:
+            return empty
+
+        edge_rows, edge_mentors, edge_scores = CohortAssignmentService._candidate_edges(
+            totals, capacity, min_score, block_size
+        )
+        if len(edge_rows) == 0:
+            return empty
+
+        # Replicar cada arista (mentil, mentor) en una arista por plaza libre del mentor
+        slot_offset = np.cumsum(capacity) - capacity
+        slot_owner = np.repeat(np.arange(n_mentors), capacity)
+        n_slots = len(slot_owner)
+
+        counts = capacity[edge_mentors]
+        starts = np.cumsum(counts) - counts
+        rows = np.repeat(edge_rows, counts)
+        cols = np.repeat(slot_offset[edge_mentors] - starts, counts) + np.arange(counts.sum())
+        costs = 1.0 + EPSILON - np.repeat(edge_scores, counts)
+
+        # Una columna ficticia por mentil garantiza que siempre existe una asignación completa
+        rows = np.concatenate([rows, np.arange(n_mentees)])
+        cols = np.concatenate([cols, n_slots + np.arange(n_mentees)])
+        costs = np.concatenate([costs, np.full(n_mentees, 1.0 + EPSILON)])
+
+        graph = csr_matrix((costs, (rows, cols)), shape=(n_mentees, n_slots + n_mentees))
+        mentee_rows, slot_cols = min_weight_full_bipartite_matching(graph)
+
+        real = slot_cols < n_slots
+        return mentee_rows[real].astype(np.int64), slot_owner[slot_cols[real]].astype(np.int64)
+
+    @staticmethod
+    def _candidate_edges(
+        totals: np.ndarray,
+        capacity: np.ndarray,
+        min_score: float,
+        block_size: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Poda exacta: cada mentil solo conserva sus mejores mentores hasta que la capacidad
+        acumulada cubre a toda la cohorte. Si un mentil quedara asignado fuera de esa lista,
+        alguno de sus mentores preferidos tendría una plaza libre con puntuación igual o mayor,
+        así que la poda no cambia el valor óptimo.
+        """
+        n_mentees = totals.shape[0]
+        edge_rows, edge_mentors, edge_scores = [], [], []
+
+        for start in range(0, n_mentees, block_size):
+            block = totals[start:start + block_size].astype(np.float64)
+            valid = (block > min_score) & (block > 0) & (capacity > 0)
+            masked = np.where(valid, block, -np.inf)
+
+            order = np.argsort(-masked, axis=1, kind="stable")
+            sorted_capacity = capacity[order]
+            preceding = np.cumsum(sorted_capacity, axis=1) - sorted_capacity
+            keep = (preceding < n_mentees) & np.take_along_axis(valid, order, axis=1)
+
+            rows, positions = np.nonzero(keep)
+            mentors = order[rows, positions]
+            edge_rows.append(rows + start)
+            edge_mentors.append(mentors)
+            edge_scores.append(block[rows, mentors])
+
+        return np.concatenate(edge_rows), np.concatenate(edge_mentors), np.concatenate(edge_scores)
+
+    def _write_matches(self, assignments: List[Dict]) -> None:
+        upsert_match_scores(self.db, [
+            {
+                **assignment,
+                "match_details": {"source": "cohort_assignment"},
+                "status": "suggested"
+            }
+            for assignment in assignments
+        ])
+        self.db.commit()
@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models.match_algorithm import MatchScore, MatchFeedback
 from app.models.user import User, Mentor, Mentee
+from app.core.config import settings
+from app.services.learned_weights import learned_weights
 from datetime import datetime, timedelta
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -130,7 +132,18 @@ class FeedbackAnalysisService:
         }
 
     def update_matching_weights(self, user_id: int) -> Dict[str, float]:
-        """Actualiza los pesos del algoritmo de matching basado en feedback histórico."""
+        """
+        Pesos del algoritmo de matching basados en feedback histórico. Con
+        MATCHING_LEARNED_WEIGHTS_ENABLED y un artefacto entrenado (matching_cli.py train-weights)
+        se leen de memoria para el segmento del usuario; si no, se calculan a partir de sus
+        matches exitosos.
+        """
+        if settings.MATCHING_LEARNED_WEIGHTS_ENABLED:
+            role = self.db.query(User.role).filter(User.id == user_id).scalar()
+            learned = learned_weights.for_user(user_id, role)
+            if learned is not None:
+                return dict(learned)
+
         insights = self.get_matching_insights(user_id)
         
         if "success_patterns" not in insights:
@@ -0,0 +1,135 @@
+"""
+Arreglos compactos de idiomas por usuario. User.languages (JSON) admite códigos sueltos
+("es") o entradas {"code": "es", "proficiency": "native"}; cada usuario se codifica en dos
+filas de ancho fijo LANGUAGE_SLOTS: el código como entero de un vocabulario compartido
+(-1 si la posición está vacía) y el nivel como ordinal 1..MAX_LANGUAGE_LEVEL. Con eso el mejor
+idioma común de todos los candidatos se obtiene con comparaciones de enteros.
+"""
+from typing import Dict, Iterable, List, Tuple
+import threading
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models import User
+from app.services.categorical import LANGUAGE_LEVELS
+
+# Idiomas por usuario; si tiene más se conservan los de mayor nivel
+LANGUAGE_SLOTS = 4
+
+# basic=1 ... native=4
+MAX_LANGUAGE_LEVEL = len(LANGUAGE_LEVELS.values)
+
+
+def language_level(proficiency) -> int:
+    """
+    Ordinal de un nivel de idioma: nombre de LANGUAGE_LEVELS o número (recortado a 1..4).
+    Sin nivel, o con uno no reconocido, se considera que el usuario domina el idioma.
+    """
+    if isinstance(proficiency, (int, float)) and not isinstance(proficiency, bool):
+        return int(min(max(proficiency, 1), MAX_LANGUAGE_LEVEL))
+    code = LANGUAGE_LEVELS.encode(proficiency.lower() if isinstance(proficiency, str) else proficiency)
+    return code + 1 if code < MAX_LANGUAGE_LEVEL else MAX_LANGUAGE_LEVEL
+
+
+def parse_languages(languages) -> List[Tuple[str, int]]:
+    """(código, nivel) de cada idioma de User.languages, sin repetidos (gana el nivel más alto)."""
+    levels: Dict[str, int] = {}
+    for entry in languages or ():
+        if isinstance(entry, dict):
+            code, level = entry.get("code") or entry.get("language"), language_level(entry.get("proficiency"))
+        else:
+            code, level = entry, MAX_LANGUAGE_LEVEL
+        if code:
+            code = str(code).lower()
+            levels[code] = max(levels.get(code, 0), level)
+    return sorted(levels.items(), key=lambda item: (-item[1], item[0]))[:LANGUAGE_SLOTS]
+
+
+class LanguageFeatures:
+    """
+    Filas de idiomas por usuario en memoria. Se construyen una vez a partir de User.languages,
+    se actualizan al editar el perfil y las de usuarios nuevos se añaden al pedirlas; el vocabulario de códigos solo crece, así que las filas
+    de mentores y mentiles siempre son comparables.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.codes: Dict[str, int] = {}
+        self.clear()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def clear(self) -> None:
+        with self._lock:
+            self._built = False
+            self.rows_by_user: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def encode(self, languages) -> Tuple[np.ndarray, np.ndarray]:
+        """Filas (códigos, niveles) de ancho LANGUAGE_SLOTS para un valor de User.languages."""
+        codes = np.full(LANGUAGE_SLOTS, -1, dtype=np.int16)
+        levels = np.zeros(LANGUAGE_SLOTS, dtype=np.int8)
+        with self._lock:
+            for i, (code, level) in enumerate(parse_languages(languages)):
+                codes[i] = self.codes.setdefault(code, len(self.codes))
+                levels[i] = level
+        return codes, levels
+
+    def build(self, db: Session) -> None:
+        """Codifica los idiomas de todos los usuarios."""
+        rows = {user_id: self.encode(languages) for user_id, languages in db.query(User.id, User.languages)}
+        with self._lock:
+            self.rows_by_user = rows
+            self._built = True
+
+    def _load(self, db: Session, user_ids: List[int]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+        """Filas de los usuarios indicados a partir de User.languages, en una consulta."""
+        if not user_ids:
+            return {}
+        return {
+            user_id: self.encode(languages) for user_id, languages in
+            db.query(User.id, User.languages).filter(User.id.in_(user_ids))
+        }
+
+    def ensure_built(self, db: Session) -> None:
+        if not self._built:
+            self.build(db)
+
+    def set_languages(self, user_id: int, languages) -> None:
+        """Actualiza la fila de un usuario después de editar sus idiomas."""
+        if not self._built:
+            return
+        row = self.encode(languages)
+        with self._lock:
+            self.rows_by_user[user_id] = row
+
+    def rows(self, db: Session, user_ids: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Matrices (usuarios × LANGUAGE_SLOTS) de códigos y niveles en el orden de user_ids.
+        Con MATCHING_LANGUAGE_FEATURES_ENABLED salen de las filas en memoria; si no, se
+        codifican a partir de User.languages en una consulta.
+        """
+        user_ids = list(user_ids)
+        if settings.MATCHING_LANGUAGE_FEATURES_ENABLED:
+            self.ensure_built(db)
+            stored = self.rows_by_user
+            # Usuarios creados después de construir las filas: se codifican y se guardan
+            missing = [user_id for user_id in user_ids if user_id not in stored]
+            if missing:
+                loaded = self._load(db, missing)
+                with self._lock:
+                    self.rows_by_user.update(loaded)
+        else:
+            stored = self._load(db, user_ids)
+
+        codes = np.full((len(user_ids), LANGUAGE_SLOTS), -1, dtype=np.int16)
+        levels = np.zeros((len(user_ids), LANGUAGE_SLOTS), dtype=np.int8)
+        for i, user_id in enumerate(user_ids):
+            if user_id in stored:
+                codes[i], levels[i] = stored[user_id]
+        return codes, levels
+
+
+# Instancia global de las filas de idiomas
+language_features = LanguageFeatures()
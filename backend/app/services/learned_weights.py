@@ -0,0 +1,221 @@
+"""
+Pesos de componentes aprendidos del historial de emparejamientos.
+
+WeightTrainer es el trabajo offline: ajusta una regresión logística sobre las puntuaciones por
+componente de MatchScore y el resultado de cada par (MatchHistory) y guarda un artefacto
+versionado con los pesos de cada segmento: global ("global"), por rol del usuario que ordena
+("role:mentor", "role:mentee") y por mentor ("mentor:<id>"). Un segmento sin muestras
+suficientes de ambas clases no se guarda y se usa el segmento más general.
+
+LearnedWeights lee el artefacto vigente una sola vez; cada consulta es una búsqueda en un
+diccionario. Como mucho cada RELOAD_INTERVAL segundos comprueba el puntero de versión y, si
+el trabajo ha publicado una versión nueva, la recarga sin reiniciar el proceso.
+"""
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import threading
+import time
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.match_history import MatchHistory, SIDES
+from app.services.weighted_ranking import WEIGHT_FIELDS, COMPONENTS, weight_vector
+
+logger = logging.getLogger(__name__)
+
+# Muestras con resultado necesarias para ajustar un segmento
+MIN_SEGMENT_SAMPLES = 30
+
+# Segundos entre comprobaciones del puntero de versión
+RELOAD_INTERVAL = 30.0
+
+# Archivo con el número de la versión vigente dentro del directorio de artefactos
+CURRENT_FILE = "CURRENT"
+
+
+def fit_weights(components: np.ndarray, labels: np.ndarray, min_samples: int = MIN_SEGMENT_SAMPLES) -> Optional[Dict]:
+    """
+    Regresión logística de resultado ~ componentes sobre los pares con resultado (labels >= 0).
+    Los pesos son los coeficientes positivos normalizados a suma 1, con los nombres de campo de
+    MatchPreference. None si hay pocas muestras, una sola clase o ningún coeficiente positivo.
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    known = labels >= 0
+    features, outcomes = components[known], labels[known]
+    if len(outcomes) < min_samples or outcomes.min() == outcomes.max():
+        return None
+
+    model = LogisticRegression()
+    model.fit(features, outcomes)
+    coefficients = model.coef_[0]
+    positive = np.maximum(coefficients, 0.0)
+    if not positive.sum():
+        return None
+
+    return {
+        "weights": {field: float(value) for (_, field), value in zip(WEIGHT_FIELDS, positive / positive.sum())},
+        "coefficients": {component: float(value) for component, value in zip(COMPONENTS, coefficients)},
+        "intercept": float(model.intercept_[0]),
+        "samples": int(len(outcomes)),
+        "positive_rate": float(outcomes.mean())
+    }
+
+
+class WeightArtifactStore:
+    """
+    Artefactos de pesos en un directorio: weights-v<versión>.json más el puntero CURRENT.
+    Ambos se escriben en un archivo temporal y se renombran, así que un lector nunca ve un
+    artefacto a medio escribir.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.MATCHING_WEIGHTS_DIR
+
+    def path(self, version: int) -> str:
+        return os.path.join(self.directory, f"weights-v{version:06d}.json")
+
+    def current_version(self) -> int:
+        """Versión vigente; 0 si todavía no hay ninguna."""
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def load(self, version: Optional[int] = None) -> Optional[Dict]:
+        version = self.current_version() if version is None else version
+        if not version:
+            return None
+        with open(self.path(version)) as f:
+            return json.load(f)
+
+    def publish(self, artifact: Dict) -> int:
+        """Guarda el artefacto como la versión siguiente y la marca como vigente."""
+        os.makedirs(self.directory, exist_ok=True)
+        version = self.current_version() + 1
+        artifact = dict(artifact, version=version)
+        self._write(self.path(version), json.dumps(artifact, indent=2))
+        self._write(os.path.join(self.directory, CURRENT_FILE), str(version))
+        return version
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            f.write(content)
+        os.replace(temporary, path)
+
+
+class WeightTrainer:
+    """Ajusta los pesos de todos los segmentos sobre el historial completo y publica un artefacto."""
+
+    def __init__(self, db: Session, store: Optional[WeightArtifactStore] = None,
+                 min_samples: int = MIN_SEGMENT_SAMPLES):
+        self.db = db
+        self.store = store or WeightArtifactStore()
+        self.min_samples = min_samples
+
+    def fit(self, history: MatchHistory) -> Dict[str, Dict]:
+        segments: Dict[str, Optional[Dict]] = {
+            "global": fit_weights(history.components, history.labels(), self.min_samples)
+        }
+        for side in SIDES:
+            segments[f"role:{side}"] = fit_weights(history.components, history.labels(side), self.min_samples)
+
+        # Solo los mentores con muestras suficientes; el resto usa su rol o el global
+        labels = history.labels()
+        mentor_ids, counts = np.unique(history.mentor_ids[labels >= 0], return_counts=True)
+        for mentor_id in mentor_ids[counts >= self.min_samples]:
+            rows = history.mentor_ids == mentor_id
+            segments[f"mentor:{int(mentor_id)}"] = fit_weights(
+                history.components[rows], labels[rows], self.min_samples
+            )
+        return {name: segment for name, segment in segments.items() if segment is not None}
+
+    def train(self) -> Dict:
+        """Entrena y publica; devuelve la versión y un resumen de los segmentos ajustados."""
+        started = time.perf_counter()
+        history = MatchHistory.load(self.db)
+        segments = self.fit(history)
+        version = self.store.publish({
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+            "samples": int((history.labels() >= 0).sum()),
+            "segments": segments
+        })
+        return {
+            "version": version,
+            "matches": len(history),
+            "segments": len(segments),
+            "mentor_segments": sum(1 for name in segments if name.startswith("mentor:")),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+
+
+class LearnedWeights:
+    """Pesos del artefacto vigente en memoria, con recarga cuando se publica una versión nueva."""
+
+    def __init__(self, store: Optional[WeightArtifactStore] = None, reload_interval: float = RELOAD_INTERVAL):
+        self.store = store
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version = 0
+            self.segments: Dict[str, Dict[str, float]] = {}
+            self._checked_at: Optional[float] = None
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Recarga el artefacto si el puntero apunta a otra versión. Si esa versión falta o no se
+        puede leer se conservan los segmentos cargados y se vuelve a intentar en la siguiente
+        comprobación.
+        """
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.reload_interval:
+            return
+        store = self.store or WeightArtifactStore()
+        version = store.current_version()
+        try:
+            artifact = store.load(version) if version and version != self.version else None
+            segments = None if artifact is None else {
+                name: segment["weights"] for name, segment in artifact["segments"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            logger.exception("No se pudo cargar la versión %s de los pesos aprendidos", version)
+            segments = None
+        with self._lock:
+            self._checked_at = now
+            if segments is not None:
+                self.segments = segments
+                self.version = version
+
+    def segment_chain(self, user_id: int, role: Optional[str]) -> List[str]:
+        """Segmentos de un usuario del más específico al más general."""
+        chain = [f"mentor:{user_id}"] if role == "mentor" else []
+        if role:
+            chain.append(f"role:{role}")
+        chain.append("global")
+        return chain
+
+    def for_user(self, user_id: int, role: Optional[str]) -> Optional[Dict[str, float]]:
+        """Pesos (campos de MatchPreference) del segmento más específico disponible; None sin artefacto."""
+        self.refresh()
+        segments = self.segments
+        for name in self.segment_chain(user_id, role):
+            if name in segments:
+                return segments[name]
+        return None
+
+    def vector(self, user_id: int, role: Optional[str]) -> Optional[np.ndarray]:
+        weights = self.for_user(user_id, role)
+        return None if weights is None else weight_vector(weights)
+
+
+# Instancia global de los pesos aprendidos
+learned_weights = LearnedWeights()
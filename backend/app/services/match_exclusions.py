@@ -0,0 +1,90 @@
+from typing import List, Iterable, Tuple
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models.match_algorithm import MatchScore, MatchPreference
+
+# Estados de MatchScore que impiden volver a sugerir el par
+EXCLUDED_STATUSES = ("active", "rejected")
+
+
+def _pair_keys(mentor_ids, mentee_ids) -> np.ndarray:
+    """Clave entera única por par: mentor_id en los 32 bits altos, mentee_id en los bajos."""
+    return (np.asarray(mentor_ids, dtype=np.int64) << 32) | np.asarray(mentee_ids, dtype=np.int64)
+
+
+def preference_exclusions(exclusions) -> List[int]:
+    """Usuarios excluidos en MatchPreference.exclusions ({"user_ids": [...]})."""
+    if not isinstance(exclusions, dict):
+        return []
+    return [int(user_id) for user_id in exclusions.get("user_ids") or []]
+
+
+class MatchExclusions:
+    """
+    Conjunto precargado de pares (mentor, mentil) que no deben sugerirse: pares activos o
+    rechazados y usuarios excluidos en las preferencias. Se guarda como arreglo ordenado de
+    claves, en ambas orientaciones, para que la comprobación no toque la base de datos.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[int, int]] = ()):
+        pairs = list(pairs)
+        if pairs:
+            first, second = np.array(pairs, dtype=np.int64).T
+            keys = np.concatenate([_pair_keys(first, second), _pair_keys(second, first)])
+        else:
+            keys = np.zeros(0, dtype=np.int64)
+        self.keys = np.unique(keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def load_for_user(cls, db: Session, user_id: int) -> "MatchExclusions":
+        """Exclusiones de un usuario: una consulta de pares y una de preferencias."""
+        pairs = [tuple(row) for row in db.query(MatchScore.mentor_id, MatchScore.mentee_id).filter(
+            or_(MatchScore.mentor_id == user_id, MatchScore.mentee_id == user_id),
+            MatchScore.status.in_(EXCLUDED_STATUSES)
+        )]
+
+        preference = db.query(MatchPreference.exclusions).filter(
+            MatchPreference.user_id == user_id
+        ).first()
+        if preference:
+            pairs.extend((user_id, other_id) for other_id in preference_exclusions(preference[0]))
+
+        return cls(pairs)
+
+    @classmethod
+    def load_for_users(cls, db: Session, mentor_ids: List[int], mentee_ids: List[int]) -> "MatchExclusions":
+        """Exclusiones de un conjunto de mentores y mentiles (asignación por cohortes)."""
+        # Filtrar por el lado más pequeño; los pares con usuarios ajenos no afectan a mask
+        if len(mentee_ids) <= len(mentor_ids):
+            side = MatchScore.mentee_id.in_(mentee_ids)
+        else:
+            side = MatchScore.mentor_id.in_(mentor_ids)
+        pairs = [tuple(row) for row in db.query(MatchScore.mentor_id, MatchScore.mentee_id).filter(
+            side, MatchScore.status.in_(EXCLUDED_STATUSES)
+        )]
+
+        user_ids = set(mentor_ids) | set(mentee_ids)
+        for user_id, exclusions in db.query(MatchPreference.user_id, MatchPreference.exclusions).filter(
+            MatchPreference.user_id.in_(user_ids)
+        ):
+            pairs.extend((user_id, other_id) for other_id in preference_exclusions(exclusions))
+
+        return cls(pairs)
+
+    def excludes(self, mentor_id: int, mentee_id: int) -> bool:
+        return bool(self.mask([mentor_id], [mentee_id])[0, 0])
+
+    def mask(self, mentor_ids, mentee_ids) -> np.ndarray:
+        """Matriz booleana (mentiles × mentores); True = par excluido."""
+        mentor_ids = np.asarray(mentor_ids, dtype=np.int64)
+        mentee_ids = np.asarray(mentee_ids, dtype=np.int64)
+        if not len(self.keys):
+            return np.zeros((len(mentee_ids), len(mentor_ids)), dtype=bool)
+
+        keys = _pair_keys(mentor_ids[None, :], mentee_ids[:, None])
+        positions = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return self.keys[positions] == keys
@@ -0,0 +1,51 @@
+from typing import List, Dict, Set, Tuple
+from sqlalchemy.orm import Session
+from app.models import Skill, MentorSkill, MenteeInterest
+from app.services.availability_bitmap import AvailabilityBitmapService, overlap_slots, SLOT_MINUTES
+
+
+class MatchExplainer:
+    """
+    Construye match_details (habilidades comunes, horas semanales compartidas) para una lista
+    de pares. Se llama solo con los pares que sobreviven al ranking, o bajo demanda.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def explain_pairs(self, pairs: List[Tuple[int, int]]) -> List[Dict]:
+        """Una explicación por par (mentor_id, mentee_id), con un número fijo de consultas."""
+        if not pairs:
+            return []
+
+        mentor_ids = sorted({mentor_id for mentor_id, _ in pairs})
+        mentee_ids = sorted({mentee_id for _, mentee_id in pairs})
+
+        mentor_skills: Dict[int, Set[str]] = {}
+        for mentor_id, name in self.db.query(MentorSkill.mentor_id, Skill.name).join(
+            Skill, Skill.id == MentorSkill.skill_id
+        ).filter(MentorSkill.mentor_id.in_(mentor_ids)):
+            mentor_skills.setdefault(mentor_id, set()).add(name)
+
+        mentee_interests: Dict[int, Set[str]] = {}
+        for mentee_id, name in self.db.query(MenteeInterest.mentee_id, Skill.name).join(
+            Skill, Skill.id == MenteeInterest.skill_id
+        ).filter(MenteeInterest.mentee_id.in_(mentee_ids)):
+            mentee_interests.setdefault(mentee_id, set()).add(name)
+
+        bitmaps = AvailabilityBitmapService(self.db).get_bitmaps(mentor_ids + mentee_ids)
+        mentor_bitmaps = dict(zip(mentor_ids, bitmaps[:len(mentor_ids)]))
+        mentee_bitmaps = dict(zip(mentee_ids, bitmaps[len(mentor_ids):]))
+
+        return [
+            {
+                "matching_skills": sorted(mentor_skills.get(mentor_id, set()) & mentee_interests.get(mentee_id, set())),
+                "matching_availability": int(overlap_slots(
+                    mentor_bitmaps[mentor_id], mentee_bitmaps[mentee_id]
+                )) * SLOT_MINUTES / 60  # horas comunes por semana
+            }
+            for mentor_id, mentee_id in pairs
+        ]
+
+    def explain(self, mentor_id: int, mentee_id: int) -> Dict:
+        return self.explain_pairs([(mentor_id, mentee_id)])[0]
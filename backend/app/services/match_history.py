@@ -0,0 +1,99 @@
+from typing import Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.match_algorithm import MatchScore, MatchFeedback
+from app.services.match_store import SCORE_COLUMNS
+from app.services.weighted_ranking import COMPONENTS
+
+# Columna de MatchScore de cada componente
+COMPONENT_COLUMNS = {component: getattr(MatchScore, column) for column, component in SCORE_COLUMNS.items()}
+
+# Estados con resultado conocido cuando no hay valoraciones
+POSITIVE_STATUSES = ("accepted", "active", "completed")
+NEGATIVE_STATUSES = ("rejected",)
+
+# Valoración media (1-5) a partir de la cual un par cuenta como exitoso
+POSITIVE_RATING = 4
+
+SIDES = ("mentor", "mentee")
+
+
+class MatchHistory:
+    """
+    Historial de emparejamientos en arreglos columnares, cargado con dos consultas: una fila
+    por MatchScore con sus puntuaciones por componente (pares × COMPONENTS, 0 si faltan), su
+    estado y la suma y el número de valoraciones de MatchFeedback dadas por cada lado del par.
+    """
+
+    def __init__(self, match_ids, mentor_ids, mentee_ids, components, statuses, rating_sums, rating_counts):
+        self.match_ids = np.asarray(match_ids, dtype=np.int64)
+        self.mentor_ids = np.asarray(mentor_ids, dtype=np.int64)
+        self.mentee_ids = np.asarray(mentee_ids, dtype=np.int64)
+        self.components = np.asarray(components, dtype=np.float32).reshape(-1, len(COMPONENTS))
+        self.statuses = np.asarray(statuses, dtype=object)
+        # (pares × lados) en el orden de SIDES
+        self.rating_sums = np.asarray(rating_sums, dtype=np.float64).reshape(-1, len(SIDES))
+        self.rating_counts = np.asarray(rating_counts, dtype=np.int64).reshape(-1, len(SIDES))
+
+    def __len__(self) -> int:
+        return len(self.match_ids)
+
+    @classmethod
+    def load(cls, db: Session) -> "MatchHistory":
+        rows = db.query(
+            MatchScore.id, MatchScore.mentor_id, MatchScore.mentee_id, MatchScore.status,
+            *(COMPONENT_COLUMNS[component] for component in COMPONENTS)
+        ).order_by(MatchScore.id).all()
+
+        match_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        mentor_ids = np.array([row[1] or 0 for row in rows], dtype=np.int64)
+        mentee_ids = np.array([row[2] or 0 for row in rows], dtype=np.int64)
+        statuses = np.array([row[3] for row in rows], dtype=object)
+        components = np.array(
+            [[value or 0.0 for value in row[4:]] for row in rows], dtype=np.float32
+        ).reshape(-1, len(COMPONENTS))
+
+        rating_sums = np.zeros((len(rows), len(SIDES)), dtype=np.float64)
+        rating_counts = np.zeros((len(rows), len(SIDES)), dtype=np.int64)
+        feedback = db.query(MatchFeedback.match_id, MatchFeedback.user_id, MatchFeedback.rating).filter(
+            MatchFeedback.rating.isnot(None)
+        ).all()
+        if feedback and len(rows):
+            feedback_match = np.array([row[0] or 0 for row in feedback], dtype=np.int64)
+            positions = np.searchsorted(match_ids, feedback_match)
+            positions = np.minimum(positions, len(match_ids) - 1)
+            known = match_ids[positions] == feedback_match
+            users = np.array([row[1] or 0 for row in feedback], dtype=np.int64)[known]
+            ratings = np.array([row[2] for row in feedback], dtype=np.float64)[known]
+            positions = positions[known]
+            # Lado de quien valora: el mentor del par o, en otro caso, el mentil
+            sides = np.where(users == mentor_ids[positions], 0, 1)
+            np.add.at(rating_sums, (positions, sides), ratings)
+            np.add.at(rating_counts, (positions, sides), 1)
+
+        return cls(match_ids, mentor_ids, mentee_ids, components, statuses, rating_sums, rating_counts)
+
+    def status_labels(self) -> np.ndarray:
+        """1 en los estados de éxito, 0 en los rechazados y -1 sin resultado."""
+        labels = np.full(len(self), -1, dtype=np.int8)
+        labels[np.isin(self.statuses, POSITIVE_STATUSES)] = 1
+        labels[np.isin(self.statuses, NEGATIVE_STATUSES)] = 0
+        return labels
+
+    def mean_ratings(self, side: Optional[str] = None) -> np.ndarray:
+        """Valoración media de cada par (de un lado o de ambos); NaN sin valoraciones."""
+        columns = slice(None) if side is None else [SIDES.index(side)]
+        sums = self.rating_sums[:, columns].sum(axis=1)
+        counts = self.rating_counts[:, columns].sum(axis=1)
+        return np.divide(sums, counts, out=np.full(len(self), np.nan), where=counts > 0)
+
+    def labels(self, side: Optional[str] = None) -> np.ndarray:
+        """
+        Resultado de cada par: la valoración media (de un lado o de ambos) si existe, exitoso
+        a partir de POSITIVE_RATING; si no hay valoraciones, el del estado. -1 sin resultado.
+        """
+        ratings = self.mean_ratings(side)
+        rated = ~np.isnan(ratings)
+        labels = self.status_labels()
+        labels[rated] = (ratings[rated] >= POSITIVE_RATING).astype(np.int8)
+        return labels
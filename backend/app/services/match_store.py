@@ -0,0 +1,117 @@
+from typing import List, Dict, Sequence, Tuple
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+from app.models.match_algorithm import MatchScore
+
+# Columnas que se actualizan cuando el par ya existe. El estado no se toca: un par aceptado,
+# activo o rechazado conserva su estado aunque se vuelva a puntuar.
+SCORE_FIELDS = (
+    "total_score",
+    "skill_match_score",
+    "availability_score",
+    "style_match_score",
+    "goals_alignment_score",
+    "match_details"
+)
+
+# Columna de MatchScore (y de TopMatch) -> componente de BatchScoringService.score_block
+SCORE_COLUMNS = {
+    "total_score": "total",
+    "skill_match_score": "skills",
+    "availability_score": "schedule",
+    "style_match_score": "style",
+    "goals_alignment_score": "goals"
+}
+
+# Filas por sentencia; mantiene cada INSERT por debajo del límite de parámetros de SQLite
+UPSERT_CHUNK = 500
+
+
+def upsert_match_scores(
+    db: Session,
+    rows: List[Dict],
+    update_fields: Sequence[str] = SCORE_FIELDS
+) -> List[int]:
+    """
+    Inserta o actualiza filas de MatchScore por (mentor_id, mentee_id) con un único
+    INSERT … ON CONFLICT DO UPDATE … RETURNING por bloque. Devuelve los ids en el orden de rows.
+    No hace commit.
+    """
+    if not rows:
+        return []
+
+    # Un mismo par no puede aparecer dos veces en la sentencia; gana la última fila
+    unique_rows: Dict[Tuple[int, int], Dict] = {}
+    for row in rows:
+        unique_rows[(row["mentor_id"], row["mentee_id"])] = row
+    pending = list(unique_rows.values())
+
+    dialect = db.get_bind().dialect.name
+    ids: Dict[Tuple[int, int], int] = {}
+    for start in range(0, len(pending), UPSERT_CHUNK):
+        chunk = pending[start:start + UPSERT_CHUNK]
+        if dialect in ("postgresql", "sqlite"):
+            ids.update(_upsert_on_conflict(db, dialect, chunk, update_fields))
+        else:
+            ids.update(_upsert_generic(db, chunk, update_fields))
+
+    return [ids[(row["mentor_id"], row["mentee_id"])] for row in rows]
+
+
+def _upsert_on_conflict(db: Session, dialect: str, rows: List[Dict], update_fields: Sequence[str]) -> Dict:
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(MatchScore).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MatchScore.mentor_id, MatchScore.mentee_id],
+        set_={
+            **{field: stmt.excluded[field] for field in update_fields if field in rows[0]},
+            "updated_at": func.now()
+        }
+    ).returning(MatchScore.id, MatchScore.mentor_id, MatchScore.mentee_id)
+
+    return {(mentor_id, mentee_id): match_id for match_id, mentor_id, mentee_id in db.execute(stmt)}
+
+
+def _upsert_generic(db: Session, rows: List[Dict], update_fields: Sequence[str]) -> Dict:
+    """Alternativa sin ON CONFLICT: una consulta de existentes, un INSERT y un UPDATE masivos."""
+    mentor_ids = {row["mentor_id"] for row in rows}
+    mentee_ids = {row["mentee_id"] for row in rows}
+    existing = {
+        (mentor_id, mentee_id): match_id for match_id, mentor_id, mentee_id in
+        db.query(MatchScore.id, MatchScore.mentor_id, MatchScore.mentee_id).filter(
+            MatchScore.mentor_id.in_(mentor_ids),
+            MatchScore.mentee_id.in_(mentee_ids)
+        )
+    }
+
+    updates = [
+        {"id": existing[(row["mentor_id"], row["mentee_id"])],
+         **{field: row[field] for field in update_fields if field in row}}
+        for row in rows if (row["mentor_id"], row["mentee_id"]) in existing
+    ]
+    if updates:
+        db.execute(update(MatchScore), updates)
+
+    new_rows = [row for row in rows if (row["mentor_id"], row["mentee_id"]) not in existing]
+    if new_rows:
+        for match_id, mentor_id, mentee_id in db.execute(
+            insert(MatchScore).returning(MatchScore.id, MatchScore.mentor_id, MatchScore.mentee_id),
+            new_rows
+        ):
+            existing[(mentor_id, mentee_id)] = match_id
+    return existing
+
+
+def load_match_scores(db: Session, ids: List[int]) -> List[MatchScore]:
+    """Carga las filas de ids en ese orden, con los valores recién escritos."""
+    if not ids:
+        return []
+    matches = {
+        match.id: match for match in
+        db.query(MatchScore).filter(MatchScore.id.in_(ids)).populate_existing()
+    }
+    return [matches[match_id] for match_id in ids]
@@ -1,162 +1,100 @@
 from sqlalchemy.orm import Session
-from app.models.user import User, Mentor, Mentee
-from app.models.match_algorithm import MatchScore
-from typing import List
+from app.models.user import User
+from app.models.match_algorithm import MatchScore, MatchPreference
+from app.services.skill_index import skill_index
+from app.services.batch_scoring import BatchScoringService
+from app.services.pair_score_cache import PairScoreCache
+from app.services.match_store import upsert_match_scores, load_match_scores
+from app.services.candidate_filters import CandidateFilter
+from app.services.match_explanations import MatchExplainer
+from app.services.weighted_ranking import ComponentMatrix, COMPONENTS, component_matrices, weight_vector
+from app.services.learned_weights import learned_weights
+from app.core.profiling import profile_components
+from app.core.config import settings
+from typing import List, Dict
 import numpy as np
 
+@profile_components()
 class MatchingService:
     def __init__(self, db: Session):
         self.db = db
 
-    def calculate_skill_match(self, mentor: Mentor, mentee: Mentee) -> float:
+    def score_pairs(self, mentor_ids: List[int], mentee_ids: List[int]) -> Dict[str, np.ndarray]:
         """
-        Calcula la compatibilidad de habilidades entre mentor y mentee.
+        Puntuaciones de sugerencias para todos los pares (mentiles × mentores), calculadas por el
+        motor de puntuación con el perfil "suggestions". Firma compatible con PairScoreCache.get_scores.
         """
-        mentor_skills = set(skill.name for skill in mentor.skills)
-        mentee_interests = set(interest.name for interest in mentee.interests)
-        
-        if not mentor_skills or not mentee_interests:
-            return 0.0
-        
-        matching_skills = mentor_skills.intersection(mentee_interests)
-        return len(matching_skills) / max(len(mentor_skills), len(mentee_interests))
+        # Total con los pesos por defecto; get_suggestions aplica los pesos de cada usuario
+        return BatchScoringService(self.db, profile="suggestions").score_ids(mentor_ids, mentee_ids)
 
-    def calculate_availability_match(self, mentor: Mentor, mentee: Mentee) -> float:
+    def build_component_matrix(self, user: User, limit: int = 5) -> ComponentMatrix:
         """
-        Calcula la compatibilidad de disponibilidad horaria.
+        Matriz de componentes del usuario frente a todos sus candidatos no excluidos, leída de la
+        caché por par; solo se recalculan los pares con perfiles modificados.
         """
-        mentor_availability = set(
-            (av.day_of_week, av.start_time.hour)
-            for av in mentor.user.availability
-        )
-        mentee_availability = set(
-            (av.day_of_week, av.start_time.hour)
-            for av in mentee.user.availability
-        )
+        if user.role == "mentor":
+            candidates = skill_index.candidate_mentees(self.db, user.id, limit)
+            candidate_role = "mentee"
+        else:
+            candidates = skill_index.candidate_mentors(self.db, user.id, limit)
+            candidate_role = "mentor"
         
-        if not mentor_availability or not mentee_availability:
-            return 0.0
+        # Restricciones duras en SQL, incluidos los pares activos, rechazados o excluidos en las
+        # preferencias de cualquiera de los dos; sin candidatos suficientes en el índice se evalúan todos
+        candidate_ids = CandidateFilter.for_user(self.db, user.id, candidate_role).candidate_ids(self.db, candidates)
         
-        matching_slots = mentor_availability.intersection(mentee_availability)
-        return len(matching_slots) / max(len(mentor_availability), len(mentee_availability))
-
-    def calculate_style_match(self, mentor: Mentor, mentee: Mentee) -> float:
-        """
-        Calcula la compatibilidad de estilos de mentoría.
-        """
-        if not mentor.mentoring_style or not mentee.learning_style:
-            return 0.5  # valor neutral si no hay preferencias
-        
-        # Matriz de compatibilidad de estilos
-        style_compatibility = {
-            "directive": {
-                "structured": 0.9,
-                "self_directed": 0.3,
-                "collaborative": 0.6
-            },
-            "collaborative": {
-                "structured": 0.6,
-                "self_directed": 0.8,
-                "collaborative": 0.9
-            },
-            "supportive": {
-                "structured": 0.7,
-                "self_directed": 0.7,
-                "collaborative": 0.8
-            }
-        }
+        cache = PairScoreCache(self.db, scorer="suggestions")
+        if user.role == "mentor":
+            matrices = cache.get_scores([user.id], candidate_ids, self.score_pairs)
+            components = np.stack([matrices[component][:, 0] for component in COMPONENTS], axis=1)
+        else:
+            matrices = cache.get_scores(candidate_ids, [user.id], self.score_pairs)
+            components = np.stack([matrices[component][0] for component in COMPONENTS], axis=1)
         
-        return style_compatibility.get(mentor.mentoring_style, {}).get(mentee.learning_style, 0.5)
+        return ComponentMatrix(user.id, user.role, candidate_ids, components, recall=limit)
 
-    def calculate_goals_match(self, mentor: Mentor, mentee: Mentee) -> float:
-        """
-        Calcula la compatibilidad de objetivos.
-        """
-        if not mentee.specific_goals:
-            return 0.5
-        
-        mentor_expertise = set(mentor.expertise_areas)
-        goal_areas = set(goal["category"] for goal in mentee.specific_goals)
-        
-        if not mentor_expertise or not goal_areas:
-            return 0.5
-        
-        matching_areas = mentor_expertise.intersection(goal_areas)
-        return len(matching_areas) / len(goal_areas)
+    def rank(self, matrix: ComponentMatrix, weights: np.ndarray, limit: int = 5) -> List[Dict]:
+        """Los `limit` mejores pares de la matriz con los pesos dados, sin acceder a la base de datos."""
+        rows, totals = matrix.rank(weights, limit)
+        ranked = []
+        for row, total in zip(rows, totals):
+            mentor_id, mentee_id = matrix.pair(row)
+            scores = matrix.component_scores(row)
+            ranked.append({
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
+                "total_score": float(total),
+                "skill_match_score": scores["skills"],
+                "availability_score": scores["schedule"],
+                "style_match_score": scores["style"],
+                "goals_alignment_score": scores["goals"]
+            })
+        return ranked
 
     def get_suggestions(self, user: User, limit: int = 5) -> List[MatchScore]:
         """
-        Obtiene sugerencias de matching para un usuario.
+        Obtiene sugerencias de matching para un usuario, ponderadas con sus pesos de MatchPreference.
         """
-        if user.role == "mentor":
-            potential_matches = self.db.query(User).join(Mentee).all()
-            user_profile = user.mentor
-        else:
-            potential_matches = self.db.query(User).join(Mentor).all()
-            user_profile = user.mentee
-        
-        match_scores = []
-        for potential_match in potential_matches:
-            # Evitar matches existentes o rechazados
-            existing_match = self.db.query(MatchScore).filter(
-                ((MatchScore.mentor_id == user.id) & (MatchScore.mentee_id == potential_match.id)) |
-                ((MatchScore.mentor_id == potential_match.id) & (MatchScore.mentee_id == user.id))
-            ).first()
-            
-            if existing_match and existing_match.status in ["active", "rejected"]:
-                continue
-            
-            # Calcular scores
-            if user.role == "mentor":
-                mentor, mentee = user_profile, potential_match.mentee
-            else:
-                mentor, mentee = potential_match.mentor, user_profile
-            
-            skill_score = self.calculate_skill_match(mentor, mentee)
-            availability_score = self.calculate_availability_match(mentor, mentee)
-            style_score = self.calculate_style_match(mentor, mentee)
-            goals_score = self.calculate_goals_match(mentor, mentee)
-            
-            # Pesos para cada componente
-            weights = [0.3, 0.2, 0.2, 0.3]
-            total_score = np.average(
-                [skill_score, availability_score, style_score, goals_score],
-                weights=weights
-            )
-            
-            match_scores.append({
-                "mentor_id": mentor.user_id,
-                "mentee_id": mentee.user_id,
-                "total_score": total_score,
-                "skill_match_score": skill_score,
-                "availability_score": availability_score,
-                "style_match_score": style_score,
-                "goals_alignment_score": goals_score,
-                "match_details": {
-                    "matching_skills": list(set(s.name for s in mentor.skills) & 
-                                         set(i.name for i in mentee.interests)),
-                    "matching_availability": len(set(
-                        (av.day_of_week, av.start_time.hour)
-                        for av in mentor.user.availability
-                    ) & set(
-                        (av.day_of_week, av.start_time.hour)
-                        for av in mentee.user.availability
-                    ))
-                },
-                "status": "suggested"
-            })
-        
-        # Ordenar por score y limitar resultados
-        match_scores.sort(key=lambda x: x["total_score"], reverse=True)
-        top_matches = match_scores[:limit]
-        
-        # Crear registros de MatchScore
-        result = []
+        # La matriz se reconstruye desde la caché por par y queda en memoria para re-ordenar
+        matrix = component_matrices.put(self.build_component_matrix(user, limit))
+        preference = self.db.query(MatchPreference).filter(MatchPreference.user_id == user.id).first()
+        weights = weight_vector(preference)
+        if preference is None and settings.MATCHING_LEARNED_WEIGHTS_ENABLED:
+            # Sin pesos propios: los aprendidos del historial para su segmento, si los hay
+            learned = learned_weights.vector(user.id, user.role)
+            weights = weights if learned is None else learned
+        top_matches = self.rank(matrix, weights, limit)
         for match in top_matches:
-            db_match = MatchScore(**match)
-            self.db.add(db_match)
-            self.db.commit()
-            self.db.refresh(db_match)
-            result.append(db_match)
+            match["status"] = "suggested"
+        
+        # Detalles solo para las sugerencias seleccionadas
+        explanations = MatchExplainer(self.db).explain_pairs(
+            [(match["mentor_id"], match["mentee_id"]) for match in top_matches]
+        )
+        for match, details in zip(top_matches, explanations):
+            match["match_details"] = details
         
-        return result
+        # Guardar todas las sugerencias con un solo upsert
+        ids = upsert_match_scores(self.db, top_matches)
+        self.db.commit()
+        return load_match_scores(self.db, ids)
@@ -1,113 +1,23 @@
-from typing import List, Dict, Optional
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-from app.models.user import User, Mentor, Mentee
-from app.models.match_algorithm import MatchScore, MatchFeedback
+from typing import List, Dict
+from app.models.user import User
+from app.services.skill_index import skill_index
+from app.services.candidate_filters import CandidateFilter
+from app.services.mentor_success import MentorSuccessService
+from app.services.match_explanations import MatchExplainer
+from app.services.batch_scoring import BatchScoringService
+from app.core.profiling import profile_components
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
 
+@profile_components("_apply_feedback_adjustments")
 class MatchingAlgorithm:
     def __init__(self, db: Session):
         self.db = db
-        self.scaler = StandardScaler()
-
-    def _extract_skills_vector(self, skills: List[str], all_skills: List[str]) -> np.ndarray:
-        """Convierte una lista de habilidades en un vector binario."""
-        return np.array([1 if skill in skills else 0 for skill in all_skills])
-
-    def _calculate_availability_overlap(self, mentor_availability: List[Dict], mentee_availability: List[Dict]) -> float:
-        """Calcula el solapamiento de disponibilidad horaria."""
-        if not mentor_availability or not mentee_availability:
-            return 0.0
-
-        mentor_slots = set()
-        mentee_slots = set()
-
-        for slot in mentor_availability:
-            start = datetime.fromisoformat(slot["start_time"])
-            end = datetime.fromisoformat(slot["end_time"])
-            while start < end:
-                mentor_slots.add((start.weekday(), start.hour))
-                start += timedelta(hours=1)
-
-        for slot in mentee_availability:
-            start = datetime.fromisoformat(slot["start_time"])
-            end = datetime.fromisoformat(slot["end_time"])
-            while start < end:
-                mentee_slots.add((start.weekday(), start.hour))
-                start += timedelta(hours=1)
-
-        overlap = mentor_slots.intersection(mentee_slots)
-        total_slots = mentor_slots.union(mentee_slots)
-
-        return len(overlap) / len(total_slots) if total_slots else 0.0
-
-    def _calculate_experience_match(self, mentor: Mentor, mentee: Mentee) -> float:
-        """Calcula la compatibilidad basada en experiencia y objetivos."""
-        if not mentor.experience_years or not mentee.career_stage:
-            return 0.5
-
-        # Mapeo de etapas de carrera a años de experiencia deseados
-        stage_experience_map = {
-            "student": (0, 3),
-            "early-career": (2, 5),
-            "mid-career": (4, 10),
-            "senior": (8, float("inf"))
-        }
-
-        desired_range = stage_experience_map.get(mentee.career_stage, (0, float("inf")))
-        if desired_range[0] <= mentor.experience_years <= (desired_range[1] if desired_range[1] != float("inf") else mentor.experience_years + 1):
-            return 1.0
-        return 0.5
-
-    def _calculate_style_compatibility(self, mentor_style: str, mentee_style: str) -> float:
-        """Calcula la compatibilidad de estilos de mentoría/aprendizaje."""
-        compatibility_matrix = {
-            "directive": {"structured": 0.9, "self_directed": 0.3, "collaborative": 0.6},
-            "collaborative": {"structured": 0.6, "self_directed": 0.8, "collaborative": 0.9},
-            "supportive": {"structured": 0.7, "self_directed": 0.7, "collaborative": 0.8}
-        }
-        return compatibility_matrix.get(mentor_style, {}).get(mentee_style, 0.5)
-
-    def _calculate_goals_alignment(self, mentor: Mentor, mentee: Mentee) -> float:
-        """Calcula la alineación entre las áreas de experiencia del mentor y los objetivos del mentee."""
-        if not mentor.expertise_areas or not mentee.specific_goals:
-            return 0.5
-
-        mentor_areas = set(mentor.expertise_areas)
-        mentee_goal_areas = set(goal["category"] for goal in mentee.specific_goals)
-
-        matching_areas = mentor_areas.intersection(mentee_goal_areas)
-        return len(matching_areas) / len(mentee_goal_areas)
-
-    def _get_historical_success(self, mentor_id: int) -> float:
-        """Obtiene la tasa de éxito histórica del mentor basada en feedback."""
-        feedbacks = self.db.query(MatchFeedback).join(MatchScore).filter(
-            MatchScore.mentor_id == mentor_id
-        ).all()
-
-        if not feedbacks:
-            return 0.5
-
-        avg_rating = sum(f.rating for f in feedbacks) / len(feedbacks)
-        return avg_rating / 5.0  # Normalizar a escala 0-1
-
-    def _apply_feedback_adjustments(self, base_score: float, mentor_id: int, mentee_id: int) -> float:
-        """Ajusta el score basado en feedback histórico y preferencias."""
-        historical_success = self._get_historical_success(mentor_id)
-        
-        # Obtener preferencias de matching previas
-        previous_matches = self.db.query(MatchScore).filter(
-            ((MatchScore.mentor_id == mentor_id) & (MatchScore.mentee_id == mentee_id)) |
-            ((MatchScore.mentor_id == mentee_id) & (MatchScore.mentee_id == mentor_id))
-        ).all()
 
+    def _apply_feedback_adjustments(self, base_score: float, historical_success: float, rejected_matches: int) -> float:
+        """Ajusta el score con el éxito histórico del mentor y los rechazos previos del par."""
         # Ajustar score basado en matches previos
-        if previous_matches:
-            rejected_matches = sum(1 for m in previous_matches if m.status == "rejected")
-            if rejected_matches > 0:
-                base_score *= 0.8 ** rejected_matches
+        if rejected_matches > 0:
+            base_score *= 0.8 ** rejected_matches
 
         # Combinar con éxito histórico
         adjusted_score = (base_score * 0.7) + (historical_success * 0.3)
@@ -116,76 +26,63 @@ class MatchingAlgorithm:
     def generate_matches(self, user: User, limit: int = 5) -> List[Dict]:
         """Genera sugerencias de matching para un usuario."""
         if user.role == "mentor":
-            potential_matches = self.db.query(User).join(Mentee).all()
-            user_profile = user.mentor
+            candidates = skill_index.candidate_mentees(self.db, user.id, limit)
+            candidate_role = "mentee"
         else:
-            potential_matches = self.db.query(User).join(Mentor).all()
-            user_profile = user.mentee
-
-        matches = []
-        for potential_match in potential_matches:
-            # Evitar matches existentes o rechazados
-            existing_match = self.db.query(MatchScore).filter(
-                ((MatchScore.mentor_id == user.id) & (MatchScore.mentee_id == potential_match.id)) |
-                ((MatchScore.mentor_id == potential_match.id) & (MatchScore.mentee_id == user.id))
-            ).first()
-
-            if existing_match and existing_match.status in ["active", "rejected"]:
-                continue
+            candidates = skill_index.candidate_mentors(self.db, user.id, limit)
+            candidate_role = "mentor"
 
-            # Calcular componentes del score
-            if user.role == "mentor":
-                mentor, mentee = user_profile, potential_match.mentee
-            else:
-                mentor, mentee = potential_match.mentor, user_profile
+        # Restricciones duras en SQL, incluidos los pares activos, rechazados o excluidos en las
+        # preferencias de cualquiera de los dos; sin candidatos suficientes en el índice se evalúan todos
+        candidate_ids = CandidateFilter.for_user(self.db, user.id, candidate_role).candidate_ids(self.db, candidates)
 
-            skill_score = self._calculate_skill_match(mentor, mentee)
-            availability_score = self._calculate_availability_overlap(
-                mentor.user.availability, mentee.user.availability
-            )
-            style_score = self._calculate_style_compatibility(
-                mentor.mentoring_style, mentee.learning_style
-            )
-            goals_score = self._calculate_goals_alignment(mentor, mentee)
-            experience_score = self._calculate_experience_match(mentor, mentee)
+        # Todos los componentes frente a todos los candidatos con el perfil "algorithm" del motor
+        engine = BatchScoringService(self.db, profile="algorithm")
+        if user.role == "mentor":
+            scores = {key: matrix[:, 0] for key, matrix in engine.score_ids([user.id], candidate_ids).items()}
+        else:
+            scores = {key: matrix[0] for key, matrix in engine.score_ids(candidate_ids, [user.id]).items()}
 
-            # Calcular score base
-            base_score = np.mean([
-                skill_score * 0.3,
-                availability_score * 0.2,
-                style_score * 0.2,
-                goals_score * 0.2,
-                experience_score * 0.1
-            ])
+        # Éxito histórico de los mentores y rechazos previos desde los agregados
+        success_service = MentorSuccessService(self.db)
+        rejections = success_service.pair_rejections(user.id)
+        if user.role == "mentor":
+            historical_success = success_service.historical_success([user.id]).repeat(len(candidate_ids))
+        else:
+            historical_success = success_service.historical_success(candidate_ids)
 
-            # Ajustar score con feedback histórico
+        # Fase 1: solo las puntuaciones numéricas necesarias para ordenar
+        matches = []
+        experience_scores = {}
+        for position, candidate_id in enumerate(candidate_ids):
+            # Score base: media de los componentes ponderados, calculada por el motor
             final_score = self._apply_feedback_adjustments(
-                base_score, mentor.user_id, mentee.user_id
+                float(scores["total"][position]), float(historical_success[position]), rejections.get(candidate_id, 0)
             )
 
+            mentor_id, mentee_id = (user.id, candidate_id) if user.role == "mentor" else (candidate_id, user.id)
             matches.append({
-                "mentor_id": mentor.user_id,
-                "mentee_id": mentee.user_id,
+                "mentor_id": mentor_id,
+                "mentee_id": mentee_id,
                 "total_score": final_score,
-                "skill_match_score": skill_score,
-                "availability_score": availability_score,
-                "style_match_score": style_score,
-                "goals_alignment_score": goals_score,
-                "match_details": {
-                    "matching_skills": list(set(s.name for s in mentor.skills) & 
-                                         set(i.name for i in mentee.interests)),
-                    "matching_availability": len(set(
-                        (av.day_of_week, av.start_time.hour)
-                        for av in mentor.user.availability
-                    ) & set(
-                        (av.day_of_week, av.start_time.hour)
-                        for av in mentee.user.availability
-                    )),
-                    "experience_compatibility": experience_score
-                },
+                "skill_match_score": float(scores["skills"][position]),
+                "availability_score": float(scores["availability"][position]),
+                "style_match_score": float(scores["style"][position]),
+                "goals_alignment_score": float(scores["goals"][position]),
                 "status": "suggested"
             })
+            experience_scores[candidate_id] = float(scores["experience"][position])
 
         # Ordenar por score y limitar resultados
         matches.sort(key=lambda x: x["total_score"], reverse=True)
-        return matches[:limit]
+        top_matches = matches[:limit]
+
+        # Fase 2: explicaciones solo para los matches devueltos
+        explanations = MatchExplainer(self.db).explain_pairs(
+            [(match["mentor_id"], match["mentee_id"]) for match in top_matches]
+        )
+        for match, details in zip(top_matches, explanations):
+            other_id = match["mentee_id"] if user.role == "mentor" else match["mentor_id"]
+            details["experience_compatibility"] = experience_scores[other_id]
+            match["match_details"] = details
+        return top_matches
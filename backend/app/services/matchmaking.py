@@ -1,7 +1,20 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+import heapq
+import numpy as np
 from sqlalchemy.orm import Session
-from app.models import Mentor, Mentee, MentorSkill, MenteeInterest, Availability, User
+from app.models import Mentor, Mentee, User
+from app.models.matching import Industry, UserIndustryExperience, MentoringPreference
+from app.services.batch_scoring import BatchScoringService
+from app.services.pair_score_cache import PairScoreCache
+from app.services.candidate_filters import CandidateFilter
+from app.services.skill_index import skill_index
+from app.services.language_features import parse_languages
+from app.services.profile_embeddings import profile_embeddings
+from app.services.pruned_top_k import PrunedTopK
+from app.services.availability_bitmap import AvailabilityBitmapService, week_overlaps
+from app.core.profiling import profile_components
 
+@profile_components("check_schedule_compatibility")
 class MatchmakingService:
     """
     Servicio para emparejar mentores y mentiles basado en compatibilidad de perfiles y disponibilidad.
@@ -11,281 +24,41 @@ class MatchmakingService:
     def calculate_profile_compatibility(mentor_id: int, mentee_id: int, db: Session) -> Dict[str, float]:
         """
         Calculate comprehensive compatibility between a mentor and mentee.
-        Returns a dictionary with detailed compatibility scores.
+        Returns a dictionary with detailed compatibility scores. The pair goes through the
+        batch scoring engine, so languages come from the precomputed per-user arrays and the
+        scores match the ones used for ranking.
         """
-        # Get base compatibility scores (skills, language, career)
-        base_scores = MatchmakingService._calculate_base_compatibility(mentor_id, mentee_id, db)
-        
-        # Calculate industry experience compatibility
-        industry_score = MatchmakingService._calculate_industry_compatibility(mentor_id, mentee_id, db)
-        
-        # Calculate mentoring style compatibility
-        style_score = MatchmakingService._calculate_mentoring_style_compatibility(mentor_id, mentee_id, db)
-        
-        # Calculate goals alignment
-        goals_score = MatchmakingService._calculate_goals_alignment(mentor_id, mentee_id, db)
-        
-        # Calculate weighted total score
-        weights = {
-            "skills": 0.25,
-            "language": 0.15,
-            "career": 0.15,
-            "industry": 0.20,
-            "style": 0.15,
-            "goals": 0.10
-        }
-        
-        total_score = sum(
-            score * weights[key]
-            for key, score in {
-                "skills": base_scores["skills_compatibility"],
-                "language": base_scores["language_compatibility"],
-                "career": base_scores["career_compatibility"],
-                "industry": industry_score,
-                "style": style_score,
-                "goals": goals_score
-            }.items()
-        )
-
+        scores = BatchScoringService(db).score_ids([mentor_id], [mentee_id])
         return {
-            "total": total_score,
-            "skills_compatibility": base_scores["skills_compatibility"],
-            "language_compatibility": base_scores["language_compatibility"],
-            "career_compatibility": base_scores["career_compatibility"],
-            "industry_compatibility": industry_score,
-            "style_compatibility": style_score,
-            "goals_alignment": goals_score
+            "total": float(scores["profile"][0, 0]),
+            "skills_compatibility": float(scores["skills"][0, 0]),
+            "language_compatibility": float(scores["language"][0, 0]),
+            "career_compatibility": float(scores["career"][0, 0]),
+            "industry_compatibility": float(scores["industry"][0, 0]),
+            "style_compatibility": float(scores["style"][0, 0]),
+            "goals_alignment": float(scores["goals"][0, 0])
         }
 
-    @staticmethod
-    def _calculate_industry_compatibility(mentor_id: int, mentee_id: int, db: Session) -> float:
-        """Calculate compatibility based on industry experience."""
-        mentor_exp = db.query(UserIndustryExperience).filter(
-            UserIndustryExperience.user_id == mentor_id
-        ).all()
-        
-        mentee_goals = db.query(MentorshipGoal).filter(
-            MentorshipGoal.user_id == mentee_id
-        ).all()
-        
-        if not mentor_exp or not mentee_goals:
-            return 0.0
-            
-        # Create industry experience map for mentor
-        mentor_industries = {
-            exp.industry_id: {
-                "years": exp.years_experience,
-                "is_current": exp.is_current,
-                "level": exp.position_level
-            }
-            for exp in mentor_exp
-        }
-        
-        # Calculate relevance score for each mentee goal
-        total_score = 0
-        max_score = len(mentee_goals)
-        
-        for goal in mentee_goals:
-            # Find relevant industry experience
-            relevant_exp = next(
-                (exp for exp in mentor_exp if exp.industry.category == goal.category),
-                None
-            )
-            
-            if relevant_exp:
-                # Base score for having relevant experience
-                goal_score = 0.5
-                
-                # Bonus for current industry experience
-                if relevant_exp.is_current:
-                    goal_score += 0.2
-                    
-                # Bonus for years of experience (max bonus at 10 years)
-                exp_bonus = min(relevant_exp.years_experience / 10, 0.3)
-                goal_score += exp_bonus
-                
-                total_score += goal_score * goal.priority / 5  # Weight by goal priority
-                
-        return total_score / max_score if max_score > 0 else 0.0
-
-    @staticmethod
-    def _calculate_mentoring_style_compatibility(mentor_id: int, mentee_id: int, db: Session) -> float:
-        """Calculate compatibility based on mentoring style and preferences."""
-        mentor_prefs = db.query(MentoringPreference).filter(
-            MentoringPreference.user_id == mentor_id
-        ).first()
-        
-        mentee_prefs = db.query(MentoringPreference).filter(
-            MentoringPreference.user_id == mentee_id
-        ).first()
-        
-        if not mentor_prefs or not mentee_prefs:
-            return 0.0
-            
-        score = 0.0
-        
-        # Style compatibility
-        style_match = {
-            # Mentee preferred -> Compatible mentor styles
-            "directive": ["directive", "challenging"],
-            "collaborative": ["collaborative", "supportive"],
-            "supportive": ["supportive", "collaborative"],
-            "challenging": ["challenging", "directive"]
-        }
-        if mentor_prefs.preferred_style in style_match.get(mentee_prefs.preferred_style, []):
-            score += 0.4
-            
-        # Session structure compatibility
-        if mentor_prefs.structured_sessions == mentee_prefs.structured_sessions:
-            score += 0.2
-            
-        # Meeting frequency compatibility
-        freq_diff = abs(mentor_prefs.meeting_frequency - mentee_prefs.meeting_frequency)
-        score += 0.2 * (1 - min(freq_diff / 4, 1))  # Max difference of 4 meetings/month
-        
-        # Session duration compatibility
-        duration_diff = abs(mentor_prefs.session_duration - mentee_prefs.session_duration)
-        score += 0.2 * (1 - min(duration_diff / 60, 1))  # Max difference of 60 minutes
-        
-        return score
-
-    @staticmethod
-    def _calculate_goals_alignment(mentor_id: int, mentee_id: int, db: Session) -> float:
-        """Calculate compatibility based on mentorship goals alignment."""
-        mentee_goals = db.query(MentorshipGoal).filter(
-            MentorshipGoal.user_id == mentee_id
-        ).all()
-        
-        mentor_exp = db.query(UserIndustryExperience).filter(
-            UserIndustryExperience.user_id == mentor_id
-        ).all()
-        
-        if not mentee_goals or not mentor_exp:
-            return 0.0
-            
-        total_score = 0
-        max_score = sum(goal.priority for goal in mentee_goals)
-        
-        for goal in mentee_goals:
-            # Find relevant mentor experience for this goal
-            relevant_exp = next(
-                (exp for exp in mentor_exp if exp.industry.category == goal.category),
-                None
-            )
-            
-            if relevant_exp:
-                goal_score = 0.0
-                
-                # Base score for category match
-                goal_score += 0.4
-                
-                # Bonus for experience level
-                if relevant_exp.position_level in ["Senior", "Lead", "Manager"]:
-                    goal_score += 0.3
-                
-                # Bonus for timeline alignment
-                if relevant_exp.years_experience >= goal.timeline_months / 12:
-                    goal_score += 0.3
-                
-                total_score += goal_score * goal.priority
-                
-        return total_score / max_score if max_score > 0 else 0.0
-
-        # Language compatibility
-        mentor_languages = db.query(UserLanguage).filter(UserLanguage.user_id == mentor_id).all()
-        mentee_languages = db.query(UserLanguage).filter(UserLanguage.user_id == mentee_id).all()
-        
-        language_score = 0.0
-        if mentor_languages and mentee_languages:
-            common_languages = set(m.language_code for m in mentor_languages) & set(m.language_code for m in mentee_languages)
-            if common_languages:
-                # Find the best matching language proficiency
-                best_match = 0
-                for lang in common_languages:
-                    mentor_prof = next(m.proficiency for m in mentor_languages if m.language_code == lang)
-                    mentee_prof = next(m.proficiency for m in mentee_languages if m.language_code == lang)
-                    prof_values = {"basic": 1, "intermediate": 2, "advanced": 3, "native": 4}
-                    match = min(prof_values[mentor_prof], prof_values[mentee_prof]) / 4
-                    best_match = max(best_match, match)
-                language_score = best_match
-
-        # Career path alignment
-        mentor_paths = db.query(UserCareerPath).filter(UserCareerPath.user_id == mentor_id).all()
-        mentee_paths = db.query(UserCareerPath).filter(UserCareerPath.user_id == mentee_id).all()
-        
-        career_score = 0.0
-        if mentor_paths and mentee_paths:
-            mentor_path_ids = set(p.career_path_id for p in mentor_paths)
-            mentee_path_ids = set(p.career_path_id for p in mentee_paths)
-            matching_paths = mentor_path_ids & mentee_path_ids
-            
-            if matching_paths:
-                # Consider experience in matching paths
-                total_exp = 0
-                for path_id in matching_paths:
-                    mentor_exp = next(p.years_experience for p in mentor_paths if p.career_path_id == path_id)
-                    total_exp += min(mentor_exp, 10)  # Cap at 10 years
-                career_score = min(total_exp / 10, 1.0)  # Normalize to 0-1
-
-        # Calculate weighted total score
-        weights = {
-            "skills": 0.4,
-            "language": 0.3,
-            "career": 0.3
-        }
-        
-        total_score = (
-            skills_score * weights["skills"] +
-            language_score * weights["language"] +
-            career_score * weights["career"]
-        )
-
-        return {
-            "total": total_score,
-            "skills_compatibility": skills_score,
-            "language_compatibility": language_score,
-            "career_compatibility": career_score
-        }
-    
     @staticmethod
     def check_schedule_compatibility(mentor_id: int, mentee_id: int, db: Session) -> float:
         """
         Verifica la compatibilidad de horarios entre un mentor y un mentil.
         Retorna un valor entre 0 y 1, donde 1 significa que tienen muchos horarios compatibles.
         """
-        # Obtener disponibilidad del mentor
-        mentor_availability = db.query(Availability).join(User).join(Mentor).filter(Mentor.user_id == mentor_id).all()
-        
-        # Obtener disponibilidad del mentil
-        mentee_availability = db.query(Availability).join(User).join(Mentee).filter(Mentee.user_id == mentee_id).all()
-        
+        # Intervalos semanales ya compilados a UTC con la zona horaria de cada uno
+        compiled = AvailabilityBitmapService(db).get_compiled([mentor_id, mentee_id])
+        mentor_slots = np.array(compiled[mentor_id][0], dtype=np.int64).reshape(-1, 2)
+        mentee_slots = np.array(compiled[mentee_id][0], dtype=np.int64).reshape(-1, 2)
+
         # Si alguno no tiene disponibilidad, la compatibilidad es 0
-        if not mentor_availability or not mentee_availability:
+        if not len(mentor_slots) or not len(mentee_slots):
             return 0.0
-        
-        # Contar cuántos slots de tiempo se solapan
-        overlapping_slots = 0
-        total_slots = len(mentor_availability) * len(mentee_availability)
-        
-        for mentor_slot in mentor_availability:
-            for mentee_slot in mentee_availability:
-                # Verificar si los días coinciden
-                if mentor_slot.day_of_week == mentee_slot.day_of_week:
-                    # Convertir horas a minutos para facilitar la comparación
-                    mentor_start = MatchmakingService._time_to_minutes(mentor_slot.start_time)
-                    mentor_end = MatchmakingService._time_to_minutes(mentor_slot.end_time)
-                    mentee_start = MatchmakingService._time_to_minutes(mentee_slot.start_time)
-                    mentee_end = MatchmakingService._time_to_minutes(mentee_slot.end_time)
-                    
-                    # Verificar si hay solapamiento
-                    if max(mentor_start, mentee_start) < min(mentor_end, mentee_end):
-                        overlapping_slots += 1
-        
-        # Normalizar el resultado
-        if total_slots == 0:
-            return 0.0
-        
-        return overlapping_slots / min(len(mentor_availability), len(mentee_availability))
+
+        # Contar cuántos pares de franjas se solapan (todas las parejas a la vez)
+        overlapping = week_overlaps(
+            mentor_slots[:, None, 0], mentor_slots[:, None, 1], mentee_slots[None, :, 0], mentee_slots[None, :, 1]
+        )
+        return int(overlapping.sum()) / min(len(mentor_slots), len(mentee_slots))
     
     @staticmethod
     def _time_to_minutes(time_str: str) -> int:
@@ -297,94 +70,99 @@ class MatchmakingService:
     def find_matches_for_mentee(mentee_id: int, db: Session, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Find the best mentors for a specific mentee with comprehensive matching criteria.
+        All mentors are scored at once by the batch scoring engine; details are only
+        loaded for the mentors that make it into the result.
         """
-        mentors = db.query(Mentor).all()
         mentee = db.query(Mentee).filter(Mentee.user_id == mentee_id).first()
         
         if not mentee:
             return []
             
+        # Candidate generation through the embedding index, then the skill index (None means full scan)
+        candidates = profile_embeddings.candidate_mentors(db, mentee_id, limit)
+        if candidates is None:
+            candidates = skill_index.candidate_mentors(db, mentee_id, limit)
+        
+        # Hard constraints (active, capacity, active/rejected pairs, exclusions on either side,
+        # languages, industries) are applied in SQL, so no pair is filtered again after this
+        candidate_ids = CandidateFilter.for_user(db, mentee_id, "mentor").candidate_ids(db, candidates)
+        
+        # Scores come from the pair-score cache; only pairs whose profiles changed are re-scored
+        engine = BatchScoringService(db)
+        cache = PairScoreCache(db)
+        
+        # Top-k with upper-bound pruning: mentors that cannot reach the top are never fully scored
+        top, scores = PrunedTopK(db).search(
+            candidate_ids, [mentee_id], limit,
+            lambda mentor_ids, mentee_ids: cache.compute_scores(mentor_ids, mentee_ids, engine.score_ids),
+            known=cache.lookup(candidate_ids, [mentee_id])
+        )
+        mentor_ids = [candidate_ids[i] for i in top]
+        
+        # Get mentor details for the selected mentors only
+        mentors = {m.user_id: m for m in db.query(Mentor).filter(Mentor.user_id.in_(mentor_ids)).all()}
+        users = {u.id: u for u in db.query(User).filter(User.id.in_(mentor_ids)).all()}
+        
+        industry_info: Dict[int, List[Dict[str, Any]]] = {}
+        industry_exp = db.query(UserIndustryExperience, Industry).join(
+            Industry, Industry.id == UserIndustryExperience.industry_id
+        ).filter(
+            UserIndustryExperience.user_id.in_(mentor_ids)
+        ).order_by(UserIndustryExperience.id).all()
+        for exp, industry in industry_exp:
+            industry_info.setdefault(exp.user_id, []).append({
+                "industry": industry.name,
+                "years": exp.years_experience,
+                "position": exp.position_level,
+                "is_current": exp.is_current
+            })
+        
+        mentor_prefs: Dict[int, MentoringPreference] = {}
+        for prefs in db.query(MentoringPreference).filter(
+            MentoringPreference.user_id.in_(mentor_ids)
+        ).order_by(MentoringPreference.id).all():
+            mentor_prefs.setdefault(prefs.user_id, prefs)
+        
         matches = []
-        for mentor in mentors:
-            # Calculate comprehensive compatibility scores
-            profile_scores = MatchmakingService.calculate_profile_compatibility(mentor.user_id, mentee_id, db)
-            schedule_score = MatchmakingService.check_schedule_compatibility(mentor.user_id, mentee_id, db)
-            
-            # Calculate final score (70% profile, 30% schedule)
-            total_score = (profile_scores["total"] * 0.7) + (schedule_score * 0.3)
-            
-            # Get mentor details
-            mentor_user = db.query(User).filter(User.id == mentor.user_id).first()
-            
-            # Get mentor's industry experience
-            industry_exp = db.query(UserIndustryExperience).join(Industry).filter(
-                UserIndustryExperience.user_id == mentor.user_id
-            ).all()
-            
-            industry_info = [
-                {
-                    "industry": exp.industry.name,
-                    "years": exp.years_experience,
-                    "position": exp.position_level,
-                    "is_current": exp.is_current
-                }
-                for exp in industry_exp
-            ]
-            
-            # Get mentoring preferences
-            mentor_prefs = db.query(MentoringPreference).filter(
-                MentoringPreference.user_id == mentor.user_id
-            ).first()
+        for i in top:
+            mentor_id = candidate_ids[i]
+            mentor = mentors[mentor_id]
+            prefs = mentor_prefs.get(mentor_id)
             
             mentoring_style = {
-                "style": mentor_prefs.preferred_style if mentor_prefs else None,
-                "session_structure": mentor_prefs.structured_sessions if mentor_prefs else None,
-                "meeting_frequency": mentor_prefs.meeting_frequency if mentor_prefs else None,
-                "session_duration": mentor_prefs.session_duration if mentor_prefs else None,
-                "goals_focus": mentor_prefs.goals_focus if mentor_prefs else None
+                "style": prefs.preferred_style if prefs else None,
+                "session_structure": prefs.structured_sessions if prefs else None,
+                "meeting_frequency": prefs.meeting_frequency if prefs else None,
+                "session_duration": prefs.session_duration if prefs else None,
+                "goals_focus": prefs.goals_focus if prefs else None
             }
             
-            # Get languages and career paths (from previous implementation)
-            languages = db.query(UserLanguage).filter(UserLanguage.user_id == mentor.user_id).all()
-            language_info = [{"code": lang.language_code, "level": lang.proficiency} for lang in languages]
-            
-            career_paths = db.query(UserCareerPath).join(CareerPath).filter(
-                UserCareerPath.user_id == mentor.user_id
-            ).all()
-            career_info = [
-                {
-                    "name": path.career_path.name,
-                    "years": path.years_experience,
-                    "is_current": path.is_current
-                }
-                for path in career_paths
-            ]
-            
             matches.append({
-                "mentor_id": mentor.user_id,
-                "name": mentor_user.name,
+                "mentor_id": mentor_id,
+                "name": users[mentor_id].name,
                 "position": mentor.position,
                 "company": mentor.company,
                 "experience_years": mentor.experience_years,
-                "industry_experience": industry_info,
+                "industry_experience": industry_info.get(mentor_id, []),
                 "mentoring_style": mentoring_style,
-                "languages": language_info,
-                "career_paths": career_info,
+                "languages": [
+                    {"code": code, "level": level} for code, level in parse_languages(users[mentor_id].languages)
+                ],
+                "career_paths": [],
                 "compatibility_scores": {
-                    "skills": profile_scores["skills_compatibility"],
-                    "language": profile_scores["language_compatibility"],
-                    "career": profile_scores["career_compatibility"],
-                    "industry": profile_scores["industry_compatibility"],
-                    "style": profile_scores["style_compatibility"],
-                    "goals": profile_scores["goals_alignment"],
-                    "schedule": schedule_score,
-                    "total": total_score
-                }
+                    "skills": float(scores["skills"][0, i]),
+                    "language": float(scores["language"][0, i]),
+                    "career": float(scores["career"][0, i]),
+                    "industry": float(scores["industry"][0, i]),
+                    "style": float(scores["style"][0, i]),
+                    "goals": float(scores["goals"][0, i]),
+                    "schedule": float(scores["schedule"][0, i]),
+                    "total": float(scores["total"][0, i])
+                },
+                "total_score": float(scores["total"][0, i])
             })
         
-        # Sort by total score and limit results
-        matches.sort(key=lambda x: x["compatibility_scores"]["total"], reverse=True)
-        return matches[:limit]
+        return matches
     
     @staticmethod
     def find_matches_for_mentor(mentor_id: int, db: Session, limit: int = 5) -> List[Dict[str, Any]]:
@@ -392,33 +170,119 @@ class MatchmakingService:
         Encuentra los mejores mentiles para un mentor específico.
         Retorna una lista de diccionarios con información del mentil y puntuación de compatibilidad.
         """
-        # Obtener todos los mentiles
-        mentees = db.query(Mentee).all()
+        # Preseleccionar candidatos con el índice de habilidades (None = recorrido completo)
+        candidates = skill_index.candidate_mentees(db, mentor_id, limit)
         
-        matches = []
-        for mentee in mentees:
-            # Calcular compatibilidad de perfil
-            profile_score = MatchmakingService.calculate_profile_compatibility(mentor_id, mentee.user_id, db)
-            
-            # Calcular compatibilidad de horario
-            schedule_score = MatchmakingService.check_schedule_compatibility(mentor_id, mentee.user_id, db)
-            
-            # Calcular puntuación total (70% perfil, 30% horario)
-            total_score = (profile_score * 0.7) + (schedule_score * 0.3)
+        # Restricciones duras (activo, pares activos o rechazados, exclusiones de ambos lados,
+        # idiomas, industrias) aplicadas en SQL
+        candidate_ids = CandidateFilter.for_user(db, mentor_id, "mentee").candidate_ids(db, candidates)
+        
+        # Puntuaciones desde la caché por par; solo se recalculan los pares con perfiles modificados
+        engine = BatchScoringService(db)
+        cache = PairScoreCache(db)
+        
+        # Top-k con poda por cota superior: los mentiles que no pueden entrar no se puntúan completos
+        top, scores = PrunedTopK(db).search(
+            [mentor_id], candidate_ids, limit,
+            lambda mentor_ids, mentee_ids: cache.compute_scores(mentor_ids, mentee_ids, engine.score_ids),
+            known=cache.lookup([mentor_id], candidate_ids)
+        )
+        return MatchmakingService._describe_mentee_matches(db, [
+            {
+                "mentee_id": candidate_ids[i],
+                "profile_compatibility": float(scores["profile"][i, 0]),
+                "schedule_compatibility": float(scores["schedule"][i, 0]),
+                "total_score": float(scores["total"][i, 0])
+            }
+            for i in top
+        ])
+    
+    @staticmethod
+    def stream_matches_for_mentor(
+        mentor_id: int, db: Session, limit: int = 5, chunk_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Variante progresiva de find_matches_for_mentor: puntúa los mentiles por bloques de
+        chunk_size, mantiene un montículo con los `limit` mejores y emite un evento "progress"
+        tras cada bloque. El último evento ("done") incluye los detalles de los mejores mentiles.
+        Nunca se carga la lista completa de candidatos: los ids se paginan por clave.
+        """
+        candidates = skill_index.candidate_mentees(db, mentor_id, limit)
+        candidate_filter = CandidateFilter.for_user(db, mentor_id, "mentee")
+        candidate_ids = candidate_filter.candidate_ids(db, candidates) if candidates is not None else None
+        
+        engine = BatchScoringService(db)
+        cache = PairScoreCache(db)
+        
+        # Montículo de mínimos con (total, -mentee_id, entrada): ante empates gana el id menor
+        heap: List[Any] = []
+        scored = 0
+        last_id = None
+        position = 0
+        while True:
+            if candidate_ids is not None:
+                chunk = candidate_ids[position:position + chunk_size]
+                position += chunk_size
+            else:
+                query = candidate_filter.query(db)
+                if last_id is not None:
+                    query = query.filter(Mentee.user_id > last_id)
+                chunk = [row[0] for row in query.limit(chunk_size)]
+            if not chunk:
+                break
+            last_id = chunk[-1]
+            scores = cache.get_scores([mentor_id], chunk, engine.score_ids)
+            scored += len(chunk)
             
-            # Obtener información del usuario del mentil
-            mentee_user = db.query(User).filter(User.id == mentee.user_id).first()
+            # Solo los mejores de cada bloque pueden entrar en el top-k global
+            for i in BatchScoringService.top_k(scores["total"][:, 0], limit):
+                entry = {
+                    "mentee_id": chunk[i],
+                    "profile_compatibility": float(scores["profile"][i, 0]),
+                    "schedule_compatibility": float(scores["schedule"][i, 0]),
+                    "total_score": float(scores["total"][i, 0])
+                }
+                item = (entry["total_score"], -entry["mentee_id"], entry)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
             
+            yield {
+                "event": "progress",
+                "scored": scored,
+                "matches": MatchmakingService._heap_ranking(heap)
+            }
+        
+        yield {
+            "event": "done",
+            "scored": scored,
+            "matches": MatchmakingService._describe_mentee_matches(db, MatchmakingService._heap_ranking(heap))
+        }
+    
+    @staticmethod
+    def _heap_ranking(heap: List[Any]) -> List[Dict[str, Any]]:
+        return [item[2] for item in sorted(heap, key=lambda item: item[:2], reverse=True)]
+    
+    @staticmethod
+    def _describe_mentee_matches(db: Session, ranked: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Añade los datos de perfil de cada mentil a las puntuaciones ya ordenadas."""
+        mentee_ids = [entry["mentee_id"] for entry in ranked]
+        mentees = {m.user_id: m for m in db.query(Mentee).filter(Mentee.user_id.in_(mentee_ids)).all()}
+        users = {u.id: u for u in db.query(User).filter(User.id.in_(mentee_ids)).all()}
+        
+        matches = []
+        for entry in ranked:
+            mentee_id = entry["mentee_id"]
+            mentee = mentees[mentee_id]
             matches.append({
-                "mentee_id": mentee.user_id,
-                "name": mentee_user.name,
+                "mentee_id": mentee_id,
+                "name": users[mentee_id].name,
                 "current_position": mentee.current_position,
                 "goals": mentee.goals,
-                "profile_compatibility": profile_score,
-                "schedule_compatibility": schedule_score,
-                "total_score": total_score
+                "profile_compatibility": entry["profile_compatibility"],
+                "schedule_compatibility": entry["schedule_compatibility"],
+                "total_score": entry["total_score"]
             })
         
-        # Ordenar por puntuación total y limitar resultados
-        matches.sort(key=lambda x: x["total_score"], reverse=True)
-        return matches[:limit]
+        return matches
@@ -0,0 +1,131 @@
+from typing import List, Dict
+import numpy as np
+from sqlalchemy import func, or_, insert
+from sqlalchemy.orm import Session
+from app.models.match_algorithm import MatchScore, MatchFeedback, MentorSuccessStats, PairRejectionStats
+
+# Éxito histórico de un mentor sin valoraciones
+DEFAULT_SUCCESS = 0.5
+
+
+class MentorSuccessService:
+    """
+    Mantiene el agregado de éxito histórico por mentor (suma y número de valoraciones,
+    rechazos) y los rechazos por par, para que el ajuste por feedback sea una consulta
+    por petición en lugar de una por candidato.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental (sin commit: viaja con la escritura del endpoint)
+    # ------------------------------------------------------------------
+
+    def record_feedback(self, mentor_id: int, rating: int) -> None:
+        self._increment(MentorSuccessStats, {"mentor_id": mentor_id}, rating_sum=rating, rating_count=1)
+
+    def record_status_change(self, mentor_id: int, mentee_id: int, old_status: str, new_status: str) -> None:
+        """Actualiza los rechazos cuando un match entra o sale del estado "rejected"."""
+        if old_status == new_status or "rejected" not in (old_status, new_status):
+            return
+        delta = 1 if new_status == "rejected" else -1
+        self._increment(MentorSuccessStats, {"mentor_id": mentor_id}, rejection_count=delta)
+        self._increment(PairRejectionStats, {"mentor_id": mentor_id, "mentee_id": mentee_id},
+                        rejection_count=delta)
+
+    def _increment(self, model, key: Dict[str, int], **deltas: int) -> None:
+        query = self.db.query(model).filter(*(getattr(model, name) == value for name, value in key.items()))
+        updated = query.update(
+            {getattr(model, name): getattr(model, name) + delta for name, delta in deltas.items()},
+            synchronize_session=False
+        )
+        if not updated:
+            self.db.add(model(**key, **{
+                column: deltas.get(column, 0) for column in ("rating_sum", "rating_count", "rejection_count")
+                if hasattr(model, column)
+            }))
+            self.db.flush()
+
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+
+    def historical_success(self, mentor_ids: List[int]) -> np.ndarray:
+        """Valoración media normalizada a 0-1 de cada mentor, en el orden de mentor_ids."""
+        success = np.full(len(mentor_ids), DEFAULT_SUCCESS)
+        if not mentor_ids:
+            return success
+
+        stats = {
+            mentor_id: (rating_sum, rating_count) for mentor_id, rating_sum, rating_count in
+            self.db.query(
+                MentorSuccessStats.mentor_id, MentorSuccessStats.rating_sum, MentorSuccessStats.rating_count
+            ).filter(MentorSuccessStats.mentor_id.in_(mentor_ids))
+        }
+        for i, mentor_id in enumerate(mentor_ids):
+            rating_sum, rating_count = stats.get(mentor_id, (0, 0))
+            if rating_count:
+                success[i] = rating_sum / rating_count / 5.0  # Normalizar a escala 0-1
+        return success
+
+    def pair_rejections(self, user_id: int) -> Dict[int, int]:
+        """Rechazos entre el usuario y cada otro usuario, en cualquier orientación del par."""
+        rejections: Dict[int, int] = {}
+        for mentor_id, mentee_id, count in self.db.query(
+            PairRejectionStats.mentor_id, PairRejectionStats.mentee_id, PairRejectionStats.rejection_count
+        ).filter(
+            or_(PairRejectionStats.mentor_id == user_id, PairRejectionStats.mentee_id == user_id),
+            PairRejectionStats.rejection_count > 0
+        ):
+            other_id = mentee_id if mentor_id == user_id else mentor_id
+            rejections[other_id] = rejections.get(other_id, 0) + count
+        return rejections
+
+    # ------------------------------------------------------------------
+    # Reconciliación
+    # ------------------------------------------------------------------
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Recalcula los agregados desde match_feedback y match_scores y reemplaza los guardados.
+        Corrige cualquier deriva del mantenimiento incremental.
+        """
+        ratings = {
+            mentor_id: (int(rating_sum or 0), int(rating_count)) for mentor_id, rating_sum, rating_count in
+            self.db.query(MatchScore.mentor_id, func.sum(MatchFeedback.rating), func.count(MatchFeedback.id))
+            .join(MatchScore, MatchScore.id == MatchFeedback.match_id)
+            .group_by(MatchScore.mentor_id)
+        }
+        pairs = [
+            (mentor_id, mentee_id, int(count)) for mentor_id, mentee_id, count in
+            self.db.query(MatchScore.mentor_id, MatchScore.mentee_id, func.count(MatchScore.id))
+            .filter(MatchScore.status == "rejected")
+            .group_by(MatchScore.mentor_id, MatchScore.mentee_id)
+        ]
+
+        rejections: Dict[int, int] = {}
+        for mentor_id, _, count in pairs:
+            rejections[mentor_id] = rejections.get(mentor_id, 0) + count
+
+        self.db.query(PairRejectionStats).delete(synchronize_session=False)
+        self.db.query(MentorSuccessStats).delete(synchronize_session=False)
+        mentor_rows = [
+            {
+                "mentor_id": mentor_id,
+                "rating_sum": ratings.get(mentor_id, (0, 0))[0],
+                "rating_count": ratings.get(mentor_id, (0, 0))[1],
+                "rejection_count": rejections.get(mentor_id, 0)
+            }
+            for mentor_id in set(ratings) | set(rejections)
+        ]
+        if mentor_rows:
+            self.db.execute(insert(MentorSuccessStats), mentor_rows)
+        if pairs:
+            self.db.execute(insert(PairRejectionStats), [
+                {"mentor_id": mentor_id, "mentee_id": mentee_id, "rejection_count": count}
+                for mentor_id, mentee_id, count in pairs
+            ])
+        self.db.commit()
+
+        return {"mentors": len(mentor_rows), "rejected_pairs": len(pairs)}
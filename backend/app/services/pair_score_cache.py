@@ -0,0 +1,263 @@
+from typing import List, Dict, Callable, Iterable, Optional, Tuple
+from datetime import datetime
+import numpy as np
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.match_algorithm import PairScore, ProfileVersion
+from app.core.profiling import profile_components
+from app.services.availability_bitmap import DEFAULT_SEASON, current_season
+from app.services.weighted_ranking import component_matrices
+
+# Componentes guardados por par; cada uno se guarda en la columna "<componente>_score"
+COMPONENTS = ("skills", "language", "career", "industry", "style", "goals", "schedule", "profile", "total")
+
+KEY_FIELDS = ("scorer", "mentor_id", "mentee_id")
+
+# Función de puntuación: (mentor_ids, mentee_ids) -> {componente: matriz mentiles × mentores}
+ScoreFunction = Callable[[List[int], List[int]], Dict[str, np.ndarray]]
+
+# (versión de perfil, variante de horario de verano vigente) de cada usuario
+Variant = Tuple[int, str]
+
+
+# Filas por sentencia; mantiene cada INSERT por debajo del límite de parámetros de SQLite
+UPSERT_CHUNK = 500
+
+
+def dialect_insert(db: Session):
+    """insert() con ON CONFLICT del dialecto de la sesión; None si el dialecto no lo soporta."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as on_conflict_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as on_conflict_insert
+    else:
+        return None
+    return on_conflict_insert
+
+
+def bump_profile_version(db: Session, user_id: int) -> None:
+    """
+    Marca como obsoletas todas las puntuaciones en caché del usuario. No hace commit, para que
+    el incremento viaje en la misma transacción que el cambio de perfil. Con ON CONFLICT es un
+    único upsert, así que dos peticiones simultáneas de un usuario nuevo no chocan en la clave.
+    """
+    on_conflict_insert = dialect_insert(db)
+    if on_conflict_insert is not None:
+        stmt = on_conflict_insert(ProfileVersion).values(user_id=user_id, version=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[ProfileVersion.user_id],
+            set_={"version": ProfileVersion.version + 1, "updated_at": func.now()}
+        ))
+    else:
+        updated = db.query(ProfileVersion).filter(ProfileVersion.user_id == user_id).update(
+            {ProfileVersion.version: ProfileVersion.version + 1}, synchronize_session=False
+        )
+        if not updated:
+            db.add(ProfileVersion(user_id=user_id, version=1))
+            db.flush()
+    component_matrices.invalidate(user_id)
+
+
+@profile_components("get_scores", "lookup", "compute_scores")
+class PairScoreCache:
+    """
+    Almacén persistente de puntuaciones por par (mentor, mentil). Las filas recalculadas se
+    escriben con un upsert y un flush, nunca con commit: se guardan cuando el dueño de la
+    sesión confirma su transacción. Cada fila guarda la versión
+    de perfil de ambos usuarios y la variante de horario de verano de su zona; solo se vuelven
+    a puntuar los pares en los que alguno de los dos cambió desde la última vez, o en los que
+    el cambio de hora movió el horario en UTC de alguno.
+    """
+
+    def __init__(self, db: Session, scorer: str = "batch", moment: Optional[datetime] = None):
+        self.db = db
+        self.scorer = scorer
+        self.moment = moment
+
+    def versions(self, user_ids: Iterable[int]) -> Dict[int, Variant]:
+        """Versión de perfil y variante vigente de cada usuario; (0, DEFAULT_SEASON) si no existe."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        seasons: Dict[Optional[str], str] = {}
+        result = {}
+        for user_id, timezone, version in self.db.query(User.id, User.timezone, ProfileVersion.version).outerjoin(
+            ProfileVersion, ProfileVersion.user_id == User.id
+        ).filter(User.id.in_(user_ids)):
+            if timezone not in seasons:
+                seasons[timezone] = current_season(timezone, self.moment)
+            result[user_id] = (version or 0, seasons[timezone])
+        return result
+
+    @staticmethod
+    def _variants(user_ids: List[int], versions: Dict[int, Variant]) -> Tuple[np.ndarray, np.ndarray]:
+        """Arreglos de versiones y de variantes en el orden de user_ids."""
+        variants = [versions.get(user_id, (0, DEFAULT_SEASON)) for user_id in user_ids]
+        return (
+            np.array([version for version, _ in variants], dtype=np.int64),
+            np.array([season for _, season in variants], dtype=object)
+        )
+
+    def get_scores(
+        self,
+        mentor_ids: List[int],
+        mentee_ids: List[int],
+        compute: ScoreFunction
+    ) -> Dict[str, np.ndarray]:
+        """
+        Matrices (mentiles × mentores) de cada componente. Los pares vigentes se leen de la
+        caché; el resto se calcula con compute sobre el sub-bloque afectado y se guarda.
+        """
+        mentor_ids, mentee_ids = list(mentor_ids), list(mentee_ids)
+        versions = self.versions(set(mentor_ids) | set(mentee_ids))
+        scores, fresh = self.lookup(mentor_ids, mentee_ids, versions)
+
+        stale_rows = np.nonzero(~fresh.all(axis=1))[0]
+        if len(stale_rows):
+            stale_cols = np.nonzero(~fresh[stale_rows].all(axis=0))[0]
+            computed = self.compute_scores(
+                [mentor_ids[j] for j in stale_cols], [mentee_ids[i] for i in stale_rows], compute, versions
+            )
+            block = np.ix_(stale_rows, stale_cols)
+            for component, matrix in computed.items():
+                if component in scores:
+                    scores[component][block] = matrix
+
+        return scores
+
+    def lookup(
+        self,
+        mentor_ids: List[int],
+        mentee_ids: List[int],
+        versions: Optional[Dict[int, Variant]] = None
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Componentes de los pares vigentes en la caché y su máscara (mentiles × mentores); el resto queda a cero."""
+        mentor_ids, mentee_ids = list(mentor_ids), list(mentee_ids)
+        shape = (len(mentee_ids), len(mentor_ids))
+        scores = {component: np.zeros(shape, dtype=np.float32) for component in COMPONENTS}
+        if not mentor_ids or not mentee_ids:
+            return scores, np.zeros(shape, dtype=bool)
+
+        if versions is None:
+            versions = self.versions(set(mentor_ids) | set(mentee_ids))
+        return scores, self._load_fresh(
+            mentor_ids, mentee_ids, self._variants(mentor_ids, versions), self._variants(mentee_ids, versions), scores
+        )
+
+    def compute_scores(
+        self,
+        mentor_ids: List[int],
+        mentee_ids: List[int],
+        compute: ScoreFunction,
+        versions: Optional[Dict[int, Variant]] = None
+    ) -> Dict[str, np.ndarray]:
+        """Calcula el bloque completo con compute, sin leer la caché, y lo guarda."""
+        mentor_ids, mentee_ids = list(mentor_ids), list(mentee_ids)
+        computed = compute(mentor_ids, mentee_ids)
+        if not mentor_ids or not mentee_ids:
+            return computed
+
+        if versions is None:
+            versions = self.versions(set(mentor_ids) | set(mentee_ids))
+        self._store(
+            mentor_ids, mentee_ids, self._variants(mentor_ids, versions), self._variants(mentee_ids, versions), computed
+        )
+        return computed
+
+    def _load_fresh(
+        self,
+        mentor_ids: List[int],
+        mentee_ids: List[int],
+        mentor_variants: Tuple[np.ndarray, np.ndarray],
+        mentee_variants: Tuple[np.ndarray, np.ndarray],
+        scores: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Copia en scores los pares vigentes de la caché y devuelve su máscara."""
+        fresh = np.zeros((len(mentee_ids), len(mentor_ids)), dtype=bool)
+
+        query = self.db.query(
+            PairScore.mentor_id, PairScore.mentee_id,
+            PairScore.mentor_version, PairScore.mentee_version,
+            PairScore.mentor_season, PairScore.mentee_season,
+            *(getattr(PairScore, f"{component}_score") for component in COMPONENTS)
+        ).filter(PairScore.scorer == self.scorer)
+        # Filtrar por el lado más pequeño; los pares que sobran se descartan abajo
+        if len(mentee_ids) <= len(mentor_ids):
+            query = query.filter(PairScore.mentee_id.in_(mentee_ids))
+        else:
+            query = query.filter(PairScore.mentor_id.in_(mentor_ids))
+
+        rows = query.all()
+        if not rows:
+            return fresh
+
+        mentor_index = {user_id: j for j, user_id in enumerate(mentor_ids)}
+        mentee_index = {user_id: i for i, user_id in enumerate(mentee_ids)}
+        cols = np.array([mentor_index.get(row[0], -1) for row in rows])
+        rows_idx = np.array([mentee_index.get(row[1], -1) for row in rows])
+        values = np.array([row[6:] for row in rows], dtype=np.float64)
+        stored_versions = np.array([row[2:4] for row in rows], dtype=np.int64)
+        stored_seasons = np.array([row[4:6] for row in rows], dtype=object).reshape(-1, 2)
+
+        # Índice -1 = par fuera de la consulta; la primera condición lo descarta
+        valid = (cols >= 0) & (rows_idx >= 0) & (
+            (stored_versions[:, 0] == mentor_variants[0][cols]) &
+            (stored_versions[:, 1] == mentee_variants[0][rows_idx]) &
+            (stored_seasons[:, 0] == mentor_variants[1][cols]) &
+            (stored_seasons[:, 1] == mentee_variants[1][rows_idx])
+        )
+
+        cols, rows_idx, values = cols[valid], rows_idx[valid], np.nan_to_num(values[valid])
+        fresh[rows_idx, cols] = True
+        for k, component in enumerate(COMPONENTS):
+            scores[component][rows_idx, cols] = values[:, k]
+        return fresh
+
+    def _store(
+        self,
+        mentor_ids: List[int],
+        mentee_ids: List[int],
+        mentor_variants: Tuple[np.ndarray, np.ndarray],
+        mentee_variants: Tuple[np.ndarray, np.ndarray],
+        computed: Dict[str, np.ndarray]
+    ) -> None:
+        """Upsert de las filas del sub-bloque recalculado, por bloques de UPSERT_CHUNK; solo flush."""
+        rows = []
+        for i, mentee_id in enumerate(mentee_ids):
+            for j, mentor_id in enumerate(mentor_ids):
+                row = {
+                    "scorer": self.scorer,
+                    "mentor_id": mentor_id,
+                    "mentee_id": mentee_id,
+                    "mentor_version": int(mentor_variants[0][j]),
+                    "mentee_version": int(mentee_variants[0][i]),
+                    "mentor_season": mentor_variants[1][j],
+                    "mentee_season": mentee_variants[1][i]
+                }
+                for component in COMPONENTS:
+                    matrix = computed.get(component)
+                    row[f"{component}_score"] = float(matrix[i, j]) if matrix is not None else None
+                rows.append(row)
+
+        on_conflict_insert = dialect_insert(self.db)
+        if on_conflict_insert is None:
+            # Sin ON CONFLICT: borrar el sub-bloque e insertarlo de nuevo
+            self.db.query(PairScore).filter(
+                PairScore.scorer == self.scorer,
+                PairScore.mentor_id.in_(mentor_ids),
+                PairScore.mentee_id.in_(mentee_ids)
+            ).delete(synchronize_session=False)
+            self.db.execute(insert(PairScore), rows)
+        else:
+            for start in range(0, len(rows), UPSERT_CHUNK):
+                stmt = on_conflict_insert(PairScore).values(rows[start:start + UPSERT_CHUNK])
+                self.db.execute(stmt.on_conflict_do_update(
+                    index_elements=[PairScore.scorer, PairScore.mentor_id, PairScore.mentee_id],
+                    set_={
+                        **{field: stmt.excluded[field] for field in rows[0] if field not in KEY_FIELDS},
+                        "updated_at": func.now()
+                    }
+                ))
+        self.db.flush()
@@ -0,0 +1,270 @@
+"""
+Índice aproximado de vecinos más cercanos (IVF sobre NumPy) con los perfiles de los mentores.
+
+Cada perfil se codifica como un vector denso a partir de los mismos arreglos que usa el motor de
+puntuación; el producto escalar entre el vector de un mentil y el de un mentor aproxima la
+puntuación total de MatchmakingService. Los mentores se agrupan con k-means esférico en listas
+invertidas; una consulta recorre solo las `nprobe` listas más cercanas y devuelve los mejores
+candidatos, que después se puntúan de forma exacta.
+"""
+from typing import Optional, Sequence, Set
+import os
+import threading
+import numpy as np
+from scipy.sparse import csr_matrix
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.batch_scoring import BatchScoringService, FeatureBlock
+from app.services.categorical import MENTORING_STYLES, PREFERRED_STYLE_COMPAT
+from app.services.availability_bitmap import POPCOUNT, BITMAP_BYTES
+from app.services.scorers import PROFILE_WEIGHTS, PROFILE_SHARE, SCHEDULE_SHARE, _dense
+
+# Resumen de disponibilidad: fracción libre de cada bloque de 2 horas de la semana (un byte del mapa)
+AVAILABILITY_BLOCKS = BITMAP_BYTES
+BLOCK_BYTES = BITMAP_BYTES // AVAILABILITY_BLOCKS
+
+# Valores de Mentor/MentoringPreference.structured (-1 = sin definir)
+STRUCTURED_VALUES = 3
+
+KMEANS_ITERATIONS = 10
+ASSIGN_BLOCK = 4096
+
+
+def _align(matrix: np.ndarray, source: Sequence, target: Sequence) -> np.ndarray:
+    """Reordena las columnas de `matrix` (vocabulario source) al vocabulario target; las desconocidas se descartan."""
+    positions = {value: i for i, value in enumerate(target)}
+    columns = np.array([positions.get(value, -1) for value in source], dtype=np.int64)
+    known = columns >= 0
+    result = np.zeros((matrix.shape[0], len(target)), dtype=np.float32)
+    result[:, columns[known]] = matrix[:, :len(source)][:, known]
+    return result
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    sums = matrix.sum(axis=1, keepdims=True)
+    return np.divide(matrix, sums, out=np.zeros_like(matrix), where=sums > 0)
+
+
+def _one_hot(values: np.ndarray, width: int) -> np.ndarray:
+    result = np.zeros((len(values), width), dtype=np.float32)
+    result[np.arange(len(values)), values] = 1.0
+    return result
+
+
+def availability_summary(bitmaps: np.ndarray) -> np.ndarray:
+    counts = POPCOUNT[bitmaps].reshape(len(bitmaps), AVAILABILITY_BLOCKS, BLOCK_BYTES).sum(axis=2)
+    return (counts / (BLOCK_BYTES * 8)).astype(np.float32)
+
+
+class ProfileEncoder:
+    """
+    Vectores de mentores (elementos) y mentiles (consultas) sobre un vocabulario fijo de
+    habilidades y categorías, ponderados como en el perfil "matchmaking". Habilidades, industria
+    y estructura de sesiones reproducen exactamente sus componentes; los objetivos ignoran el
+    plazo, el estilo solo usa el estilo preferido y el horario un resumen por bloques de la semana.
+    """
+
+    def __init__(self, skill_ids: Sequence[int], categories: Sequence[str]):
+        self.skill_ids = list(skill_ids)
+        self.categories = list(categories)
+
+    @property
+    def dimension(self) -> int:
+        return (
+            len(self.skill_ids) + 2 * len(self.categories) + len(MENTORING_STYLES) + STRUCTURED_VALUES
+            + AVAILABILITY_BLOCKS
+        )
+
+    def encode_mentors(self, mentors: FeatureBlock, skill_ids: Sequence[int], categories: Sequence[str]) -> np.ndarray:
+        skills = _align(_dense(mentors.skills) / 5, skill_ids, self.skill_ids)
+        industry = np.where(
+            mentors.industry_has,
+            0.5 + 0.2 * mentors.industry_current + np.minimum(mentors.industry_years / 10, 0.3),
+            0.0
+        )
+        goals = mentors.industry_has * (0.4 + 0.3 * mentors.industry_senior + 0.3 * (mentors.industry_years >= 1))
+        preferences = mentors.has_preferences.astype(np.float32)[:, None]
+        return np.hstack([
+            skills,
+            _align(industry, categories, self.categories),
+            _align(goals, categories, self.categories),
+            _one_hot(mentors.style, len(MENTORING_STYLES)) * preferences,
+            _one_hot(mentors.structured + 1, STRUCTURED_VALUES) * preferences,
+            availability_summary(mentors.availability_bitmap)
+        ]).astype(np.float32)
+
+    def encode_mentees(self, mentees: FeatureBlock, skill_ids: Sequence[int], categories: Sequence[str]) -> np.ndarray:
+        skills = _align(_normalize_rows(_dense(mentees.skills)), skill_ids, self.skill_ids)
+
+        # Peso de cada categoría en los objetivos: prioridad / 5 (industria) y prioridad relativa (objetivos)
+        priorities = np.zeros((len(mentees), len(categories) + 1), dtype=np.float32)
+        rows, cols = np.nonzero(mentees.goal_category >= 0)
+        np.add.at(priorities, (rows, mentees.goal_category[rows, cols]), mentees.goal_priority[rows, cols])
+        industry = np.divide(
+            priorities / 5, mentees.goal_count[:, None],
+            out=np.zeros_like(priorities), where=mentees.goal_count[:, None] > 0
+        )
+        total_priority = mentees.goal_priority.sum(axis=1, keepdims=True)
+        goals = np.divide(priorities, total_priority, out=np.zeros_like(priorities), where=total_priority > 0)
+
+        preferences = mentees.has_preferences.astype(np.float32)[:, None]
+        style = PREFERRED_STYLE_COMPAT[mentees.style] * 0.4 * preferences
+        structured = _one_hot(mentees.structured + 1, STRUCTURED_VALUES) * 0.2 * preferences
+        availability = _normalize_rows(availability_summary(mentees.availability_bitmap))
+
+        return np.hstack([
+            skills * PROFILE_SHARE * PROFILE_WEIGHTS["skills"],
+            _align(industry, categories, self.categories) * PROFILE_SHARE * PROFILE_WEIGHTS["industry"],
+            _align(goals, categories, self.categories) * PROFILE_SHARE * PROFILE_WEIGHTS["goals"],
+            style * PROFILE_SHARE * PROFILE_WEIGHTS["style"],
+            structured * PROFILE_SHARE * PROFILE_WEIGHTS["style"],
+            availability * SCHEDULE_SHARE
+        ]).astype(np.float32)
+
+
+class ProfileEmbeddingIndex:
+    """
+    Índice IVF en memoria de los vectores de los mentores, persistido en un archivo .npz.
+    Las listas invertidas se guardan como un arreglo de miembros ordenado por lista más
+    los desplazamientos de cada lista.
+    """
+
+    def __init__(self, n_lists: Optional[int] = None, seed: int = 0):
+        self._lock = threading.RLock()
+        self.n_lists = n_lists
+        self.seed = seed
+        self.clear()
+
+    @property
+    def is_built(self) -> bool:
+        return self.encoder is not None
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.encoder: Optional[ProfileEncoder] = None
+            self.user_ids = np.zeros(0, dtype=np.int64)
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+            self.centroids = np.zeros((0, 0), dtype=np.float32)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.members = np.zeros(0, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Construcción y persistencia
+    # ------------------------------------------------------------------
+
+    def build(self, db: Session) -> None:
+        """Codifica todos los mentores y agrupa sus vectores en listas invertidas."""
+        pool = BatchScoringService(db).load_pool(mentee_ids=[])
+        encoder = ProfileEncoder(pool.skill_ids, pool.categories)
+        self.fit(pool.mentors.user_ids, encoder.encode_mentors(pool.mentors, pool.skill_ids, pool.categories), encoder)
+
+    def fit(self, user_ids: np.ndarray, vectors: np.ndarray, encoder: ProfileEncoder) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n_lists = max(1, min(self.n_lists or int(np.sqrt(len(vectors))), len(vectors)))
+        directions = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        # k-means esférico: los centroides son direcciones, la asignación es por producto escalar
+        rng = np.random.default_rng(self.seed)
+        centroids = directions[rng.choice(len(directions), size=n_lists, replace=False)] if len(directions) else \
+            np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        assignment = np.zeros(len(directions), dtype=np.int64)
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = self._assign(directions, centroids)
+            membership = csr_matrix(
+                (np.ones(len(directions), dtype=np.float32), (assignment, np.arange(len(directions)))),
+                shape=(len(centroids), len(directions))
+            )
+            sums = np.asarray(membership @ directions, dtype=np.float32)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids).astype(np.float32)
+
+        members = np.argsort(assignment, kind="stable")
+        offsets = np.searchsorted(assignment[members], np.arange(len(centroids) + 1))
+        with self._lock:
+            self.encoder = encoder
+            self.user_ids = np.asarray(user_ids, dtype=np.int64)
+            self.vectors = vectors
+            self.centroids = centroids
+            self.offsets = offsets.astype(np.int64)
+            self.members = members.astype(np.int64)
+
+    @staticmethod
+    def _assign(directions: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        assignment = np.zeros(len(directions), dtype=np.int64)
+        for start in range(0, len(directions), ASSIGN_BLOCK):
+            block = directions[start:start + ASSIGN_BLOCK]
+            assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assignment
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            np.savez(
+                path,
+                user_ids=self.user_ids,
+                vectors=self.vectors,
+                centroids=self.centroids,
+                offsets=self.offsets,
+                members=self.members,
+                skill_ids=np.asarray(self.encoder.skill_ids, dtype=np.int64),
+                categories=np.asarray(self.encoder.categories, dtype=str)
+            )
+
+    def load(self, path: str) -> None:
+        with np.load(path) as data:
+            with self._lock:
+                self.encoder = ProfileEncoder(data["skill_ids"].tolist(), data["categories"].tolist())
+                self.user_ids = data["user_ids"]
+                self.vectors = data["vectors"]
+                self.centroids = data["centroids"]
+                self.offsets = data["offsets"]
+                self.members = data["members"]
+
+    def ensure_built(self, db: Session) -> None:
+        """Carga el índice guardado o, si no existe, lo construye y lo guarda."""
+        if self.is_built:
+            return
+        path = settings.MATCHING_ANN_INDEX_PATH
+        if os.path.exists(path):
+            self.load(path)
+        else:
+            self.build(db)
+            self.save(path)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def search(self, query: np.ndarray, n: int, nprobe: Optional[int] = None) -> np.ndarray:
+        """Ids de los `n` mentores con mayor producto escalar dentro de las `nprobe` listas más cercanas."""
+        with self._lock:
+            nprobe = nprobe or settings.MATCHING_ANN_NPROBE
+            lists = np.argsort(-(self.centroids @ query), kind="stable")[:nprobe]
+            members = np.concatenate(
+                [self.members[self.offsets[i]:self.offsets[i + 1]] for i in lists]
+            ) if len(lists) else np.zeros(0, dtype=np.int64)
+            top = BatchScoringService.top_k(self.vectors[members] @ query, n)
+            return self.user_ids[members[top]]
+
+    def encode_mentee(self, db: Session, mentee_id: int) -> np.ndarray:
+        pool = BatchScoringService(db).load_pool(mentor_ids=[], mentee_ids=[mentee_id])
+        return self.encoder.encode_mentees(pool.mentees, pool.skill_ids, pool.categories)[0]
+
+    def candidate_mentors(self, db: Session, mentee_id: int, limit: int) -> Optional[Set[int]]:
+        """
+        Mentores recuperados por el índice para puntuarlos de forma exacta. Devuelve None cuando
+        el índice está desactivado o no es mayor que el número de candidatos pedido; en ese caso
+        el llamador recurre al índice de habilidades o al recorrido completo.
+        """
+        if not settings.MATCHING_ANN_ENABLED:
+            return None
+        self.ensure_built(db)
+        n = max(limit * settings.MATCHING_ANN_CANDIDATE_FACTOR, settings.MATCHING_CANDIDATE_MIN)
+        if len(self) <= n:
+            return None
+        return set(self.search(self.encode_mentee(db, mentee_id), n).tolist())
+
+
+profile_embeddings = ProfileEmbeddingIndex()
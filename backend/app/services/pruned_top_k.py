@@ -0,0 +1,179 @@
+"""
+Búsqueda de los k mejores candidatos con poda por cota superior (estilo threshold algorithm).
+
+El total de un perfil de puntuación es una suma ponderada de componentes acotados. Primero se
+calculan los componentes baratos (los que solo necesitan CHEAP_FIELDS) para todos los candidatos
+y, para el resto, una cota superior por par (1 o la del plugin). Los candidatos se recorren por
+cota descendente en bloques; cada bloque se puntúa de forma exacta y actualiza un montículo de
+mínimos con los k mejores. En cuanto la cota de un candidato no alcanza el peor total del
+montículo, ni él ni los que le siguen pueden entrar, y sus componentes caros no se calculan.
+
+Los pares con puntuación vigente en la caché no se podan ni se recalculan: entran directamente
+en el montículo. El resultado es idéntico al de puntuar a todos los candidatos: mismos
+candidatos, mismo orden y el mismo desempate por posición que BatchScoringService.top_k.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import heapq
+import threading
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.profiling import profile_components
+from app.services.batch_scoring import BatchScoringService
+from app.services.scorers import SCORING_PROFILES, scorer_registry
+
+# Campos que se cargan con pocas filas por usuario
+CHEAP_FIELDS = frozenset({"skills", "preferences", "languages"})
+
+# Margen frente a las diferencias de redondeo entre el total parcial y el completo (float32)
+BOUND_TOLERANCE = 1e-5
+
+# Función de puntuación exacta: (mentor_ids, mentee_ids) -> {componente: matriz mentiles × mentores}
+ScoreFunction = Callable[[List[int], List[int]], Dict[str, np.ndarray]]
+
+
+class PruningStats:
+    """
+    Contadores en memoria del proceso de las búsquedas top-k: candidatos, pares leídos de la
+    caché, pares puntuados de forma exacta y pares podados sin calcular sus componentes caros.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.searches = 0
+            self.exhaustive = 0
+            self.candidates = 0
+            self.cached = 0
+            self.scored = 0
+
+    def record(self, candidates: int, cached: int, scored: int, pruned: bool) -> None:
+        with self._lock:
+            self.searches += 1
+            self.exhaustive += 0 if pruned else 1
+            self.candidates += candidates
+            self.cached += cached
+            self.scored += scored
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            uncached = self.candidates - self.cached
+            pruned = uncached - self.scored
+            return {
+                "searches": self.searches,
+                "exhaustive_searches": self.exhaustive,
+                "candidates": self.candidates,
+                "cached": self.cached,
+                "scored": self.scored,
+                "pruned": pruned,
+                "pruning_rate": round(pruned / uncached, 4) if uncached else 0.0
+            }
+
+
+pruning_stats = PruningStats()
+
+
+@profile_components("search", "_bounds")
+class PrunedTopK:
+    """
+    Top-k de un usuario frente a sus candidatos (un lado de la búsqueda tiene un solo id).
+    Con pocos candidatos, o con MATCHING_PRUNING_ENABLED desactivado, se puntúa a todos.
+    """
+
+    def __init__(self, db: Session, profile: str = "matchmaking", chunk_size: int = 256):
+        self.db = db
+        self.profile = SCORING_PROFILES[profile]
+        self.chunk_size = chunk_size
+        self.cheap = [
+            component for component, plugin in self.profile.components.items()
+            if set(scorer_registry[plugin].fields) <= CHEAP_FIELDS
+        ]
+        self.expensive = [component for component in self.profile.components if component not in self.cheap]
+
+    def search(
+        self,
+        mentor_ids: List[int],
+        mentee_ids: List[int],
+        limit: int,
+        compute: ScoreFunction,
+        known: Optional[Tuple[Dict[str, np.ndarray], np.ndarray]] = None
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Posiciones de los `limit` mejores candidatos (orden descendente) y las matrices de
+        componentes (mentiles × mentores); los pares podados quedan a cero. `known` son
+        puntuaciones ya disponibles y su máscara (PairScoreCache.lookup): esos pares no se
+        vuelven a calcular y sirven para fijar desde el principio el suelo del montículo.
+        """
+        mentor_ids, mentee_ids = list(mentor_ids), list(mentee_ids)
+        by_mentor = len(mentee_ids) == 1
+        candidate_ids = mentor_ids if by_mentor else mentee_ids
+        shape = (len(mentee_ids), len(mentor_ids))
+
+        if known is not None:
+            scores, fresh = {component: matrix.copy() for component, matrix in known[0].items()}, known[1].ravel()
+        else:
+            scores, fresh = {}, np.zeros(len(candidate_ids), dtype=bool)
+        pending = np.nonzero(~fresh)[0]
+
+        def score(positions: np.ndarray) -> None:
+            ids = [candidate_ids[p] for p in positions]
+            chunk = compute(ids, mentee_ids) if by_mentor else compute(mentor_ids, ids)
+            for component, matrix in chunk.items():
+                flat = scores.setdefault(component, np.zeros(shape, dtype=np.float32)).reshape(-1)
+                flat[positions] = matrix.ravel()
+
+        if (not settings.MATCHING_PRUNING_ENABLED or not self.expensive or limit <= 0
+                or len(pending) <= max(settings.MATCHING_PRUNING_MIN_CANDIDATES, limit)):
+            if len(pending) or not scores:
+                score(pending)
+            pruning_stats.record(len(candidate_ids), len(candidate_ids) - len(pending), len(pending), pruned=False)
+            return BatchScoringService.top_k(scores["total"].ravel(), limit), scores
+
+        # Montículo de mínimos con (total, -posición): la raíz es el peor de los k mejores y,
+        # a igual total, pierde la posición mayor, como en el orden estable de top_k
+        heap: List[Tuple[float, int]] = []
+
+        def push(positions: np.ndarray) -> None:
+            for position, total in zip(positions.tolist(), scores["total"].ravel()[positions].tolist()):
+                entry = (total, -position)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        cached = np.nonzero(fresh)[0]
+        if len(cached):
+            push(cached[BatchScoringService.top_k(scores["total"].ravel()[cached], limit)])
+
+        pending_ids = [candidate_ids[p] for p in pending]
+        bounds = (self._bounds(pending_ids, mentee_ids) if by_mentor else self._bounds(mentor_ids, pending_ids)).ravel()
+        order = np.argsort(-bounds, kind="stable")
+        scored = 0
+        for start in range(0, len(order), self.chunk_size):
+            rows = order[start:start + self.chunk_size]
+            if len(heap) == limit:
+                rows = rows[bounds[rows] + BOUND_TOLERANCE >= heap[0][0]]
+                if not len(rows):
+                    break
+            score(pending[rows])
+            push(pending[rows])
+            scored += len(rows)
+
+        pruning_stats.record(len(candidate_ids), len(cached), scored, pruned=True)
+        top = np.array([-position for _, position in sorted(heap, key=lambda e: (-e[0], -e[1]))], dtype=np.int64)
+        return top, scores
+
+    def _bounds(self, mentor_ids: List[int], mentee_ids: List[int]) -> np.ndarray:
+        """Total exacto de los componentes baratos más la cota superior de los caros."""
+        cheap = self.profile.subset(self.cheap)
+        bound_fields = {
+            field for component in self.expensive
+            for field in scorer_registry[self.profile.components[component]].bound_fields
+        }
+        engine = BatchScoringService(self.db, profile=cheap)
+        pool = engine.load_pool(mentor_ids, mentee_ids, fields=cheap.fields | bound_fields)
+        partial = engine.score_block(pool.mentors, pool.mentees)["total"]
+        return partial + self.profile.upper_bounds(self.expensive, pool.mentors, pool.mentees)
@@ -0,0 +1,180 @@
+"""
+Repuntuación completa de la plataforma fuera del proceso de la API.
+
+Los perfiles de todos los mentores y mentiles se cargan una vez y se guardan como archivos .npy
+en el directorio de estado. Los mentiles se reparten en fragmentos (shards) que procesa un
+ProcessPoolExecutor; cada proceso proyecta los archivos en memoria (mmap) en lugar de recibirlos
+serializados, puntúa su fragmento por bloques y guarda los mejores mentores de cada mentil en
+MatchScore con un upsert masivo. Cada fragmento terminado deja una marca en el directorio de
+estado, de modo que un trabajo interrumpido se reanuda sin repetir los fragmentos hechos.
+"""
+import os
+import json
+import time
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.services.batch_scoring import BatchScoringService, FeatureBlock
+from app.services.match_exclusions import MatchExclusions
+from app.services.match_store import SCORE_COLUMNS, upsert_match_scores
+
+DEFAULT_STATE_DIR = "./rescoring_state"
+DEFAULT_SHARD_SIZE = 2000
+DEFAULT_PER_MENTEE = 5
+
+
+class RescoringJob:
+    """
+    Trabajo de repuntuación por fragmentos de mentiles. `workers` = 1 procesa los fragmentos
+    en el propio proceso; con más, cada fragmento se envía a un proceso del pool.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        state_dir: str = DEFAULT_STATE_DIR,
+        workers: int = 1,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        per_mentee: int = DEFAULT_PER_MENTEE,
+        block_size: int = 256
+    ):
+        self.database_url = database_url
+        self.state_dir = state_dir
+        self.workers = max(1, workers)
+        self.shard_size = shard_size
+        self.per_mentee = per_mentee
+        self.block_size = block_size
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.state_dir, "manifest.json")
+
+    def run(self, resume: bool = False, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Ejecuta (o reanuda) el trabajo. Sin resume se descarta el estado anterior y se vuelven
+        a cargar los perfiles; con resume se reutilizan los perfiles guardados y solo se procesan
+        los fragmentos sin marca de terminado.
+        """
+        if resume and os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        else:
+            manifest = self.prepare()
+
+        pending = [shard for shard in range(manifest["shards"]) if not os.path.exists(self._done_path(shard))]
+        summary = {"shards": manifest["shards"], "skipped": manifest["shards"] - len(pending), "mentees": 0, "pairs": 0}
+        started = time.monotonic()
+
+        for done, result in enumerate(self._results(pending), start=summary["skipped"] + 1):
+            summary["mentees"] += result["mentees"]
+            summary["pairs"] += result["pairs"]
+            if progress:
+                progress({**result, "done": done, "shards": summary["shards"],
+                          "elapsed": round(time.monotonic() - started, 3)})
+
+        summary["seconds"] = round(time.monotonic() - started, 3)
+        return summary
+
+    def _results(self, shards: List[int]) -> Iterator[Dict]:
+        """Resultados de los fragmentos a medida que terminan."""
+        arguments = [(self.database_url, self.state_dir, shard, self.per_mentee, self.block_size) for shard in shards]
+        if self.workers == 1:
+            for args in arguments:
+                yield rescore_shard(*args)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for future in as_completed([pool.submit(rescore_shard, *args) for args in arguments]):
+                yield future.result()
+
+    def prepare(self) -> Dict:
+        """Carga todos los perfiles una vez, los guarda en el directorio de estado y define los fragmentos."""
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        for side in ("mentors", "mentees", "done"):
+            os.makedirs(os.path.join(self.state_dir, side))
+
+        engine = _create_engine(self.database_url)
+        db = Session(bind=engine)
+        try:
+            pool = BatchScoringService(db).load_pool()
+        finally:
+            db.close()
+            engine.dispose()
+        pool.mentors.save(os.path.join(self.state_dir, "mentors"))
+        pool.mentees.save(os.path.join(self.state_dir, "mentees"))
+
+        manifest = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "mentor_count": len(pool.mentors),
+            "mentee_count": len(pool.mentees),
+            "shard_size": self.shard_size,
+            "shards": -(-len(pool.mentees) // self.shard_size)
+        }
+        with open(self.manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def _done_path(self, shard: int) -> str:
+        return os.path.join(self.state_dir, "done", f"{shard}.json")
+
+
+def _create_engine(database_url: str):
+    return create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    )
+
+
+def rescore_shard(database_url: str, state_dir: str, shard: int, per_mentee: int, block_size: int) -> Dict:
+    """
+    Puntúa un fragmento de mentiles frente a todos los mentores y guarda sus mejores pares.
+    Función de módulo para que el pool de procesos pueda enviarla; cada proceso abre su propia
+    conexión a la base de datos.
+    """
+    with open(os.path.join(state_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    mentors = FeatureBlock.load(os.path.join(state_dir, "mentors"))
+    mentees = FeatureBlock.load(os.path.join(state_dir, "mentees"))
+    start = shard * manifest["shard_size"]
+    shard_rows = np.arange(start, min(start + manifest["shard_size"], len(mentees)))
+
+    db_engine = _create_engine(database_url)
+    db = Session(bind=db_engine, autoflush=False)
+    try:
+        engine = BatchScoringService(db)
+        exclusions = MatchExclusions.load_for_users(
+            db, mentors.user_ids.tolist(), mentees.user_ids[shard_rows].tolist()
+        )
+
+        pairs = 0
+        for block_start in range(0, len(shard_rows), block_size):
+            block = mentees.take(shard_rows[block_start:block_start + block_size])
+            scores = engine.score_block(mentors, block)
+            totals = np.where(exclusions.mask(mentors.user_ids, block.user_ids), -np.inf, scores["total"])
+            order = np.argsort(-totals, axis=1, kind="stable")[:, :per_mentee]
+
+            rows = [
+                {
+                    "mentor_id": int(mentors.user_ids[j]),
+                    "mentee_id": int(mentee_id),
+                    **{column: float(scores[key][i, j]) for column, key in SCORE_COLUMNS.items()},
+                    "match_details": {"source": "rescoring"},
+                    "status": "suggested"
+                }
+                for i, mentee_id in enumerate(block.user_ids)
+                for j in order[i] if np.isfinite(totals[i, j])
+            ]
+            upsert_match_scores(db, rows)
+            pairs += len(rows)
+        db.commit()
+    finally:
+        db.close()
+        db_engine.dispose()
+
+    result = {"shard": shard, "mentees": len(shard_rows), "pairs": pairs}
+    with open(os.path.join(state_dir, "done", f"{shard}.json"), "w") as f:
+        json.dump(result, f)
+    return result
@@ -0,0 +1,408 @@
+"""
+Registro de plugins de puntuación y perfiles de puntuación del motor de emparejamiento.
+
+Cada plugin calcula un componente de compatibilidad para un bloque completo de pares
+(matriz mentiles × mentores) y declara los campos de perfil que necesita; el motor
+(BatchScoringService) carga en una sola pasada la unión de los campos de los plugins de su perfil.
+
+Campos disponibles:
+- "skills": matrices CSR usuario × habilidad con nivel de dominio o de interés
+- "industry": experiencia por industria de los mentores y objetivos de los mentiles
+- "preferences": MentoringPreference (estilo preferido, estructura, frecuencia, duración)
+- "languages": códigos de idioma y nivel por usuario en filas de ancho fijo
+- "availability": franjas semanales y mapa de bits de disponibilidad
+- "profile": estilos, etapa de carrera y años de Mentor/Mentee, áreas de experiencia y de objetivos
+- "slot_counts": número de franjas de disponibilidad por día (solo para cotas superiores)
+"""
+from typing import Dict, Iterable, Optional, Set, Tuple
+import numpy as np
+from scipy import sparse
+from app.services.availability_bitmap import overlap_slots, popcount, jaccard, week_overlaps
+from app.services.categorical import PREFERRED_STYLE_COMPAT, LEARNING_STYLE_COMPAT, experience_match
+from app.services.language_features import MAX_LANGUAGE_LEVEL
+from app.core.profiling import profiled
+
+# Pares de franjas (mentil, mentor, franja mentil, franja mentor) por paso de ScheduleSlotsScorer
+SLOT_PAIR_BUDGET = 1 << 22
+
+
+class ScorerPlugin:
+    """
+    Componente de compatibilidad calculado por bloques. Las subclases definen name, fields y score;
+    las que no están acotadas por 1 definen también bound_fields y upper_bound.
+    """
+
+    name: str = ""
+    fields: Tuple[str, ...] = ()
+    bound_fields: Tuple[str, ...] = ()
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        """Matriz float32 (mentiles × mentores) con valores entre 0 y 1."""
+        raise NotImplementedError
+
+    def upper_bound(self, mentors, mentees) -> np.ndarray:
+        """Cota superior de score por par calculada solo con bound_fields; por defecto 1."""
+        return np.ones((len(mentees), len(mentors)), dtype=np.float32)
+
+
+scorer_registry: Dict[str, ScorerPlugin] = {}
+
+
+def register_scorer(plugin_class):
+    """Decorador de clase: registra una instancia del plugin con su nombre, instrumentada para el perfilado."""
+    plugin = plugin_class()
+    plugin.score = profiled(f"scorers.{plugin.name}")(plugin.score)
+    scorer_registry[plugin.name] = plugin
+    return plugin_class
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(
+        numerator, denominator,
+        out=np.zeros(np.broadcast(numerator, denominator).shape, dtype=np.float32), where=denominator > 0
+    ).astype(np.float32)
+
+
+def _dense(matrix) -> np.ndarray:
+    """Arreglo denso de un producto o suma que puede venir de matrices dispersas."""
+    return matrix.toarray() if sparse.issparse(matrix) else np.asarray(matrix)
+
+
+# ----------------------------------------------------------------------
+# Plugins de MatchmakingService
+# ----------------------------------------------------------------------
+
+@register_scorer
+class SkillsScorer(ScorerPlugin):
+    """Suma de interés × dominio en habilidades comunes, normalizada por el máximo posible (dominio 5)."""
+    name = "skills"
+    fields = ("skills",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        # Mentores (CSR) × intereses: con un solo mentil es un producto matriz dispersa × vector
+        products = _dense(mentors.skills @ mentees.skills.T).T
+        return _ratio(products, _dense(mentees.skills.sum(axis=1)).reshape(-1, 1) * 5)
+
+
+@register_scorer
+class IndustryScorer(ScorerPlugin):
+    """Relevancia de la experiencia en industria del mentor para cada objetivo, ponderada por prioridad."""
+    name = "industry"
+    fields = ("industry",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        per_category = np.where(
+            mentors.industry_has,
+            0.5 + 0.2 * mentors.industry_current + np.minimum(mentors.industry_years / 10, 0.3),
+            0.0
+        ).astype(np.float32)
+
+        # Peso de cada categoría para el mentil: suma de prioridad / 5 de sus objetivos
+        goal_weights = np.zeros((len(mentees), per_category.shape[1]), dtype=np.float32)
+        rows, cols = np.nonzero(mentees.goal_category >= 0)
+        np.add.at(goal_weights, (rows, mentees.goal_category[rows, cols]), mentees.goal_priority[rows, cols] / 5)
+
+        return _ratio(goal_weights @ per_category.T, mentees.goal_count[:, None])
+
+
+@register_scorer
+class GoalIndustryScorer(ScorerPlugin):
+    """Alineación con los objetivos: categoría, nivel del puesto y años frente al plazo del objetivo."""
+    name = "goal_industry"
+    fields = ("industry",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        categories = mentees.goal_category  # (mentiles, objetivos); -1 apunta a la columna vacía
+        has = mentors.industry_has[:, categories]  # (mentores, mentiles, objetivos)
+        senior = mentors.industry_senior[:, categories]
+        years = mentors.industry_years[:, categories]
+
+        goal_score = has * (
+            0.4 + 0.3 * senior + 0.3 * (years >= mentees.goal_timeline[None] / 12)
+        )
+        numerator = (goal_score * mentees.goal_priority[None]).sum(axis=2).T
+        return _ratio(numerator, mentees.goal_priority.sum(axis=1, keepdims=True))
+
+
+@register_scorer
+class PreferredStyleScorer(ScorerPlugin):
+    """Compatibilidad de estilo preferido, estructura de sesiones, frecuencia y duración."""
+    name = "preferred_style"
+    fields = ("preferences",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        both = mentees.has_preferences[:, None] & mentors.has_preferences[None, :]
+
+        style = PREFERRED_STYLE_COMPAT[mentees.style[:, None], mentors.style[None, :]] * 0.4
+        structure = (mentees.structured[:, None] == mentors.structured[None, :]).astype(np.float32) * 0.2
+
+        frequency_diff = np.abs(mentees.meeting_frequency[:, None] - mentors.meeting_frequency[None, :])
+        frequency = np.nan_to_num(0.2 * (1 - np.minimum(frequency_diff / 4, 1)))
+
+        duration_diff = np.abs(mentees.session_duration[:, None] - mentors.session_duration[None, :])
+        duration = np.nan_to_num(0.2 * (1 - np.minimum(duration_diff / 60, 1)))
+
+        return np.where(both, style + structure + frequency + duration, 0.0).astype(np.float32)
+
+
+@register_scorer
+class ScheduleSlotsScorer(ScorerPlugin):
+    """Pares de franjas que se solapan en la semana UTC, normalizados por el menor número de franjas."""
+    name = "schedule_slots"
+    fields = ("availability",)
+    bound_fields = ("slot_counts",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        overlaps = np.zeros((len(mentees), len(mentors)), dtype=np.float32)
+        # Los arreglos vienen rellenados al máximo de toda la población y las franjas de cada
+        # usuario ocupan las primeras posiciones: basta con el ancho máximo del bloque
+        mentee_width = int(mentees.slot_count.max(initial=0))
+        mentor_width = int(mentors.slot_count.max(initial=0))
+        if not mentee_width or not mentor_width:
+            return overlaps
+
+        mentee_day = mentees.slot_day[:, None, :mentee_width, None]
+        mentee_start = mentees.slot_start[:, None, :mentee_width, None]
+        mentee_end = mentees.slot_end[:, None, :mentee_width, None]
+
+        # Ejes: (mentil, mentor, franja mentil, franja mentor); los intervalos ya están en UTC.
+        # Los mentores van por trozos para que el arreglo intermedio no pase de SLOT_PAIR_BUDGET
+        step = max(SLOT_PAIR_BUDGET // (len(mentees) * mentee_width * mentor_width), 1)
+        for start in range(0, len(mentors), step):
+            block = slice(start, start + step)
+            overlaps[:, block] = (
+                (mentee_day >= 0) & (mentors.slot_day[None, block, None, :mentor_width] >= 0) &
+                week_overlaps(mentee_start, mentee_end,
+                              mentors.slot_start[None, block, None, :mentor_width],
+                              mentors.slot_end[None, block, None, :mentor_width])
+            ).sum(axis=(2, 3))
+
+        return _ratio(overlaps, np.minimum(mentees.slot_count[:, None], mentors.slot_count[None, :]))
+
+    def upper_bound(self, mentors, mentees) -> np.ndarray:
+        # No acotado por 1: una franja larga puede solapar con varias franjas del otro.
+        # Como mucho se solapan todos los pares de franjas que comparten algún día UTC.
+        same_day = mentees.day_slot_counts @ mentors.day_slot_counts.T
+        return _ratio(same_day, np.minimum(mentees.slot_count[:, None], mentors.slot_count[None, :]))
+
+
+@register_scorer
+class LanguageScorer(ScorerPlugin):
+    """Mejor idioma común: el menor de los dos niveles, entre el nivel máximo (native = 1)."""
+    name = "language"
+    fields = ("languages",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        best = np.zeros((len(mentees), len(mentors)), dtype=np.int8)
+        # Una posición de idioma del mentil cada vez: arreglos (mentil, mentor, idioma mentor)
+        for slot in range(mentees.language_codes.shape[1]):
+            codes = mentees.language_codes[:, slot, None, None]
+            common = (codes == mentors.language_codes[None, :, :]) & (codes >= 0)
+            levels = np.minimum(mentees.language_levels[:, slot, None, None], mentors.language_levels[None, :, :])
+            best = np.maximum(best, np.where(common, levels, 0).max(axis=2, initial=0))
+        return best.astype(np.float32) / MAX_LANGUAGE_LEVEL
+
+
+@register_scorer
+class CareerScorer(ScorerPlugin):
+    """Trayectorias profesionales: todavía no hay tablas ni columnas en el modelo de datos."""
+    name = "career"
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        return np.zeros((len(mentees), len(mentors)), dtype=np.float32)
+
+
+# ----------------------------------------------------------------------
+# Plugins de MatchingService y MatchingAlgorithm
+# ----------------------------------------------------------------------
+
+@register_scorer
+class SkillOverlapScorer(ScorerPlugin):
+    """Habilidades comunes / máximo de habilidades de ambos; 0 si alguno no tiene ninguna."""
+    name = "skill_overlap"
+    fields = ("skills",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        mentor_has = (mentors.skills > 0).astype(np.float32)
+        mentee_has = (mentees.skills > 0).astype(np.float32)
+        mentor_counts = _dense(mentor_has.sum(axis=1)).reshape(1, -1)
+        mentee_counts = _dense(mentee_has.sum(axis=1)).reshape(-1, 1)
+        counts = np.maximum(mentee_counts, mentor_counts)
+        empty = (mentee_counts == 0) | (mentor_counts == 0)
+        common = _dense(mentor_has @ mentee_has.T).T
+        return np.where(empty, 0.0, _ratio(common, counts)).astype(np.float32)
+
+
+@register_scorer
+class AvailabilityOverlapScorer(ScorerPlugin):
+    """Franjas de 15 minutos comunes / franjas del más disponible de los dos."""
+    name = "availability_overlap"
+    fields = ("availability",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        overlap = overlap_slots(mentees.availability_bitmap[:, None, :], mentors.availability_bitmap[None, :, :])
+        largest = np.maximum(
+            popcount(mentees.availability_bitmap)[:, None], popcount(mentors.availability_bitmap)[None, :]
+        )
+        return _ratio(overlap.astype(np.float32), largest)
+
+
+@register_scorer
+class AvailabilityJaccardScorer(ScorerPlugin):
+    """Índice de Jaccard de los mapas de bits semanales."""
+    name = "availability_jaccard"
+    fields = ("availability",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        return jaccard(
+            mentees.availability_bitmap[:, None, :], mentors.availability_bitmap[None, :, :]
+        ).astype(np.float32)
+
+
+@register_scorer
+class LearningStyleScorer(ScorerPlugin):
+    """Estilo de mentoría del mentor frente al estilo de aprendizaje del mentil (tabla precompilada)."""
+    name = "learning_style"
+    fields = ("profile",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        return LEARNING_STYLE_COMPAT[mentors.mentoring_style[None, :], mentees.learning_style[:, None]]
+
+
+@register_scorer
+class ExpertiseGoalsScorer(ScorerPlugin):
+    """Áreas de objetivos del mentil cubiertas por las áreas de experiencia del mentor; 0.5 sin datos."""
+    name = "expertise_goals"
+    fields = ("profile",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        goal_counts = mentees.goal_areas.sum(axis=1)[:, None]
+        expertise_counts = mentors.expertise_areas.sum(axis=1)[None, :]
+        covered = mentees.goal_areas.astype(np.float32) @ mentors.expertise_areas.T.astype(np.float32)
+        known = (goal_counts > 0) & (expertise_counts > 0)
+        return np.where(known, _ratio(covered, goal_counts), 0.5).astype(np.float32)
+
+
+@register_scorer
+class ExperienceScorer(ScorerPlugin):
+    """Años de experiencia del mentor dentro del rango de la etapa de carrera del mentil."""
+    name = "experience"
+    fields = ("profile",)
+
+    def score(self, mentors, mentees) -> np.ndarray:
+        return experience_match(mentees.career_stage[:, None], mentors.experience_years[None, :])
+
+
+# ----------------------------------------------------------------------
+# Perfiles de puntuación
+# ----------------------------------------------------------------------
+
+class ScoringProfile:
+    """
+    Componentes de salida (nombre -> plugin), subtotales opcionales (combinaciones lineales de
+    componentes) y los pesos del total sobre componentes y subtotales.
+    """
+
+    def __init__(
+        self,
+        components: Dict[str, str],
+        weights: Dict[str, float],
+        subtotals: Optional[Dict[str, Dict[str, float]]] = None
+    ):
+        self.components = components
+        self.weights = weights
+        self.subtotals = subtotals or {}
+
+    @property
+    def fields(self) -> Set[str]:
+        """Unión de los campos de perfil que necesitan los plugins."""
+        return {field for plugin in self.components.values() for field in scorer_registry[plugin].fields}
+
+    def component_weights(self) -> Dict[str, float]:
+        """Peso de cada componente en el total, con los subtotales desplegados."""
+        weights = {component: 0.0 for component in self.components}
+        for name, weight in self.weights.items():
+            for component, inner in self.subtotals.get(name, {name: 1.0}).items():
+                weights[component] += weight * inner
+        return weights
+
+    def subset(self, components: Iterable[str]) -> "ScoringProfile":
+        """Perfil con solo esos componentes, cuyo total es su parte del total de este perfil."""
+        weights = self.component_weights()
+        return ScoringProfile(
+            components={component: self.components[component] for component in components},
+            weights={component: weights[component] for component in components}
+        )
+
+    def upper_bounds(self, components: Iterable[str], mentors, mentees) -> np.ndarray:
+        """Cota superior de la parte del total que aportan esos componentes."""
+        weights = self.component_weights()
+        bound = np.zeros((len(mentees), len(mentors)), dtype=np.float32)
+        for component in components:
+            bound += weights[component] * scorer_registry[self.components[component]].upper_bound(mentors, mentees)
+        return bound
+
+    def score(self, mentors, mentees) -> Dict[str, np.ndarray]:
+        scores = {
+            component: scorer_registry[plugin].score(mentors, mentees)
+            for component, plugin in self.components.items()
+        }
+        for name, weights in self.subtotals.items():
+            scores[name] = self._combine(scores, weights.items())
+        scores["total"] = self._combine(scores, self.weights.items())
+        return scores
+
+    @staticmethod
+    def _combine(scores: Dict[str, np.ndarray], weights: Iterable[Tuple[str, float]]) -> np.ndarray:
+        return sum(scores[name] * weight for name, weight in weights).astype(np.float32)
+
+
+# Pesos de MatchmakingService.calculate_profile_compatibility
+PROFILE_WEIGHTS = {
+    "skills": 0.25,
+    "language": 0.15,
+    "career": 0.15,
+    "industry": 0.20,
+    "style": 0.15,
+    "goals": 0.10
+}
+PROFILE_SHARE = 0.7
+SCHEDULE_SHARE = 0.3
+
+SCORING_PROFILES: Dict[str, ScoringProfile] = {
+    # MatchmakingService, asignación de cohortes y caché "batch"
+    "matchmaking": ScoringProfile(
+        components={
+            "skills": "skills",
+            "language": "language",
+            "career": "career",
+            "industry": "industry",
+            "style": "preferred_style",
+            "goals": "goal_industry",
+            "schedule": "schedule_slots"
+        },
+        subtotals={"profile": PROFILE_WEIGHTS},
+        weights={"profile": PROFILE_SHARE, "schedule": SCHEDULE_SHARE}
+    ),
+    # MatchingService.get_suggestions (caché "suggestions"); pesos por defecto de MatchPreference
+    "suggestions": ScoringProfile(
+        components={
+            "skills": "skill_overlap",
+            "schedule": "availability_overlap",
+            "style": "learning_style",
+            "goals": "expertise_goals"
+        },
+        weights={"skills": 0.3, "schedule": 0.2, "style": 0.2, "goals": 0.3}
+    ),
+    # MatchingAlgorithm.generate_matches: media de los cinco componentes ponderados
+    "algorithm": ScoringProfile(
+        components={
+            "skills": "skill_overlap",
+            "availability": "availability_jaccard",
+            "style": "learning_style",
+            "goals": "expertise_goals",
+            "experience": "experience"
+        },
+        weights={"skills": 0.3 / 5, "availability": 0.2 / 5, "style": 0.2 / 5, "goals": 0.2 / 5, "experience": 0.1 / 5}
+    )
+}
@@ -0,0 +1,208 @@
+from typing import Dict, Set, Tuple, Optional, Iterable
+import threading
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models import Mentor, Mentee, MentorSkill, MenteeInterest
+from app.models.matching import Industry, UserIndustryExperience, MentorshipGoal
+
+# Claves de las listas invertidas: ("skill", skill_id) o ("topic", texto normalizado).
+# Los temas reúnen áreas de experiencia, categorías de industria y categorías de objetivos.
+IndexKey = Tuple[str, object]
+
+
+def _topic(value) -> Optional[IndexKey]:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return ("topic", value.strip().lower())
+
+
+class SkillIndex:
+    """
+    Índice invertido en memoria de habilidad/tema -> usuarios. Se usa para elegir un conjunto
+    pequeño de candidatos antes de la puntuación completa.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self.mentor_postings: Dict[IndexKey, Set[int]] = {}
+        self.mentee_postings: Dict[IndexKey, Set[int]] = {}
+        self.mentor_keys: Dict[int, Set[IndexKey]] = {}
+        self.mentee_keys: Dict[int, Set[IndexKey]] = {}
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def build(self, db: Session) -> None:
+        """Reconstruye el índice completo a partir de la base de datos."""
+        mentor_keys: Dict[int, Set[IndexKey]] = {}
+        mentee_keys: Dict[int, Set[IndexKey]] = {}
+
+        for mentor_id, skill_id in db.query(MentorSkill.mentor_id, MentorSkill.skill_id):
+            mentor_keys.setdefault(mentor_id, set()).add(("skill", skill_id))
+        for mentor_id, areas in db.query(Mentor.user_id, Mentor.expertise_areas):
+            mentor_keys.setdefault(mentor_id, set()).update(self._topics(areas))
+        for user_id, category in db.query(UserIndustryExperience.user_id, Industry.category).join(
+            Industry, Industry.id == UserIndustryExperience.industry_id
+        ).join(Mentor, Mentor.user_id == UserIndustryExperience.user_id):
+            mentor_keys.setdefault(user_id, set()).update(self._topics([category]))
+
+        for mentee_id, skill_id in db.query(MenteeInterest.mentee_id, MenteeInterest.skill_id):
+            mentee_keys.setdefault(mentee_id, set()).add(("skill", skill_id))
+        for mentee_id, desired, goals in db.query(Mentee.user_id, Mentee.desired_skills, Mentee.specific_goals):
+            mentee_keys.setdefault(mentee_id, set()).update(self._mentee_profile_topics(desired, goals))
+        for user_id, category in db.query(MentorshipGoal.user_id, MentorshipGoal.category).join(
+            Mentee, Mentee.user_id == MentorshipGoal.user_id
+        ):
+            mentee_keys.setdefault(user_id, set()).update(self._topics([category]))
+
+        with self._lock:
+            self.mentor_keys = mentor_keys
+            self.mentee_keys = mentee_keys
+            self.mentor_postings = self._invert(mentor_keys)
+            self.mentee_postings = self._invert(mentee_keys)
+            self._built = True
+
+    def ensure_built(self, db: Session) -> None:
+        if not self._built:
+            self.build(db)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.mentor_postings, self.mentee_postings = {}, {}
+            self.mentor_keys, self.mentee_keys = {}, {}
+            self._built = False
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental
+    # ------------------------------------------------------------------
+
+    def add_mentor_skill(self, mentor_id: int, skill_id: int) -> None:
+        self._add(self.mentor_keys, self.mentor_postings, mentor_id, [("skill", skill_id)])
+
+    def remove_mentor_skill(self, mentor_id: int, skill_id: int) -> None:
+        self._remove(self.mentor_keys, self.mentor_postings, mentor_id, [("skill", skill_id)])
+
+    def add_mentee_interest(self, mentee_id: int, skill_id: int) -> None:
+        self._add(self.mentee_keys, self.mentee_postings, mentee_id, [("skill", skill_id)])
+
+    def remove_mentee_interest(self, mentee_id: int, skill_id: int) -> None:
+        self._remove(self.mentee_keys, self.mentee_postings, mentee_id, [("skill", skill_id)])
+
+    def refresh_user(self, db: Session, user_id: int) -> None:
+        """Vuelve a leer las claves de un usuario tras editar su perfil."""
+        if not self._built:
+            return
+
+        mentor_keys: Set[IndexKey] = set()
+        mentor = db.query(Mentor).filter(Mentor.user_id == user_id).first()
+        if mentor:
+            mentor_keys.update(("skill", s.skill_id) for s in mentor.skills)
+            mentor_keys.update(self._topics(mentor.expertise_areas))
+            categories = db.query(Industry.category).join(
+                UserIndustryExperience, Industry.id == UserIndustryExperience.industry_id
+            ).filter(UserIndustryExperience.user_id == user_id)
+            mentor_keys.update(self._topics(row[0] for row in categories))
+
+        mentee_keys: Set[IndexKey] = set()
+        mentee = db.query(Mentee).filter(Mentee.user_id == user_id).first()
+        if mentee:
+            mentee_keys.update(("skill", i.skill_id) for i in mentee.interests)
+            mentee_keys.update(self._mentee_profile_topics(mentee.desired_skills, mentee.specific_goals))
+            categories = db.query(MentorshipGoal.category).filter(MentorshipGoal.user_id == user_id)
+            mentee_keys.update(self._topics(row[0] for row in categories))
+
+        with self._lock:
+            self._remove(self.mentor_keys, self.mentor_postings, user_id, set(self.mentor_keys.get(user_id, ())))
+            self._remove(self.mentee_keys, self.mentee_postings, user_id, set(self.mentee_keys.get(user_id, ())))
+            self._add(self.mentor_keys, self.mentor_postings, user_id, mentor_keys)
+            self._add(self.mentee_keys, self.mentee_postings, user_id, mentee_keys)
+
+    # ------------------------------------------------------------------
+    # Generación de candidatos
+    # ------------------------------------------------------------------
+
+    def candidate_mentors(self, db: Session, mentee_id: int, limit: int) -> Optional[Set[int]]:
+        """
+        Mentores que comparten al menos una habilidad o tema con el mentil.
+        Devuelve None cuando el índice está desactivado o la cobertura es demasiado baja;
+        en ese caso el llamador debe puntuar a todos los mentores.
+        """
+        if not settings.MATCHING_CANDIDATE_INDEX_ENABLED:
+            return None
+        self.ensure_built(db)
+        return self._candidates(self.mentee_keys, self.mentor_postings, mentee_id, limit)
+
+    def candidate_mentees(self, db: Session, mentor_id: int, limit: int) -> Optional[Set[int]]:
+        """Mentiles que comparten al menos una habilidad o tema con el mentor (None = recorrido completo)."""
+        if not settings.MATCHING_CANDIDATE_INDEX_ENABLED:
+            return None
+        self.ensure_built(db)
+        return self._candidates(self.mentor_keys, self.mentee_postings, mentor_id, limit)
+
+    def _candidates(
+        self,
+        keys: Dict[int, Set[IndexKey]],
+        postings: Dict[IndexKey, Set[int]],
+        user_id: int,
+        limit: int
+    ) -> Optional[Set[int]]:
+        with self._lock:
+            candidates: Set[int] = set()
+            for key in keys.get(user_id, ()):
+                candidates.update(postings.get(key, ()))
+        candidates.discard(user_id)
+
+        if len(candidates) < max(limit * settings.MATCHING_CANDIDATE_RECALL_FACTOR,
+                                 settings.MATCHING_CANDIDATE_MIN):
+            return None
+        return candidates
+
+    # ------------------------------------------------------------------
+    # Utilidades
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _topics(values: Optional[Iterable]) -> Set[IndexKey]:
+        return {key for key in (_topic(v) for v in (values or [])) if key}
+
+    @staticmethod
+    def _mentee_profile_topics(desired_skills, specific_goals) -> Set[IndexKey]:
+        topics = SkillIndex._topics(desired_skills)
+        topics.update(SkillIndex._topics(
+            goal.get("category") for goal in (specific_goals or []) if isinstance(goal, dict)
+        ))
+        return topics
+
+    @staticmethod
+    def _invert(keys: Dict[int, Set[IndexKey]]) -> Dict[IndexKey, Set[int]]:
+        postings: Dict[IndexKey, Set[int]] = {}
+        for user_id, user_keys in keys.items():
+            for key in user_keys:
+                postings.setdefault(key, set()).add(user_id)
+        return postings
+
+    def _add(self, keys, postings, user_id: int, new_keys: Iterable[IndexKey]) -> None:
+        if not self._built:
+            return
+        with self._lock:
+            for key in new_keys:
+                keys.setdefault(user_id, set()).add(key)
+                postings.setdefault(key, set()).add(user_id)
+
+    def _remove(self, keys, postings, user_id: int, old_keys: Iterable[IndexKey]) -> None:
+        if not self._built:
+            return
+        with self._lock:
+            for key in old_keys:
+                keys.get(user_id, set()).discard(key)
+                users = postings.get(key)
+                if users is not None:
+                    users.discard(user_id)
+                    if not users:
+                        del postings[key]
+
+
+# Instancia global del índice de candidatos
+skill_index = SkillIndex()
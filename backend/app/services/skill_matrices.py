@@ -0,0 +1,144 @@
+from typing import Dict, Iterable, Tuple
+import threading
+import warnings
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session
+from app.models import MentorSkill, MenteeInterest
+
+# Lado -> (modelo, columna de usuario, columna de nivel)
+SIDES = {
+    "mentor": (MentorSkill, MentorSkill.mentor_id, MentorSkill.proficiency_level),
+    "mentee": (MenteeInterest, MenteeInterest.mentee_id, MenteeInterest.interest_level)
+}
+
+
+def build_csr(entries: Iterable[Tuple[int, int, float]], row_index: Dict[int, int],
+              column_index: Dict[int, int]) -> sparse.csr_matrix:
+    """Matriz CSR usuario × habilidad a partir de tuplas (usuario, habilidad, nivel); ignora ids desconocidos."""
+    rows, columns, values = [], [], []
+    for user_id, skill_id, level in entries:
+        row, column = row_index.get(user_id), column_index.get(skill_id)
+        if row is None or column is None or not level:
+            continue
+        rows.append(row)
+        columns.append(column)
+        values.append(level)
+    return sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), (rows, columns)),
+        shape=(len(row_index), len(column_index))
+    )
+
+
+def select(matrix: sparse.csr_matrix, row_index: Dict[int, int], column_index: Dict[int, int],
+           user_ids: Iterable[int], skill_ids: Iterable[int]) -> sparse.csr_matrix:
+    """Submatriz con las filas de user_ids y las columnas de skill_ids; los ids ausentes quedan vacíos."""
+    rows = np.array([row_index.get(user_id, -1) for user_id in user_ids], dtype=np.int64)
+    columns = np.array([column_index.get(skill_id, -1) for skill_id in skill_ids], dtype=np.int64)
+    if not matrix.shape[0] or not matrix.shape[1]:
+        return sparse.csr_matrix((len(rows), len(columns)), dtype=np.float32)
+    selected = matrix[np.maximum(rows, 0)][:, np.maximum(columns, 0)]
+    return sparse.csr_matrix(
+        sparse.diags((rows >= 0).astype(np.float32)) @ selected @ sparse.diags((columns >= 0).astype(np.float32))
+    )
+
+
+class SkillMatrices:
+    """
+    Matrices CSR en memoria de nivel de dominio (mentores × habilidades) y de interés
+    (mentiles × habilidades). Se construyen una vez y después se mantienen con las ediciones
+    de habilidades, sin volver a leer la tabla completa; usuarios y habilidades nuevos añaden
+    filas y columnas al final.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def clear(self) -> None:
+        with self._lock:
+            self._built = False
+            self.matrices: Dict[str, sparse.csr_matrix] = {
+                side: sparse.csr_matrix((0, 0), dtype=np.float32) for side in SIDES
+            }
+            self.row_index: Dict[str, Dict[int, int]] = {side: {} for side in SIDES}
+            self.column_index: Dict[int, int] = {}
+
+    def build(self, db: Session) -> None:
+        """Reconstruye ambas matrices a partir de la base de datos."""
+        entries = {
+            side: db.query(user_column, model.skill_id, level_column).all()
+            for side, (model, user_column, level_column) in SIDES.items()
+        }
+        skill_ids = sorted({skill_id for rows in entries.values() for _, skill_id, _ in rows})
+        column_index = {skill_id: i for i, skill_id in enumerate(skill_ids)}
+        row_index = {
+            side: {user_id: i for i, user_id in enumerate(sorted({user_id for user_id, _, _ in rows}))}
+            for side, rows in entries.items()
+        }
+        matrices = {side: build_csr(rows, row_index[side], column_index) for side, rows in entries.items()}
+
+        with self._lock:
+            self.matrices = matrices
+            self.row_index = row_index
+            self.column_index = column_index
+            self._built = True
+
+    def ensure_built(self, db: Session) -> None:
+        if not self._built:
+            self.build(db)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental
+    # ------------------------------------------------------------------
+
+    def set_level(self, side: str, user_id: int, skill_id: int, level) -> None:
+        """Nivel de una habilidad de un usuario; 0 o None elimina la entrada."""
+        if not self._built:
+            return
+        with self._lock:
+            row = self.row_index[side].setdefault(user_id, len(self.row_index[side]))
+            column = self.column_index.setdefault(skill_id, len(self.column_index))
+            matrix = self.matrices[side]
+            shape = (len(self.row_index[side]), len(self.column_index))
+            if matrix.shape != shape:
+                matrix.resize(shape)
+            for other in SIDES:
+                if other != side and self.matrices[other].shape[1] != shape[1]:
+                    self.matrices[other].resize((self.matrices[other].shape[0], shape[1]))
+
+            # Cambiar la estructura de una CSR es O(nnz); las ediciones son raras frente a las lecturas
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", sparse.SparseEfficiencyWarning)
+                matrix[row, column] = level or 0
+            if not level:
+                matrix.eliminate_zeros()
+
+    def set_mentor_skill(self, mentor_id: int, skill_id: int, level) -> None:
+        self.set_level("mentor", mentor_id, skill_id, level)
+
+    def remove_mentor_skill(self, mentor_id: int, skill_id: int) -> None:
+        self.set_level("mentor", mentor_id, skill_id, 0)
+
+    def set_mentee_interest(self, mentee_id: int, skill_id: int, level) -> None:
+        self.set_level("mentee", mentee_id, skill_id, level)
+
+    def remove_mentee_interest(self, mentee_id: int, skill_id: int) -> None:
+        self.set_level("mentee", mentee_id, skill_id, 0)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def rows(self, side: str, user_ids: Iterable[int], skill_ids: Iterable[int]) -> sparse.csr_matrix:
+        """Filas de user_ids alineadas con el vocabulario skill_ids (copia, no comparte memoria)."""
+        with self._lock:
+            return select(self.matrices[side], self.row_index[side], self.column_index, user_ids, skill_ids)
+
+
+# Instancia global de las matrices de habilidades
+skill_matrices = SkillMatrices()
@@ -0,0 +1,228 @@
+"""
+Simulación de pesos sobre el historial de emparejamientos ("what-if").
+
+El historial (MatchHistory) se agrupa una vez por el usuario que recibe la lista, mentil o
+mentor, en arreglos rellenados (grupos × pares del grupo × componentes) con solo los pares que
+tienen resultado. Para un lote de vectores de pesos se puntúan todos los grupos con todos los
+vectores en un producto de matrices, se eligen los k primeros de cada grupo y vector y se
+calculan las métricas offline: precision@k (la tasa de aceptación esperada entre los k
+primeros) y NDCG@k con la valoración como ganancia.
+"""
+from typing import Dict, Iterable
+import threading
+import time
+import numpy as np
+from sqlalchemy.orm import Session
+from app.services.match_history import MatchHistory
+from app.services.weighted_ranking import DEFAULT_WEIGHTS, WEIGHT_FIELDS, COMPONENTS, weight_vector
+
+# Segundos que el historial cargado se reutiliza entre simulaciones
+SIMULATION_MAX_AGE = 600
+
+GROUP_SIDES = ("mentee", "mentor")
+
+# Elementos de (grupos × pares × vectores) evaluados a la vez; acota la memoria por bloque
+CHUNK_ELEMENTS = 1 << 23
+
+# Ancho máximo de grupo ordenado por comparaciones entre pares; los más anchos se ordenan
+RANK_WIDTH = 16
+
+
+def relevance(history: MatchHistory) -> np.ndarray:
+    """Ganancia de cada par para NDCG: valoración media en 0-1 si existe y, si no, el resultado 0/1."""
+    labels = history.labels()
+    ratings = history.mean_ratings()
+    rated = ~np.isnan(ratings)
+    gains = np.maximum(labels, 0).astype(np.float32)
+    gains[rated] = (ratings[rated] - 1) / 4
+    return gains
+
+
+class GroupBlock:
+    """Grupos de tamaño parecido rellenados al mismo ancho: (ancho × grupos [× componentes])."""
+
+    def __init__(self, sizes: np.ndarray, width: int):
+        self.sizes = sizes
+        self.valid = np.arange(width)[:, None] < sizes[None, :]
+        self.components = np.zeros((width, len(sizes), len(COMPONENTS)), dtype=np.float32)
+        self.positive = np.zeros((width, len(sizes)), dtype=np.float32)
+        self.gains = np.zeros((width, len(sizes)), dtype=np.float32)
+
+    @property
+    def width(self) -> int:
+        return self.valid.shape[0]
+
+    def top_k(self, totals: np.ndarray, k: int):
+        """
+        Aciertos y DCG de los k primeros de cada grupo y vector, con `totals` de forma
+        (ancho × grupos × vectores). Devuelve (aciertos, dcg), ambos (grupos × vectores).
+        """
+        discounts = np.zeros(max(self.width, k) + 1, dtype=np.float32)
+        discounts[:k] = 1.0 / np.log2(np.arange(k) + 2)
+        if self.width <= RANK_WIDTH:
+            # Puesto de cada par comparando por parejas dentro del grupo (ancho² comparaciones
+            # elemento a elemento); en empate va antes el par más antiguo
+            rank = np.zeros(totals.shape, dtype=np.uint8)
+            ahead = np.empty(totals.shape[1:], dtype=bool)
+            for i in range(self.width):
+                for j in range(i):
+                    np.greater_equal(totals[j], totals[i], out=ahead)
+                    rank[i] += ahead
+                    rank[j] += ~ahead
+            position_discounts = discounts[rank]
+            hits = ((rank < k) * self.positive[:, :, None]).sum(axis=0)
+            dcg = (position_discounts * self.gains[:, :, None]).sum(axis=0)
+            return hits, dcg
+
+        order = np.argsort(-totals, axis=0, kind="stable")[:k]
+        groups = np.arange(len(self.sizes))[None, :, None]
+        hits = self.positive[order, groups].sum(axis=0)
+        dcg = (self.gains[order, groups] * discounts[:len(order), None, None]).sum(axis=0)
+        return hits, dcg
+
+
+class WeightSimulator:
+    """
+    Historial agrupado por usuario, listo para evaluar lotes de vectores de pesos. Los grupos
+    se reparten en bloques por ancho (potencias de dos) para que un usuario con un historial
+    muy largo no obligue a rellenar todos los demás hasta su tamaño.
+    """
+
+    def __init__(self, history: MatchHistory, group_by: str = "mentee"):
+        if group_by not in GROUP_SIDES:
+            raise ValueError(f"group_by debe ser uno de {GROUP_SIDES}")
+        self.group_by = group_by
+        self.built_at = time.monotonic()
+
+        labels = history.labels()
+        known = labels >= 0
+        self.pairs = int(known.sum())
+        self.base_rate = float(labels[known].mean()) if self.pairs else 0.0
+
+        owners = (history.mentee_ids if group_by == "mentee" else history.mentor_ids)[known]
+        self.group_ids, groups, sizes = np.unique(owners, return_inverse=True, return_counts=True)
+        # Posición de cada par dentro de su grupo, conservando el orden del historial
+        order = np.argsort(groups, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        slots = np.empty(len(order), dtype=np.int64)
+        slots[order] = np.arange(len(order)) - np.repeat(starts, sizes)
+
+        components = history.components[known]
+        positive = labels[known].astype(np.float32)
+        gains = relevance(history)[known]
+
+        widths = 1 << np.ceil(np.log2(np.maximum(sizes, 1))).astype(np.int64)
+        block_of_group = np.zeros(len(sizes), dtype=np.int64)
+        row_of_group = np.zeros(len(sizes), dtype=np.int64)
+        self.blocks = []
+        for width in np.unique(widths):
+            members = np.nonzero(widths == width)[0]
+            block_of_group[members] = len(self.blocks)
+            row_of_group[members] = np.arange(len(members))
+            self.blocks.append(GroupBlock(sizes[members], int(width)))
+
+        for b, block in enumerate(self.blocks):
+            rows = block_of_group[groups] == b
+            block_slots, block_rows = slots[rows], row_of_group[groups[rows]]
+            block.components[block_slots, block_rows] = components[rows]
+            block.positive[block_slots, block_rows] = positive[rows]
+            block.gains[block_slots, block_rows] = gains[rows]
+
+    @classmethod
+    def from_db(cls, db: Session, group_by: str = "mentee") -> "WeightSimulator":
+        return cls(MatchHistory.load(db), group_by)
+
+    def __len__(self) -> int:
+        return len(self.group_ids)
+
+    def evaluate(self, weights: np.ndarray, k: int = 5) -> Dict[str, np.ndarray]:
+        """
+        Métricas de cada vector de pesos (filas de `weights`, en el orden de COMPONENTS):
+        precision_at_k (aciertos entre todos los puestos ocupados) y ndcg_at_k (media sobre
+        los grupos con alguna ganancia). Los empates se resuelven por orden del historial.
+        """
+        weights = np.asarray(weights, dtype=np.float32).reshape(-1, len(COMPONENTS))
+        configs = len(weights)
+        hits = np.zeros(configs, dtype=np.float64)
+        ndcg_sum = np.zeros(configs, dtype=np.float64)
+        filled = rated_groups = 0
+        discounts = 1.0 / np.log2(np.arange(max(k, 0)) + 2)
+
+        for block in self.blocks:
+            depth = min(k, block.width)
+            if depth <= 0:
+                continue
+            ideal = -np.sort(-block.gains, axis=0)[:depth].T @ discounts[:depth]
+            rated = ideal > 0
+            filled += int(np.minimum(block.sizes, depth).sum())
+            rated_groups += int(rated.sum())
+
+            chunk_size = max(1, CHUNK_ELEMENTS // block.valid.size)
+            for start in range(0, configs, chunk_size):
+                chunk = weights[start:start + chunk_size]
+                # (pares × grupos × vectores); los huecos de relleno quedan siempre al final
+                totals = (block.components.reshape(-1, len(COMPONENTS)) @ chunk.T).reshape(*block.valid.shape, -1)
+                totals[~block.valid] = -np.inf
+                block_hits, dcg = block.top_k(totals, depth)
+                hits[start:start + len(chunk)] += block_hits.sum(axis=0)
+                ndcg_sum[start:start + len(chunk)] += (dcg[rated] / ideal[rated, None]).sum(axis=0)
+
+        return {
+            "precision_at_k": hits / filled if filled else hits,
+            "ndcg_at_k": ndcg_sum / rated_groups if rated_groups else ndcg_sum
+        }
+
+    def simulate(self, weight_sets: Iterable, k: int = 5) -> Dict:
+        """
+        Evalúa pesos con nombres de campo de MatchPreference (dicts u objetos; los que faltan
+        toman el valor por defecto) y añade como referencia los pesos por defecto.
+        """
+        weight_sets = list(weight_sets)
+        vectors = np.stack([weight_vector(DEFAULT_WEIGHTS)] + [weight_vector(weights) for weights in weight_sets])
+        started = time.perf_counter()
+        metrics = self.evaluate(vectors, k)
+        seconds = time.perf_counter() - started
+
+        results = [
+            {
+                "weights": {field: float(value) for (_, field), value in zip(WEIGHT_FIELDS, vector)},
+                "precision_at_k": float(metrics["precision_at_k"][i]),
+                "ndcg_at_k": float(metrics["ndcg_at_k"][i])
+            }
+            for i, vector in enumerate(vectors)
+        ]
+        return {
+            "group_by": self.group_by,
+            "k": k,
+            "pairs": self.pairs,
+            "groups": len(self),
+            "base_rate": self.base_rate,
+            "baseline": results[0],
+            "results": results[1:],
+            "seconds": round(seconds, 6)
+        }
+
+
+class SimulatorCache:
+    """Simuladores en memoria por lado de agrupación; se recargan pasado SIMULATION_MAX_AGE."""
+
+    def __init__(self, max_age: float = SIMULATION_MAX_AGE):
+        self._lock = threading.Lock()
+        self._simulators: Dict[str, WeightSimulator] = {}
+        self.max_age = max_age
+
+    def get(self, db: Session, group_by: str = "mentee") -> WeightSimulator:
+        with self._lock:
+            simulator = self._simulators.get(group_by)
+        if simulator is None or time.monotonic() - simulator.built_at > self.max_age:
+            simulator = WeightSimulator.from_db(db, group_by)
+            with self._lock:
+                self._simulators[group_by] = simulator
+        return simulator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._simulators.clear()
+
+
+weight_simulators = SimulatorCache()
@@ -0,0 +1,113 @@
+from typing import Callable, Dict, Optional, Tuple
+import threading
+import time
+import numpy as np
+from app.services.batch_scoring import BatchScoringService
+
+# Componente -> campo de peso en MatchPreference, en el orden de las columnas de la matriz
+WEIGHT_FIELDS = (
+    ("skills", "skill_weight"),
+    ("schedule", "availability_weight"),
+    ("style", "style_weight"),
+    ("goals", "goals_weight")
+)
+COMPONENTS = tuple(component for component, _ in WEIGHT_FIELDS)
+DEFAULT_WEIGHTS = {"skill_weight": 0.3, "availability_weight": 0.2, "style_weight": 0.2, "goals_weight": 0.3}
+
+# Segundos que una matriz en memoria se considera vigente para re-ordenar sin base de datos
+MATRIX_MAX_AGE = 300
+
+
+def weight_vector(weights=None) -> np.ndarray:
+    """
+    Vector de pesos normalizado (suma 1) desde un dict o una MatchPreference. Los pesos que
+    faltan toman el valor por defecto; si todos son cero se usan los pesos por defecto.
+    """
+    values = []
+    for _, field in WEIGHT_FIELDS:
+        value = weights.get(field) if isinstance(weights, dict) else getattr(weights, field, None)
+        values.append(DEFAULT_WEIGHTS[field] if value is None else max(float(value), 0.0))
+    vector = np.asarray(values, dtype=np.float32)
+    if not vector.sum():
+        vector = np.asarray([DEFAULT_WEIGHTS[field] for _, field in WEIGHT_FIELDS], dtype=np.float32)
+    return vector / vector.sum()
+
+
+class ComponentMatrix:
+    """
+    Puntuaciones por componente de un usuario frente a sus candidatos (candidatos × componentes),
+    sin pares excluidos. Re-ordenar con otros pesos es un producto matriz-vector más un top-k.
+    `recall` es el límite con el que se generaron los candidatos: el índice de habilidades
+    devuelve más o menos candidatos según el límite pedido.
+    """
+
+    def __init__(self, user_id: int, role: str, candidate_ids, components: np.ndarray,
+                 recall: Optional[int] = None):
+        self.user_id = user_id
+        self.role = role
+        self.recall = recall
+        self.candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        self.components = np.ascontiguousarray(components, dtype=np.float32).reshape(-1, len(COMPONENTS))
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.candidate_ids)
+
+    def totals(self, weights: np.ndarray) -> np.ndarray:
+        return self.components @ weights
+
+    def rank(self, weights: np.ndarray, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Filas de los `limit` mejores candidatos y sus puntuaciones; empates por id ascendente."""
+        totals = self.totals(weights)
+        rows = BatchScoringService.top_k(totals, limit)
+        return rows, totals[rows]
+
+    def pair(self, row: int) -> Tuple[int, int]:
+        """(mentor_id, mentee_id) de la fila `row`."""
+        candidate_id = int(self.candidate_ids[row])
+        if self.role == "mentor":
+            return self.user_id, candidate_id
+        return candidate_id, self.user_id
+
+    def component_scores(self, row: int) -> Dict[str, float]:
+        return {component: float(value) for component, value in zip(COMPONENTS, self.components[row])}
+
+
+class ComponentMatrixStore:
+    """
+    Matrices de componentes en memoria por (usuario, recall), para re-ordenar sin consultar la
+    base de datos. El almacén es local a cada proceso: invalidate solo limpia el proceso que
+    atiende el cambio, así que los demás workers pueden servir una matriz anterior a un cambio
+    de preferencias o de estado de un par durante, como mucho, max_age segundos.
+    """
+
+    def __init__(self, max_age: float = MATRIX_MAX_AGE):
+        self._lock = threading.Lock()
+        self._matrices: Dict[Tuple[int, Optional[int]], ComponentMatrix] = {}
+        self.max_age = max_age
+
+    def get(self, user_id: int, build: Callable[[], ComponentMatrix], recall: Optional[int] = None) -> ComponentMatrix:
+        """Matriz vigente del usuario para ese recall; se construye con `build` si no existe o ha caducado."""
+        with self._lock:
+            matrix = self._matrices.get((user_id, recall))
+        if matrix is None or time.monotonic() - matrix.built_at > self.max_age:
+            matrix = self.put(build())
+        return matrix
+
+    def put(self, matrix: ComponentMatrix) -> ComponentMatrix:
+        with self._lock:
+            self._matrices[(matrix.user_id, matrix.recall)] = matrix
+        return matrix
+
+    def invalidate(self, user_id: int) -> None:
+        """Descarta las matrices del usuario en este proceso."""
+        with self._lock:
+            for key in [key for key in self._matrices if key[0] == user_id]:
+                del self._matrices[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._matrices.clear()
+
+
+component_matrices = ComponentMatrixStore()
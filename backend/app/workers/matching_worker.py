@@ -0,0 +1,75 @@
+from celery import Celery
+from app.core.database import SessionLocal
+from app.services.mentor_success import MentorSuccessService
+from app.services.all_pairs import AllPairsService
+from app.services.learned_weights import WeightTrainer
+import logging
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configurar Celery
+celery = Celery('matching_worker')
+celery.conf.broker_url = 'redis://localhost:6379/0'
+celery.conf.result_backend = 'redis://localhost:6379/0'
+
+@celery.task
+def reconcile_mentor_success():
+    """Recalcula los agregados de éxito histórico de mentores desde feedback y matches."""
+    db = SessionLocal()
+    try:
+        result = MentorSuccessService(db).reconcile()
+        logger.info(f"Reconciled mentor success stats: {result}")
+    except Exception as e:
+        logger.error(f"Error in reconcile_mentor_success: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+@celery.task
+def compute_top_matches(k: int = 10):
+    """Recalcula el top-k de mentores por mentil y de mentiles por mentor sobre toda la plataforma."""
+    db = SessionLocal()
+    try:
+        result = AllPairsService(db).compute(k=k)
+        db.commit()
+        logger.info(f"Computed top matches: {result}")
+    except Exception as e:
+        logger.error(f"Error in compute_top_matches: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+@celery.task
+def train_matching_weights():
+    """Ajusta los pesos de los componentes sobre el historial de matches y publica una versión nueva."""
+    db = SessionLocal()
+    try:
+        result = WeightTrainer(db).train()
+        logger.info(f"Trained matching weights: {result}")
+    except Exception as e:
+        logger.error(f"Error in train_matching_weights: {e}")
+    finally:
+        db.close()
+
+# Programar tareas periódicas
+@celery.on_after_configure.connect
+def setup_periodic_tasks(sender, **kwargs):
+    # Reconciliar agregados de éxito diariamente
+    sender.add_periodic_task(
+        86400.0,  # 24 horas en segundos
+        reconcile_mentor_success.s()
+    )
+
+    # Listas de mejores candidatos para los paneles de administración, diariamente
+    sender.add_periodic_task(
+        86400.0,
+        compute_top_matches.s()
+    )
+
+    # Pesos aprendidos del feedback, semanalmente
+    sender.add_periodic_task(
+        7 * 86400.0,
+        train_matching_weights.s()
+    )
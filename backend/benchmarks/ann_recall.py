@@ -0,0 +1,141 @@
+"""
+Banco de pruebas del índice aproximado de perfiles (app.services.profile_embeddings).
+
+Genera una población sintética, construye el índice y, para una muestra de mentiles, compara
+los `k` mejores mentores de la puntuación exacta frente a todos los mentores con los `k` mejores
+tras puntuar de forma exacta solo los candidatos del índice (recall@k). Informa también del
+tiempo de construcción y del tiempo por consulta para cada valor de nprobe:
+
+    python -m benchmarks.ann_recall --users 10000 --nprobe 1,4,8,16 --output ann.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, List
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.base import Base
+from app.services.batch_scoring import BatchScoringService
+from app.services.profile_embeddings import ProfileEmbeddingIndex
+from benchmarks.population import PopulationGenerator
+from benchmarks.run_matching import DEFAULT_DATABASE_URL, _git_commit, _summary
+
+
+def recall_at_k(db, index: ProfileEmbeddingIndex, samples: int, k: int, candidates: int,
+                nprobes: List[int], seed: int = 0) -> Dict:
+    """Recall@k y tiempo por consulta de cada nprobe sobre una muestra fija de mentiles."""
+    engine = BatchScoringService(db)
+    pool = engine.load_pool()
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(pool.mentees), size=min(samples, len(pool.mentees)), replace=False)
+    mentees = pool.mentees.take(np.sort(rows))
+
+    totals = engine.score_block(pool.mentors, mentees)["total"]
+    queries = index.encoder.encode_mentees(mentees, pool.skill_ids, pool.categories)
+    exact = [set(pool.mentors.user_ids[BatchScoringService.top_k(row, k)].tolist()) for row in totals]
+
+    results = {}
+    for nprobe in nprobes:
+        recalls, timings = [], []
+        for i, query in enumerate(queries):
+            started = time.perf_counter()
+            found = index.search(query, candidates, nprobe=nprobe)
+            timings.append((time.perf_counter() - started) * 1000)
+
+            # Re-puntuación exacta de los candidatos recuperados
+            columns = np.array([pool.mentors.index[user_id] for user_id in found.tolist()], dtype=np.int64)
+            best = columns[BatchScoringService.top_k(totals[i, columns], k)] if len(columns) else columns
+            recalls.append(len(exact[i] & set(pool.mentors.user_ids[best].tolist())) / max(len(exact[i]), 1))
+        results[str(nprobe)] = {
+            "recall": round(float(np.mean(recalls)), 4),
+            "query_ms": _summary(timings)
+        }
+    return results
+
+
+def run(database_url: str, users: int, samples: int, k: int, candidate_factor: int, nprobes: List[int],
+        lists: int = None, mentor_ratio: float = 0.3, seed: int = 0) -> Dict:
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    )
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        generator = PopulationGenerator(db, users, mentor_ratio=mentor_ratio, seed=seed)
+        generator.generate()
+
+        index = ProfileEmbeddingIndex(n_lists=lists, seed=seed)
+        started = time.perf_counter()
+        index.build(db)
+        build_seconds = time.perf_counter() - started
+
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "users": users,
+            "mentors": generator.mentor_count,
+            "lists": len(index.centroids),
+            "dimension": index.encoder.dimension,
+            "k": k,
+            "candidates": k * candidate_factor,
+            "build_seconds": round(build_seconds, 3),
+            "nprobe": recall_at_k(db, index, samples, k, k * candidate_factor, nprobes, seed)
+        }
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Recall@k y latencia del índice aproximado de perfiles")
+    parser.add_argument("--users", type=int, default=10000, help="Tamaño de la población")
+    parser.add_argument("--samples", type=int, default=100, help="Mentiles consultados")
+    parser.add_argument("--k", type=int, default=10, help="Mejores mentores comparados")
+    parser.add_argument("--candidate-factor", type=int, default=20, help="Candidatos recuperados por resultado")
+    parser.add_argument("--nprobe", default="1,4,8,16", help="Valores de nprobe separados por comas")
+    parser.add_argument("--lists", type=int, help="Listas invertidas (por defecto la raíz del número de mentores)")
+    parser.add_argument("--mentor-ratio", type=float, default=0.3, help="Fracción de mentores en la población")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL,
+                        help="Base de datos desechable: su esquema se elimina y se recrea")
+    parser.add_argument("--output", help="Archivo JSON con el informe")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report = run(
+        args.database_url,
+        args.users,
+        samples=args.samples,
+        k=args.k,
+        candidate_factor=args.candidate_factor,
+        nprobes=[int(value) for value in args.nprobe.split(",") if value.strip()],
+        lists=args.lists,
+        mentor_ratio=args.mentor_ratio,
+        seed=args.seed
+    )
+
+    print(f"{report['mentors']} mentores en {report['lists']} listas, dimensión {report['dimension']}, "
+          f"construcción {report['build_seconds']} s")
+    for nprobe, result in report["nprobe"].items():
+        print(f"  nprobe {nprobe:>4}  recall@{report['k']} {result['recall']:.3f}  "
+              f"consulta {result['query_ms']['mean']:>7.2f} ms (p95 {result['query_ms']['p95']:.2f} ms)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Informe guardado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Generador de poblaciones sintéticas para medir el coste del emparejamiento a escala.
+
+Produce usuarios con la misma mezcla de modelos que la aplicación real (habilidades,
+intereses, disponibilidad, experiencia por industria, preferencias, objetivos, sesiones y
+feedback) mediante inserciones masivas. Con la misma semilla el resultado es idéntico,
+de modo que los informes de distintos commits miden exactamente los mismos datos.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import (
+    User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest, Availability, Session as SessionModel,
+    SessionFeedback
+)
+from app.models.match_algorithm import MatchScore, MatchFeedback, MatchPreference
+from app.models.matching import (
+    Industry, UserIndustryExperience, MentoringPreference, MentorshipGoal, MentoringStyle
+)
+from app.services.mentor_success import MentorSuccessService
+
+# Catálogos: mismas habilidades que seed_data.py
+SKILLS = [
+    ("JavaScript", "Programming"), ("Python", "Programming"), ("Java", "Programming"),
+    ("React", "Frontend"), ("Angular", "Frontend"), ("Vue.js", "Frontend"),
+    ("Node.js", "Backend"), ("Django", "Backend"), ("Flask", "Backend"),
+    ("SQL", "Database"), ("MongoDB", "Database"), ("AWS", "Cloud"),
+    ("Docker", "DevOps"), ("Kubernetes", "DevOps"), ("Git", "Tools"),
+    ("Machine Learning", "Data Science"), ("Data Analysis", "Data Science"),
+    ("UX Design", "Design"), ("UI Design", "Design"), ("Product Management", "Business"),
+    ("Agile Methodologies", "Business"), ("Leadership", "Soft Skills"),
+    ("Communication", "Soft Skills"), ("Problem Solving", "Soft Skills")
+]
+INDUSTRIES = [
+    ("Software", "Technical"), ("Fintech", "Technical"), ("Healthcare", "Career Growth"),
+    ("Education", "Career Growth"), ("Consulting", "Leadership"), ("Retail", "Leadership"),
+    ("Media", "Communication"), ("Public Sector", "Communication")
+]
+GOAL_CATEGORIES = ["Technical", "Leadership", "Career Growth", "Communication"]
+CAREER_STAGES = ["student", "early-career", "mid-career", "senior"]
+LEARNING_STYLES = ["structured", "self_directed", "collaborative"]
+POSITION_LEVELS = ["Junior", "Mid", "Senior", "Lead", "Manager"]
+TIMEZONES = ["America/Bogota", "America/Mexico_City", "Europe/Madrid", "America/Argentina/Buenos_Aires"]
+LANGUAGES = ["es", "en", "pt", "fr"]
+STYLES = [style for style in MentoringStyle]
+
+# Filas por sentencia INSERT
+INSERT_CHUNK = 5000
+
+# Franjas de 15 minutos entre las 07:00 y las 22:00 de cada día
+MAX_WIDE_SLOTS = 7 * 15 * 4
+
+
+class PopulationGenerator:
+    """
+    Crea `users` usuarios (una fracción `mentor_ratio` de mentores) con sus perfiles completos.
+    Los ids se asignan de forma explícita a partir del siguiente id libre de users. Con
+    `wide_slots`, el primer mentor y el primer mentil tienen además esa cantidad de franjas
+    de 15 minutos, lo que ensancha los arreglos de franjas de toda la población.
+    """
+
+    def __init__(self, db: Session, users: int, mentor_ratio: float = 0.3, seed: int = 0, wide_slots: int = 0):
+        if users < 2:
+            raise ValueError("La población necesita al menos un mentor y un mentil")
+        if wide_slots > MAX_WIDE_SLOTS:
+            raise ValueError(f"Como mucho {MAX_WIDE_SLOTS} franjas por usuario")
+        self.db = db
+        self.users = users
+        self.mentor_count = min(max(int(round(users * mentor_ratio)), 1), users - 1)
+        self.mentee_count = users - self.mentor_count
+        self.rng = np.random.default_rng(seed)
+        self.wide_slots = wide_slots
+        self.counts: Dict[str, int] = {}
+
+    def generate(self) -> Dict[str, int]:
+        """Inserta la población completa y devuelve el número de filas creadas por tabla."""
+        first_id = (self.db.query(User.id).order_by(User.id.desc()).limit(1).scalar() or 0) + 1
+        self.mentor_ids = np.arange(first_id, first_id + self.mentor_count)
+        self.mentee_ids = np.arange(first_id + self.mentor_count, first_id + self.users)
+
+        skill_ids = self._catalog(Skill, SKILLS)
+        industry_ids = self._catalog(Industry, INDUSTRIES)
+
+        self._users()
+        self._profiles()
+        self._skills(skill_ids)
+        self._availability()
+        self._industry_experience(industry_ids)
+        self._preferences()
+        self._goals()
+        self._history()
+        self.db.commit()
+
+        # Agregados de éxito histórico coherentes con el feedback generado
+        MentorSuccessService(self.db).reconcile()
+        return self.counts
+
+    # ------------------------------------------------------------------
+    # Utilidades
+    # ------------------------------------------------------------------
+
+    def _insert(self, model, rows: List[Dict]) -> None:
+        for start in range(0, len(rows), INSERT_CHUNK):
+            self.db.execute(insert(model), rows[start:start + INSERT_CHUNK])
+        self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+
+    def _catalog(self, model, entries) -> List[int]:
+        """Ids del catálogo (habilidades o industrias), creando las entradas que falten."""
+        existing = {name: item_id for item_id, name in self.db.query(model.id, model.name)}
+        missing = [{"name": name, "category": category} for name, category in entries if name not in existing]
+        if missing:
+            self._insert(model, missing)
+            existing = {name: item_id for item_id, name in self.db.query(model.id, model.name)}
+        return [existing[name] for name, _ in entries]
+
+    def _choice(self, options, size: int) -> list:
+        return [options[i] for i in self.rng.integers(0, len(options), size=size)]
+
+    def _pick(self, options):
+        return options[int(self.rng.integers(0, len(options)))]
+
+    def _all_ids(self) -> np.ndarray:
+        return np.concatenate([self.mentor_ids, self.mentee_ids])
+
+    # ------------------------------------------------------------------
+    # Perfiles
+    # ------------------------------------------------------------------
+
+    def _users(self) -> None:
+        user_ids = self._all_ids()
+        timezones = self._choice(TIMEZONES, len(user_ids))
+        language_counts = self.rng.integers(1, 3, size=len(user_ids))
+        self._insert(User, [
+            {
+                "id": int(user_id),
+                "email": f"synthetic{user_id}@example.com",
+                "name": f"Synthetic User {user_id}",
+                # Hash fijo: bcrypt por usuario dominaría el tiempo de generación
+                "password_hash": "synthetic",
+                "role": "mentor" if i < self.mentor_count else "mentee",
+                "is_active": True,
+                "profile_complete": True,
+                "timezone": timezones[i],
+                "languages": [
+                    {"code": code, "proficiency": int(self.rng.integers(1, 6))}
+                    for code in LANGUAGES[:int(language_counts[i])]
+                ]
+            }
+            for i, user_id in enumerate(user_ids)
+        ])
+
+    def _profiles(self) -> None:
+        self._insert(Mentor, [
+            {
+                "user_id": int(user_id),
+                "bio": "Synthetic mentor",
+                "experience_years": int(self.rng.integers(1, 25)),
+                "company": "SyntheticCorp",
+                "position": self._pick(POSITION_LEVELS),
+                "expertise_areas": sorted(set(self._choice(GOAL_CATEGORIES, int(self.rng.integers(1, 3))))),
+                "max_mentees": int(self.rng.integers(1, 6)),
+                "current_mentee_count": 0,
+                "mentoring_style": self._pick(STYLES).value
+            }
+            for user_id in self.mentor_ids
+        ])
+        skill_names = [name for name, _ in SKILLS]
+        self._insert(Mentee, [
+            {
+                "user_id": int(user_id),
+                "bio": "Synthetic mentee",
+                "goals": "Synthetic goals",
+                "current_position": self._pick(POSITION_LEVELS[:2]),
+                "career_stage": self._pick(CAREER_STAGES),
+                "desired_skills": sorted(set(self._choice(skill_names, int(self.rng.integers(1, 4))))),
+                "learning_style": self._pick(LEARNING_STYLES),
+                "specific_goals": [{"category": category} for category in
+                                   sorted(set(self._choice(GOAL_CATEGORIES, int(self.rng.integers(1, 3)))))]
+            }
+            for user_id in self.mentee_ids
+        ])
+
+    def _skills(self, skill_ids: List[int]) -> None:
+        """Entre 2 y 6 habilidades por mentor y entre 1 y 4 intereses por mentil, sin repetir."""
+        mentor_rows, mentee_rows = [], []
+        for user_id in self.mentor_ids:
+            for skill_id in self.rng.choice(skill_ids, size=int(self.rng.integers(2, 7)), replace=False):
+                mentor_rows.append({"mentor_id": int(user_id), "skill_id": int(skill_id),
+                                    "proficiency_level": int(self.rng.integers(2, 6))})
+        for user_id in self.mentee_ids:
+            for skill_id in self.rng.choice(skill_ids, size=int(self.rng.integers(1, 5)), replace=False):
+                mentee_rows.append({"mentee_id": int(user_id), "skill_id": int(skill_id),
+                                    "interest_level": int(self.rng.integers(1, 6))})
+        self._insert(MentorSkill, mentor_rows)
+        self._insert(MenteeInterest, mentee_rows)
+
+    def _availability(self) -> None:
+        """Entre 1 y 4 franjas semanales por usuario, en horas enteras entre las 07:00 y las 22:00."""
+        rows = []
+        for user_id in self._all_ids():
+            for day in self.rng.choice(7, size=int(self.rng.integers(1, 5)), replace=False):
+                start = int(self.rng.integers(7, 20))
+                end = min(start + int(self.rng.integers(1, 4)), 22)
+                rows.append({
+                    "user_id": int(user_id),
+                    "day_of_week": int(day),
+                    "start_time": f"{start:02d}:00",
+                    "end_time": f"{end:02d}:00",
+                    "recurrence": "weekly"
+                })
+
+        # Franjas adicionales sin consumir el generador aleatorio: el resto de la población no cambia
+        for user_id in (self.mentor_ids[0], self.mentee_ids[0]):
+            for i in range(self.wide_slots):
+                start = 7 * 60 + (i // 7) * 15
+                rows.append({
+                    "user_id": int(user_id),
+                    "day_of_week": i % 7,
+                    "start_time": f"{start // 60:02d}:{start % 60:02d}",
+                    "end_time": f"{(start + 15) // 60:02d}:{(start + 15) % 60:02d}",
+                    "recurrence": "weekly"
+                })
+        self._insert(Availability, rows)
+
+    def _industry_experience(self, industry_ids: List[int]) -> None:
+        rows = []
+        for user_id in self._all_ids():
+            for industry_id in self.rng.choice(industry_ids, size=int(self.rng.integers(1, 3)), replace=False):
+                rows.append({
+                    "user_id": int(user_id),
+                    "industry_id": int(industry_id),
+                    "years_experience": int(self.rng.integers(0, 15)),
+                    "is_current": bool(self.rng.random() < 0.5),
+                    "position_level": self._pick(POSITION_LEVELS)
+                })
+        self._insert(UserIndustryExperience, rows)
+
+    def _preferences(self) -> None:
+        user_ids = self._all_ids()
+        self._insert(MentoringPreference, [
+            {
+                "user_id": int(user_id),
+                "preferred_style": self._pick(STYLES),
+                "structured_sessions": bool(self.rng.random() < 0.5),
+                "meeting_frequency": int(self.rng.integers(1, 5)),
+                "session_duration": int(self._pick([30, 45, 60])),
+                "goals_focus": float(self.rng.random())
+            }
+            for user_id in user_ids
+        ])
+        # Un 5% de los mentiles excluye explícitamente a algún mentor
+        excluders = self.mentee_ids[self.rng.random(len(self.mentee_ids)) < 0.05]
+        self._insert(MatchPreference, [
+            {
+                "user_id": int(user_id),
+                "language_preferences": self._choice(LANGUAGES, 1),
+                "exclusions": {"user_ids": [int(self.rng.choice(self.mentor_ids))]}
+            }
+            for user_id in excluders
+        ])
+
+    def _goals(self) -> None:
+        rows = []
+        for user_id in self._all_ids():
+            for category in self._choice(GOAL_CATEGORIES, int(self.rng.integers(1, 4))):
+                rows.append({
+                    "user_id": int(user_id),
+                    "title": f"{category} goal",
+                    "timeline_months": int(self.rng.integers(1, 13)),
+                    "priority": int(self.rng.integers(1, 6)),
+                    "category": category,
+                    "status": "pending"
+                })
+        self._insert(MentorshipGoal, rows)
+
+    # ------------------------------------------------------------------
+    # Historial: matches, sesiones y feedback
+    # ------------------------------------------------------------------
+
+    def _history(self) -> None:
+        """
+        Un match previo para la mitad de los mentiles (activo, rechazado o sugerido), con
+        sesiones y feedback en los activos.
+        """
+        mentees = self.mentee_ids[self.rng.random(len(self.mentee_ids)) < 0.5]
+        mentors = self.rng.choice(self.mentor_ids, size=len(mentees))
+        statuses = self._choice(["active", "rejected", "suggested"], len(mentees))
+        first_match_id = (self.db.query(MatchScore.id).order_by(MatchScore.id.desc()).limit(1).scalar() or 0) + 1
+        first_session_id = (
+            self.db.query(SessionModel.id).order_by(SessionModel.id.desc()).limit(1).scalar() or 0
+        ) + 1
+
+        matches, match_feedback, sessions, session_feedback = [], [], [], []
+        start = datetime(2024, 1, 1, 9, 0)
+        for k, (mentee_id, mentor_id, status) in enumerate(zip(mentees, mentors, statuses)):
+            match_id = first_match_id + k
+            matches.append({
+                "id": match_id,
+                "mentor_id": int(mentor_id),
+                "mentee_id": int(mentee_id),
+                "total_score": float(self.rng.random()),
+                "status": status
+            })
+            if status != "active":
+                continue
+            for user_id in (mentee_id, mentor_id):
+                match_feedback.append({"match_id": match_id, "user_id": int(user_id),
+                                       "rating": int(self.rng.integers(1, 6))})
+            for week in range(int(self.rng.integers(1, 4))):
+                session_id = first_session_id + len(sessions)
+                session_start = start + timedelta(days=7 * week + int(self.rng.integers(0, 90)))
+                sessions.append({
+                    "id": session_id,
+                    "mentor_id": int(mentor_id),
+                    "mentee_id": int(mentee_id),
+                    "start_time": session_start,
+                    "end_time": session_start + timedelta(hours=1),
+                    "status": "completed"
+                })
+                session_feedback.append({"session_id": session_id, "rating": int(self.rng.integers(1, 6)),
+                                         "created_by": int(mentee_id)})
+
+        self._insert(MatchScore, matches)
+        self._insert(MatchFeedback, match_feedback)
+        self._insert(SessionModel, sessions)
+        self._insert(SessionFeedback, session_feedback)
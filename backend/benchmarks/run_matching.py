@@ -0,0 +1,282 @@
+"""
+Banco de pruebas de los puntos de entrada del emparejamiento.
+
+Para cada escala crea una población sintética y mide, para una muestra fija de usuarios,
+cada punto de entrada: tiempo de la primera llamada (cachés frías) y de la repetición
+(cachés calientes), consultas SQL por llamada y pico de memoria. El informe JSON incluye el
+commit actual para poder comparar ejecuciones:
+
+    python -m benchmarks.run_matching --scales 1000,10000 --output report.json
+    python -m benchmarks.run_matching --scales 1000 --compare report.json
+    python -m benchmarks.run_matching --scales 10000 --wide-slots 200
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import User
+from app.models.base import Base
+from app.services.skill_index import skill_index
+from benchmarks.population import PopulationGenerator
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmark.db"
+
+
+# ----------------------------------------------------------------------
+# Puntos de entrada. Los servicios se importan dentro de cada función para que un
+# módulo roto se registre como error de ese punto y no detenga el banco completo.
+# ----------------------------------------------------------------------
+
+def _find_matches_for_mentee(db: Session, user: User):
+    from app.services.matchmaking import MatchmakingService
+    return MatchmakingService.find_matches_for_mentee(user.id, db, limit=5)
+
+
+def _find_matches_for_mentor(db: Session, user: User):
+    from app.services.matchmaking import MatchmakingService
+    return MatchmakingService.find_matches_for_mentor(user.id, db, limit=5)
+
+
+def _generate_matches(db: Session, user: User):
+    from app.services.matching_algorithm import MatchingAlgorithm
+    return MatchingAlgorithm(db).generate_matches(user, limit=5)
+
+
+def _get_suggestions(db: Session, user: User):
+    from app.services.matching import MatchingService
+    return MatchingService(db).get_suggestions(user, limit=5)
+
+
+# Nombre -> (rol del usuario de la muestra, función)
+ENTRY_POINTS: Dict[str, tuple] = {
+    "matchmaking.find_matches_for_mentee": ("mentee", _find_matches_for_mentee),
+    "matchmaking.find_matches_for_mentor": ("mentor", _find_matches_for_mentor),
+    "matching_algorithm.generate_matches": ("mentee", _generate_matches),
+    "matching.get_suggestions": ("mentee", _get_suggestions),
+}
+
+
+class QueryCounter:
+    """Cuenta las sentencias SQL ejecutadas sobre un engine."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        "mean": round(float(array.mean()), 3),
+        "p50": round(float(np.percentile(array, 50)), 3),
+        "p95": round(float(np.percentile(array, 95)), 3),
+        "max": round(float(array.max()), 3)
+    }
+
+
+def measure(db: Session, counter: QueryCounter, function: Callable, users: List[User]) -> Dict:
+    """
+    Llama a `function` dos veces por usuario (fría y caliente) midiendo tiempo y consultas, y
+    una tercera vez bajo tracemalloc para el pico de memoria; el rastreo ralentiza la llamada,
+    por eso no se mezcla con los tiempos.
+    """
+    timings = {"cold": [], "warm": []}
+    queries = {"cold": [], "warm": []}
+    peaks = []
+    for user in users:
+        for phase in ("cold", "warm"):
+            db.expire_all()
+            before = counter.count
+            started = time.perf_counter()
+            function(db, user)
+            timings[phase].append((time.perf_counter() - started) * 1000)
+            queries[phase].append(counter.count - before)
+
+        db.expire_all()
+        tracemalloc.start()
+        try:
+            function(db, user)
+            peaks.append(tracemalloc.get_traced_memory()[1] / (1024 * 1024))
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "calls": len(users),
+        "cold_ms": _summary(timings["cold"]),
+        "warm_ms": _summary(timings["warm"]),
+        "cold_queries": _summary(queries["cold"]),
+        "warm_queries": _summary(queries["warm"]),
+        "peak_memory_mb": _summary(peaks)
+    }
+
+
+def benchmark_scale(engine, users: int, samples: int = 5, mentor_ratio: float = 0.3, seed: int = 0,
+                    entry_points: Optional[List[str]] = None, wide_slots: int = 0) -> Dict:
+    """Recrea el esquema, genera la población y mide cada punto de entrada sobre ella."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    skill_index.clear()
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        started = time.perf_counter()
+        generator = PopulationGenerator(db, users, mentor_ratio=mentor_ratio, seed=seed, wide_slots=wide_slots)
+        rows = generator.generate()
+        result = {
+            "users": users,
+            "mentors": generator.mentor_count,
+            "mentees": generator.mentee_count,
+            "rows": rows,
+            "generation_seconds": round(time.perf_counter() - started, 3),
+            "entry_points": {}
+        }
+
+        # Muestra fija de usuarios por rol, la misma para todos los puntos de entrada
+        rng = np.random.default_rng(seed)
+        sample_ids = {
+            "mentor": rng.choice(generator.mentor_ids, size=min(samples, generator.mentor_count), replace=False),
+            "mentee": rng.choice(generator.mentee_ids, size=min(samples, generator.mentee_count), replace=False)
+        }
+
+        counter = QueryCounter(engine)
+        for name in entry_points or ENTRY_POINTS:
+            role, function = ENTRY_POINTS[name]
+            sample = db.query(User).filter(User.id.in_(sample_ids[role].tolist())).order_by(User.id).all()
+            try:
+                result["entry_points"][name] = measure(db, counter, function, sample)
+            except Exception as e:
+                db.rollback()
+                result["entry_points"][name] = {"error": f"{type(e).__name__}: {e}"}
+        return result
+    finally:
+        db.close()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(database_url: str, scales: List[int], samples: int = 5, mentor_ratio: float = 0.3, seed: int = 0,
+        entry_points: Optional[List[str]] = None, wide_slots: int = 0) -> Dict:
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    )
+    try:
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "samples": samples,
+            "mentor_ratio": mentor_ratio,
+            "seed": seed,
+            "wide_slots": wide_slots,
+            "scales": [
+                benchmark_scale(engine, users, samples, mentor_ratio, seed, entry_points, wide_slots)
+                for users in scales
+            ]
+        }
+    finally:
+        engine.dispose()
+
+
+def compare(report: Dict, baseline: Dict) -> List[str]:
+    """Líneas con el tiempo medio caliente de cada punto de entrada frente al informe base."""
+    base_scales = {scale["users"]: scale for scale in baseline.get("scales", [])}
+    lines = []
+    for scale in report["scales"]:
+        base = base_scales.get(scale["users"])
+        if base is None:
+            continue
+        for name, current in scale["entry_points"].items():
+            previous = base["entry_points"].get(name)
+            if not previous or "error" in current or "error" in previous:
+                continue
+            before, after = previous["warm_ms"]["mean"], current["warm_ms"]["mean"]
+            ratio = after / before if before else float("inf")
+            lines.append(f"{scale['users']:>7} {name:<40} {before:>10.1f} ms -> {after:>10.1f} ms  x{ratio:.2f}")
+    return lines
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Banco de pruebas del emparejamiento con poblaciones sintéticas")
+    parser.add_argument("--scales", default="1000,10000",
+                        help="Tamaños de población separados por comas (por ejemplo 1000,10000,100000)")
+    parser.add_argument("--samples", type=int, default=5, help="Usuarios medidos por punto de entrada")
+    parser.add_argument("--mentor-ratio", type=float, default=0.3, help="Fracción de mentores en la población")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--wide-slots", type=int, default=0,
+                        help="Franjas de 15 minutos adicionales de un mentor y un mentil (ancho de franjas extremo)")
+    parser.add_argument("--entry-points", help="Puntos de entrada separados por comas (por defecto todos)")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL,
+                        help="Base de datos desechable: su esquema se elimina y se recrea en cada escala")
+    parser.add_argument("--output", help="Archivo JSON con el informe")
+    parser.add_argument("--compare", help="Informe JSON previo con el que comparar")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    entry_points = args.entry_points.split(",") if args.entry_points else None
+    unknown = set(entry_points or ()) - set(ENTRY_POINTS)
+    if unknown:
+        raise SystemExit(f"Puntos de entrada desconocidos: {', '.join(sorted(unknown))}")
+
+    report = run(
+        args.database_url,
+        [int(scale) for scale in args.scales.split(",") if scale.strip()],
+        samples=args.samples,
+        mentor_ratio=args.mentor_ratio,
+        seed=args.seed,
+        entry_points=entry_points,
+        wide_slots=args.wide_slots
+    )
+
+    for scale in report["scales"]:
+        print(f"{scale['users']} usuarios (generación {scale['generation_seconds']} s)")
+        for name, result in scale["entry_points"].items():
+            if "error" in result:
+                print(f"  {name:<40} error: {result['error']}")
+            else:
+                print(f"  {name:<40} fría {result['cold_ms']['mean']:>9.1f} ms  "
+                      f"caliente {result['warm_ms']['mean']:>9.1f} ms  "
+                      f"consultas {result['cold_queries']['mean']:>7.1f}  "
+                      f"memoria {result['peak_memory_mb']['max']:>7.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Informe guardado en {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Comparación con {baseline.get('git_commit')}:")
+        for line in compare(report, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
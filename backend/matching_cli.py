@@ -0,0 +1,160 @@
+import os
+import sys
+import argparse
+import json
+
+# Agregar el directorio actual al path para poder importar los módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+
+
+def parse_ids(value):
+    """Lista de ids separados por comas; vacío = todos."""
+    if not value:
+        return None
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def assign_cohort(db, args):
+    from app.services.cohort_assignment import CohortAssignmentService
+
+    result = CohortAssignmentService(db).assign(
+        mentee_ids=parse_ids(args.mentees),
+        mentor_ids=parse_ids(args.mentors),
+        min_score=args.min_score,
+        persist=not args.dry_run
+    )
+    print(f"Mentiles asignados: {len(result['assignments'])} de {result['mentee_count']}")
+    print(f"Puntuación total: {result['total_score']:.4f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Resultado guardado en {args.output}")
+
+
+def reconcile_success(db, args):
+    from app.services.mentor_success import MentorSuccessService
+
+    result = MentorSuccessService(db).reconcile()
+    print(f"Mentores reconciliados: {result['mentors']}")
+    print(f"Pares rechazados: {result['rejected_pairs']}")
+
+
+def rescore(db, args):
+    from app.core.database import SQLALCHEMY_DATABASE_URL
+    from app.services.rescoring import RescoringJob
+
+    def progress(result):
+        print(f"Fragmento {result['shard']} ({result['done']}/{result['shards']}): "
+              f"{result['mentees']} mentiles, {result['pairs']} pares, {result['elapsed']:.1f} s", flush=True)
+
+    result = RescoringJob(
+        SQLALCHEMY_DATABASE_URL,
+        state_dir=args.state_dir,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        per_mentee=args.per_mentee
+    ).run(resume=args.resume, progress=progress)
+    print(f"Fragmentos: {result['shards']} ({result['skipped']} ya terminados)")
+    print(f"Mentiles repuntuados: {result['mentees']}, pares guardados: {result['pairs']} en {result['seconds']} s")
+
+
+def build_ann_index(db, args):
+    from app.core.config import settings
+    from app.services.profile_embeddings import ProfileEmbeddingIndex
+
+    index = ProfileEmbeddingIndex(n_lists=args.lists)
+    index.build(db)
+    path = args.output or settings.MATCHING_ANN_INDEX_PATH
+    index.save(path)
+    print(f"Mentores indexados: {len(index)} en {len(index.centroids)} listas")
+    print(f"Índice guardado en {path}")
+
+
+def train_weights(db, args):
+    from app.services.learned_weights import WeightArtifactStore, WeightTrainer
+
+    result = WeightTrainer(db, store=WeightArtifactStore(args.directory), min_samples=args.min_samples).train()
+    print(f"Matches históricos: {result['matches']}")
+    print(f"Segmentos ajustados: {result['segments']} ({result['mentor_segments']} de mentores)")
+    print(f"Versión publicada: {result['version']} en {result['seconds']} s")
+
+
+def simulate_weights(db, args):
+    from app.services.weight_simulation import WeightSimulator
+
+    with open(args.weights) as f:
+        weight_sets = json.load(f)
+    simulator = WeightSimulator.from_db(db, args.group_by)
+    result = simulator.simulate(weight_sets, k=args.k)
+    print(f"Pares con resultado: {result['pairs']} en {result['groups']} grupos (tasa base {result['base_rate']:.4f})")
+    print(f"Configuraciones evaluadas: {len(result['results'])} en {result['seconds']:.4f} s")
+    for label, metrics in [("por defecto", result["baseline"])] + [
+        (str(i + 1), metrics) for i, metrics in enumerate(result["results"])
+    ]:
+        print(f"  {label:>11}  precision@{args.k} {metrics['precision_at_k']:.4f}  ndcg@{args.k} {metrics['ndcg_at_k']:.4f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Resultado guardado en {args.output}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Tareas de emparejamiento por lotes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cohort = commands.add_parser("assign-cohort", help="Asignación global de una cohorte con capacidad de mentores")
+    cohort.add_argument("--mentees", help="Ids de mentiles separados por comas (por defecto todos)")
+    cohort.add_argument("--mentors", help="Ids de mentores separados por comas (por defecto todos)")
+    cohort.add_argument("--min-score", type=float, default=0.0, help="Puntuación mínima para asignar un par")
+    cohort.add_argument("--dry-run", action="store_true", help="No guardar los pares en match_scores")
+    cohort.add_argument("--output", help="Archivo JSON con el resultado")
+    cohort.set_defaults(handler=assign_cohort)
+
+    reconcile = commands.add_parser("reconcile-success", help="Recalcular el éxito histórico de los mentores")
+    reconcile.set_defaults(handler=reconcile_success)
+
+    rescoring = commands.add_parser("rescore", help="Repuntuar todos los mentiles en procesos paralelos")
+    rescoring.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos en paralelo")
+    rescoring.add_argument("--shard-size", type=int, default=2000, help="Mentiles por fragmento")
+    rescoring.add_argument("--per-mentee", type=int, default=5, help="Mejores mentores guardados por mentil")
+    rescoring.add_argument("--state-dir", default="./rescoring_state",
+                           help="Directorio con los perfiles proyectados en memoria y el progreso por fragmento")
+    rescoring.add_argument("--resume", action="store_true",
+                           help="Reanudar el último trabajo sin repetir los fragmentos terminados")
+    rescoring.set_defaults(handler=rescore)
+
+    ann = commands.add_parser("build-ann-index", help="Construir el índice aproximado de perfiles de mentores")
+    ann.add_argument("--lists", type=int, help="Listas invertidas (por defecto la raíz del número de mentores)")
+    ann.add_argument("--output", help="Archivo .npz (por defecto MATCHING_ANN_INDEX_PATH)")
+    ann.set_defaults(handler=build_ann_index)
+
+    weights = commands.add_parser("train-weights", help="Aprender los pesos de los componentes del feedback histórico")
+    weights.add_argument("--min-samples", type=int, default=30,
+                         help="Pares con resultado necesarios para ajustar un segmento")
+    weights.add_argument("--directory", help="Directorio de artefactos (por defecto MATCHING_WEIGHTS_DIR)")
+    weights.set_defaults(handler=train_weights)
+
+    simulate = commands.add_parser("simulate-weights", help="Métricas offline de pesos alternativos sobre el historial")
+    simulate.add_argument("weights", help="Archivo JSON con una lista de pesos (campos de match_preferences)")
+    simulate.add_argument("--k", type=int, default=5, help="Longitud de la lista evaluada")
+    simulate.add_argument("--group-by", choices=("mentee", "mentor"), default="mentee",
+                          help="Usuario que recibe la lista")
+    simulate.add_argument("--output", help="Archivo JSON con el resultado")
+    simulate.set_defaults(handler=simulate_weights)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    db = SessionLocal()
+    try:
+        args.handler(db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.core.security import get_current_user
+from app.models import User, Mentor, Mentee
+from app.models.match_algorithm import MatchScore
+from app.services.weighted_ranking import component_matrices
+
+def create_match(test_db: Session) -> MatchScore:
+    test_db.add(User(id=1, email="mentor@example.com", name="Mentor", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentee@example.com", name="Mentee", password_hash="hash", role="mentee"))
+    test_db.add(User(id=3, email="other@example.com", name="Other", password_hash="hash", role="mentee"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=5))
+    test_db.add(Mentee(user_id=2, bio="Test bio", goals="Learn"))
+    test_db.add(Mentee(user_id=3, bio="Test bio", goals="Learn"))
+    match = MatchScore(mentor_id=1, mentee_id=2, total_score=0.7, skill_match_score=0.8, availability_score=0.5,
+                       style_match_score=0.6, goals_alignment_score=0.9, match_details={}, status="suggested")
+    test_db.add(match)
+    test_db.commit()
+    return match
+
+def login_as(test_db: Session, user_id: int) -> None:
+    # get_current_user devuelve el User del token; aquí se sustituye por el usuario indicado
+    user = test_db.query(User).filter(User.id == user_id).first()
+    app.dependency_overrides[get_current_user] = lambda: user
+
+class TestMatchingEndpoints:
+
+    def test_explain_match_as_participant(self, client: TestClient, test_db: Session):
+        match = create_match(test_db)
+        login_as(test_db, 2)
+
+        response = client.get(f"/api/v1/matching/{match.id}/explain")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["match_id"], data["mentor_id"], data["mentee_id"]) == (match.id, 1, 2)
+        assert data["total_score"] == pytest.approx(0.7)
+
+    def test_explain_match_rejects_other_users(self, client: TestClient, test_db: Session):
+        match = create_match(test_db)
+        login_as(test_db, 3)
+
+        response = client.get(f"/api/v1/matching/{match.id}/explain")
+
+        assert response.status_code == 403
+
+    def test_rerank_suggestions_with_request_weights(self, client: TestClient, test_db: Session):
+        create_match(test_db)
+        test_db.add(User(id=4, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+        test_db.add(Mentor(user_id=4, bio="Test bio", experience_years=2))
+        test_db.commit()
+        component_matrices.invalidate(2)
+        login_as(test_db, 2)
+
+        response = client.post("/api/v1/matching/suggestions/rerank",
+                               json={"weights": {"skill_weight": 1.0}, "limit": 5})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert sorted(match["mentor_id"] for match in data) == [1, 4]
+        assert all(match["mentee_id"] == 2 for match in data)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.models.match_algorithm import MatchScore, TopMatch
+from app.services.all_pairs import AllPairsService
+from app.services.batch_scoring import BatchScoringService
+
+def create_profiles(test_db: Session):
+    rng = np.random.default_rng(3)
+    for skill_id in range(1, 5):
+        test_db.add(Skill(id=skill_id, name=f"Skill {skill_id}", category="Programming"))
+    for user_id in range(1, 5):
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor"))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+        for skill_id in rng.choice(4, size=2, replace=False) + 1:
+            test_db.add(MentorSkill(mentor_id=user_id, skill_id=int(skill_id), proficiency_level=int(rng.integers(1, 6))))
+    for user_id in range(5, 12):
+        test_db.add(User(id=user_id, email=f"mentee{user_id}@example.com", name=f"Mentee {user_id}",
+                         password_hash="hash", role="mentee"))
+        test_db.add(Mentee(user_id=user_id, bio="Test bio", goals="Learn programming"))
+        for skill_id in rng.choice(4, size=2, replace=False) + 1:
+            test_db.add(MenteeInterest(mentee_id=user_id, skill_id=int(skill_id), interest_level=int(rng.integers(1, 6))))
+    # Par activo: no debe aparecer en ninguna lista
+    test_db.add(MatchScore(mentor_id=1, mentee_id=5, total_score=0.9, status="active"))
+    test_db.commit()
+
+def reference_top(totals: np.ndarray, ids: np.ndarray, k: int):
+    order = np.argsort(-totals, kind="stable")
+    return [int(ids[i]) for i in order if np.isfinite(totals[i])][:k]
+
+class TestAllPairsService:
+
+    def test_block_top_k_matches_full_matrix(self, test_db: Session):
+        create_profiles(test_db)
+        engine = BatchScoringService(test_db)
+        pool = engine.load_pool()
+        totals = engine.score_totals(pool.mentors, pool.mentees).astype(np.float64)
+        totals[pool.mentees.index[5], pool.mentors.index[1]] = -np.inf
+
+        result = AllPairsService(test_db).compute(k=2, block_size=3)
+        assert result["mentor_count"] == 4 and result["mentee_count"] == 7
+
+        service = AllPairsService(test_db)
+        for i, mentee_id in enumerate(pool.mentees.user_ids):
+            stored = service.top_for_mentee(int(mentee_id))
+            assert [row.mentor_id for row in stored] == reference_top(totals[i], pool.mentors.user_ids, 2)
+            assert [row.rank for row in stored] == list(range(len(stored)))
+        for j, mentor_id in enumerate(pool.mentors.user_ids):
+            stored = service.top_for_mentor(int(mentor_id))
+            assert [row.mentee_id for row in stored] == reference_top(totals[:, j], pool.mentees.user_ids, 2)
+            assert [row.total_score for row in stored] == pytest.approx(
+                sorted(totals[:, j][np.isfinite(totals[:, j])], reverse=True)[:2]
+            )
+
+    def test_recompute_replaces_lists(self, test_db: Session):
+        create_profiles(test_db)
+        service = AllPairsService(test_db)
+
+        service.compute(k=3)
+        result = service.compute(k=1)
+        assert test_db.query(TopMatch).count() == result["rows_written"] == 4 + 7
+        assert all(5 != row.mentee_id for row in service.top_for_mentor(1))
+
+    def test_subset_keeps_other_lists(self, test_db: Session):
+        create_profiles(test_db)
+        service = AllPairsService(test_db)
+        service.compute(k=2)
+        pool = BatchScoringService(test_db).load_pool()
+        mentor_id, other_mentor_id = (int(user_id) for user_id in pool.mentors.user_ids[:2])
+        mentee_id = int(pool.mentees.user_ids[0])
+        before = [row.mentee_id for row in service.top_for_mentor(other_mentor_id)]
+
+        service.compute(k=1, mentor_ids=[mentor_id], mentee_ids=[mentee_id])
+        assert [row.mentee_id for row in service.top_for_mentor(other_mentor_id)] == before
+        assert len(service.top_for_mentor(mentor_id)) <= 1
+
+    def test_compute_leaves_commit_to_caller(self, test_db: Session):
+        create_profiles(test_db)
+
+        AllPairsService(test_db).compute(k=2)
+        assert test_db.query(TopMatch).count() > 0
+        test_db.rollback()
+        assert test_db.query(TopMatch).count() == 0
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User, Availability, AvailabilityBitmap
+from app.services.availability_bitmap import (
+    AvailabilityBitmapService, compile_intervals, overlap_slots, union_slots, jaccard, popcount,
+    to_utc, current_season, week_overlaps, BITMAP_BYTES, WEEK_SLOTS, WEEK_MINUTES, SEASON_WEEKS
+)
+from app.services.batch_scoring import BatchScoringService
+
+class TestAvailabilityBitmap:
+
+    def test_compile_intervals(self):
+        # Lunes 09:00-12:00 -> 12 franjas de 15 minutos
+        bitmap = compile_intervals([(1, 9 * 60, 12 * 60)])
+        assert bitmap.shape == (BITMAP_BYTES,)
+        assert popcount(bitmap) == 12
+
+        bits = np.unpackbits(bitmap)
+        assert bits[96 + 36:96 + 48].all()
+        assert bits.sum() == 12
+
+    def test_interval_wraps_to_next_day(self):
+        # Sábado 23:00-01:00 continúa el domingo (inicio de la semana)
+        bits = np.unpackbits(compile_intervals([(6, 23 * 60, 60)]))
+        assert bits[WEEK_SLOTS - 4:].all()
+        assert bits[:4].all()
+        assert bits.sum() == 8
+
+    def test_overlap_union_and_jaccard(self):
+        mentor = compile_intervals([(1, 9 * 60, 12 * 60), (3, 14 * 60, 17 * 60)])
+        mentee = compile_intervals([(1, 10 * 60, 13 * 60), (5, 14 * 60, 17 * 60)])
+
+        # Solapamiento lunes 10-12 = 8 franjas; unión = 24 + 24 - 8
+        assert overlap_slots(mentor, mentee) == 8
+        assert union_slots(mentor, mentee) == 40
+        assert jaccard(mentor, mentee) == pytest.approx(0.2)
+
+    def test_batch_overlap_in_one_call(self):
+        mentee = compile_intervals([(1, 10 * 60, 13 * 60)])
+        mentors = np.stack([
+            compile_intervals([(1, 9 * 60, 12 * 60)]),
+            compile_intervals([(2, 9 * 60, 12 * 60)]),
+            compile_intervals([]),
+        ])
+        assert list(overlap_slots(mentee, mentors)) == [8, 0, 0]
+        assert list(jaccard(mentee, mentors)) == pytest.approx([8 / 16, 0.0, 0.0])
+
+    def test_service_stores_and_rebuilds_bitmaps(self, test_db: Session):
+        test_db.add(User(id=1, email="mentor@example.com", name="Mentor Test", password_hash="hash", role="mentor"))
+        test_db.add(Availability(user_id=1, day_of_week=1, start_time="09:00", end_time="12:00", recurrence="weekly"))
+        test_db.commit()
+
+        # Una lectura compila en memoria sin escribir
+        service = AvailabilityBitmapService(test_db)
+        assert popcount(service.get_bitmap(1)) == 12
+        assert test_db.query(AvailabilityBitmap).count() == 0
+
+        test_db.add(Availability(user_id=1, day_of_week=2, start_time="09:00", end_time="10:00", recurrence="weekly"))
+        service.rebuild(1)
+        test_db.commit()
+
+        assert popcount(service.get_bitmap(1)) == 16
+        assert test_db.query(AvailabilityBitmap).count() == len(SEASON_WEEKS)
+
+    def test_to_utc_per_season(self):
+        # Lunes 09:00-12:00 en Nueva York: UTC-5 en enero, UTC-4 en julio
+        monday = 1 * 24 * 60
+        assert to_utc([(1, 9 * 60, 12 * 60)], "America/New_York", "january") == [(monday + 14 * 60, monday + 17 * 60)]
+        assert to_utc([(1, 9 * 60, 12 * 60)], "America/New_York", "july") == [(monday + 13 * 60, monday + 16 * 60)]
+        # Sin zona o con una zona desconocida se interpreta en UTC
+        assert to_utc([(1, 9 * 60, 12 * 60)], None) == to_utc([(1, 9 * 60, 12 * 60)], "Mars/Olympus") == [
+            (monday + 9 * 60, monday + 12 * 60)
+        ]
+
+    def test_to_utc_wraps_around_the_week(self):
+        # Sábado 22:00-23:30 en Nueva York es domingo 03:00-04:30 UTC (inicio de la semana)
+        assert to_utc([(6, 22 * 60, 23 * 60 + 30)], "America/New_York") == [(3 * 60, 4 * 60 + 30)]
+        # Domingo 00:30-02:00 en Madrid es sábado 23:30 UTC y cruza el final de la semana
+        start, end = to_utc([(0, 30, 2 * 60)], "Europe/Madrid")[0]
+        assert (start, end) == (WEEK_MINUTES - 30, WEEK_MINUTES + 60)
+        assert week_overlaps(start, end, 0, 30) and not week_overlaps(start, end, 60, 120)
+
+    def test_current_season_follows_dst(self):
+        assert current_season("America/New_York", datetime(2024, 7, 15, tzinfo=timezone.utc)) == "july"
+        assert current_season("America/New_York", datetime(2024, 12, 15, tzinfo=timezone.utc)) == "january"
+        # Hemisferio sur: horario de verano en enero
+        assert current_season("Australia/Sydney", datetime(2024, 12, 15, tzinfo=timezone.utc)) == "january"
+        assert current_season("Australia/Sydney", datetime(2024, 7, 15, tzinfo=timezone.utc)) == "july"
+
+    def test_cross_timezone_pair_scored_in_utc(self, test_db: Session):
+        from app.models import Mentor, Mentee
+        test_db.add(User(id=1, email="mentor@example.com", name="Mentor Test", password_hash="hash",
+                         role="mentor", timezone="Europe/Madrid"))
+        test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=5))
+        test_db.add(User(id=2, email="mentee@example.com", name="Mentee Test", password_hash="hash",
+                         role="mentee", timezone="America/New_York"))
+        test_db.add(Mentee(user_id=2, bio="Test bio", goals="Learn programming"))
+        # 15:00-17:00 en Madrid y 09:00-11:00 en Nueva York son la misma hora en enero (14:00-16:00 UTC)
+        test_db.add(Availability(user_id=1, day_of_week=1, start_time="15:00", end_time="17:00", recurrence="weekly"))
+        test_db.add(Availability(user_id=2, day_of_week=1, start_time="09:00", end_time="11:00", recurrence="weekly"))
+        test_db.commit()
+
+        service = AvailabilityBitmapService(test_db, moment=datetime(2024, 1, 15, tzinfo=timezone.utc))
+        assert overlap_slots(service.get_bitmap(1), service.get_bitmap(2)) == 8
+
+        pool = BatchScoringService(test_db).load_pool([1], [2], fields={"availability"})
+        assert pool.mentors.slot_start[0].tolist() == [AvailabilityBitmapService(test_db).get_intervals(1)[0][0]]
+
+    def test_timezone_change_recompiles(self, test_db: Session):
+        test_db.add(User(id=1, email="mentor@example.com", name="Mentor Test", password_hash="hash", role="mentor"))
+        test_db.add(Availability(user_id=1, day_of_week=1, start_time="09:00", end_time="12:00", recurrence="weekly"))
+        test_db.commit()
+
+        service = AvailabilityBitmapService(test_db, moment=datetime(2024, 1, 15, tzinfo=timezone.utc))
+        assert service.get_intervals(1) == [(24 * 60 + 9 * 60, 24 * 60 + 12 * 60)]
+
+        service.rebuild(1)
+        test_db.commit()
+
+        # Una fila compilada con otra zona se ignora hasta el siguiente rebuild
+        test_db.query(User).filter(User.id == 1).update({User.timezone: "Asia/Tokyo"})
+        test_db.commit()
+        assert service.get_intervals(1) == [(24 * 60, 24 * 60 + 3 * 60)]  # UTC+9: lunes 00:00-03:00 UTC
+        service.rebuild(1)
+        test_db.commit()
+        assert {row.timezone for row in test_db.query(AvailabilityBitmap)} == {"Asia/Tokyo"}
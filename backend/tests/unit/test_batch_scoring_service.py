@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest, Availability
+from app.models.matching import (
+    Industry, UserIndustryExperience, MentoringPreference, MentorshipGoal, MentoringStyle
+)
+from app.services.batch_scoring import BatchScoringService
+from app.services.matchmaking import MatchmakingService
+
+def create_profiles(test_db: Session):
+    # Dos mentores y un mentil
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=8, company="Company A", position="Developer"))
+    test_db.add(Mentor(user_id=2, bio="Test bio", experience_years=3, company="Company B", position="Designer"))
+    test_db.add(Mentee(user_id=3, bio="Test bio", goals="Learn programming", current_position="Student"))
+
+    # Habilidades
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(Skill(id=2, name="JavaScript", category="Programming"))
+    test_db.add(Skill(id=3, name="SQL", category="Database"))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=1, proficiency_level=5))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=2, proficiency_level=3))
+    test_db.add(MentorSkill(mentor_id=2, skill_id=3, proficiency_level=4))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=1, interest_level=5))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=3, interest_level=3))
+
+    # Experiencia en industria del mentor 1 y objetivos del mentil
+    test_db.add(Industry(id=1, name="Software", category="Technical"))
+    test_db.add(UserIndustryExperience(user_id=1, industry_id=1, years_experience=5, is_current=True, position_level="Senior"))
+    test_db.add(MentorshipGoal(user_id=3, title="Backend", timeline_months=12, priority=5, category="Technical"))
+    test_db.add(MentorshipGoal(user_id=3, title="Liderazgo", timeline_months=24, priority=3, category="Leadership"))
+
+    # Preferencias de mentoría
+    test_db.add(MentoringPreference(user_id=1, preferred_style=MentoringStyle.CHALLENGING, structured_sessions=True,
+                                    meeting_frequency=4, session_duration=60))
+    test_db.add(MentoringPreference(user_id=3, preferred_style=MentoringStyle.DIRECTIVE, structured_sessions=True,
+                                    meeting_frequency=2, session_duration=30))
+
+    # Disponibilidad
+    test_db.add(Availability(user_id=1, day_of_week=1, start_time="09:00", end_time="12:00", recurrence="weekly"))
+    test_db.add(Availability(user_id=1, day_of_week=3, start_time="14:00", end_time="17:00", recurrence="weekly"))
+    test_db.add(Availability(user_id=2, day_of_week=5, start_time="09:00", end_time="10:00", recurrence="weekly"))
+    test_db.add(Availability(user_id=3, day_of_week=1, start_time="10:00", end_time="13:00", recurrence="weekly"))
+    test_db.add(Availability(user_id=3, day_of_week=5, start_time="14:00", end_time="17:00", recurrence="weekly"))
+
+    test_db.commit()
+
+class TestBatchScoringService:
+
+    def test_component_scores(self, test_db: Session):
+        create_profiles(test_db)
+
+        engine = BatchScoringService(test_db)
+        pool = engine.load_pool(mentee_ids=[3])
+        scores = engine.score_block(pool.mentors, pool.mentees)
+
+        assert list(pool.mentors.user_ids) == [1, 2]
+        assert scores["total"].shape == (1, 2)
+
+        # Habilidades: (5*5 + 3*0) / (5*5 + 3*5) para el mentor 1 y (3*4) / 40 para el mentor 2
+        assert scores["skills"][0, 0] == pytest.approx(0.625)
+        assert scores["skills"][0, 1] == pytest.approx(0.3)
+
+        # Industria: objetivo "Technical" (0.5 + 0.2 + 0.3) * 5/5, objetivo "Leadership" sin experiencia
+        assert scores["industry"][0, 0] == pytest.approx(0.5)
+        assert scores["industry"][0, 1] == 0
+
+        # Objetivos: (0.4 + 0.3 + 0.3) * 5 / (5 + 3)
+        assert scores["goals"][0, 0] == pytest.approx(0.625)
+
+        # Estilo: compatible (0.4) + misma estructura (0.2) + frecuencia (0.1) + duración (0.1)
+        assert scores["style"][0, 0] == pytest.approx(0.8)
+        assert scores["style"][0, 1] == 0
+
+        # Horario: un par de franjas solapadas / min(2, 2)
+        assert scores["schedule"][0, 0] == pytest.approx(0.5)
+        assert scores["schedule"][0, 1] == 0
+
+    def test_schedule_matches_pairwise_calculation(self, test_db: Session):
+        create_profiles(test_db)
+
+        engine = BatchScoringService(test_db)
+        pool = engine.load_pool(mentee_ids=[3])
+        scores = engine.score_block(pool.mentors, pool.mentees)
+
+        for i, mentor_id in enumerate(pool.mentors.user_ids):
+            expected = MatchmakingService.check_schedule_compatibility(int(mentor_id), 3, test_db)
+            assert scores["schedule"][0, i] == pytest.approx(expected)
+
+    def test_find_matches_for_mentee_uses_batch_scores(self, test_db: Session):
+        create_profiles(test_db)
+        test_db.get(User, 1).languages = [{"code": "EN", "proficiency": "advanced"}, "es"]
+        test_db.commit()
+
+        matches = MatchmakingService.find_matches_for_mentee(3, test_db, limit=1)
+
+        assert len(matches) == 1
+        assert matches[0]["mentor_id"] == 1
+        assert matches[0]["industry_experience"][0]["industry"] == "Software"
+        assert matches[0]["mentoring_style"]["style"] == MentoringStyle.CHALLENGING
+        assert matches[0]["compatibility_scores"]["skills"] == pytest.approx(0.625)
+        assert matches[0]["languages"] == [{"code": "es", "level": 4}, {"code": "en", "level": 3}]
+
+    def test_top_k_is_stable_for_ties(self):
+        totals = np.array([0.2, 0.5, 0.5, 0.1, 0.5])
+        assert list(BatchScoringService.top_k(totals, 2)) == [1, 2]
+        assert list(BatchScoringService.top_k(totals, 10)) == [1, 2, 4, 0, 3]
+
+    def test_schedule_independent_of_pool_width_and_chunking(self, test_db: Session, monkeypatch):
+        create_profiles(test_db)
+        # Un mentil con muchas franjas ensancha los arreglos de franjas de toda la población
+        test_db.add(User(id=4, email="wide@example.com", name="Wide", password_hash="hash", role="mentee"))
+        test_db.add(Mentee(user_id=4, bio="Test bio", goals="Todo", current_position="Student"))
+        for hour in range(8, 20):
+            test_db.add(Availability(user_id=4, day_of_week=1, start_time=f"{hour:02d}:00",
+                                     end_time=f"{hour:02d}:30", recurrence="weekly"))
+        test_db.commit()
+
+        engine = BatchScoringService(test_db)
+        pool = engine.load_pool(mentee_ids=[3, 4])
+        expected = engine.score_block(pool.mentors, pool.mentees)["schedule"]
+
+        # Un mentor por paso y un bloque de un solo mentil (más estrecho que la población)
+        monkeypatch.setattr("app.services.scorers.SLOT_PAIR_BUDGET", 1)
+        for row in range(2):
+            scores = engine.score_block(pool.mentors, pool.mentees.take([row]))
+            assert scores["schedule"][0].tolist() == pytest.approx(expected[row].tolist())
+        # Mentor 1 (lunes 09:00-12:00): franjas de las 09:00, 10:00 y 11:00 / min(2, 12)
+        assert expected[1, 0] == pytest.approx(1.5)
@@ -0,0 +1,64 @@
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import User, Mentor, Mentee, MentorSkill, Availability
+from app.models.match_algorithm import MatchScore, MentorSuccessStats
+from benchmarks.population import PopulationGenerator
+from benchmarks.run_matching import benchmark_scale
+
+class TestPopulationGenerator:
+
+    def test_generates_full_profiles(self, test_db: Session):
+        counts = PopulationGenerator(test_db, 50, mentor_ratio=0.2, seed=1).generate()
+
+        assert test_db.query(Mentor).count() == 10
+        assert test_db.query(Mentee).count() == 40
+        assert counts["users"] == 50
+        assert counts["mentor_skills"] == test_db.query(MentorSkill).count() >= 20
+        assert test_db.query(Availability).count() >= 50
+        # Los mentores con matches activos valorados tienen agregado de éxito
+        rated = test_db.query(MatchScore.mentor_id).filter(MatchScore.status == "active").distinct().count()
+        assert test_db.query(MentorSuccessStats).filter(MentorSuccessStats.rating_count > 0).count() == rated
+
+    def test_same_seed_same_population(self, test_db: Session):
+        PopulationGenerator(test_db, 30, seed=7).generate()
+        first = [(row.mentor_id, row.skill_id, row.proficiency_level) for row in
+                 test_db.query(MentorSkill).order_by(MentorSkill.mentor_id, MentorSkill.skill_id)]
+
+        # Segunda población a continuación: mismos datos desplazados por el número de usuarios
+        PopulationGenerator(test_db, 30, seed=7).generate()
+        second = [(row.mentor_id - 30, row.skill_id, row.proficiency_level) for row in
+                  test_db.query(MentorSkill).filter(MentorSkill.mentor_id > 30)
+                  .order_by(MentorSkill.mentor_id, MentorSkill.skill_id)]
+
+        assert test_db.query(User).count() == 60
+        assert first == second
+
+    def test_wide_slots_leave_the_rest_unchanged(self, test_db: Session):
+        generator = PopulationGenerator(test_db, 20, seed=3, wide_slots=50)
+        generator.generate()
+        wide = {int(generator.mentor_ids[0]), int(generator.mentee_ids[0])}
+
+        # Segunda población con la misma semilla y sin franjas adicionales, ids desplazados en 20
+        PopulationGenerator(test_db, 20, seed=3).generate()
+        counts = dict(test_db.query(Availability.user_id, func.count()).group_by(Availability.user_id))
+
+        for user_id in range(1, 21):
+            assert counts[user_id] == counts[user_id + 20] + (50 if user_id in wide else 0)
+
+class TestBenchmarkHarness:
+
+    def test_benchmark_scale_reports_each_entry_point(self):
+        engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False},
+                               poolclass=StaticPool)
+        entry_points = ["matchmaking.find_matches_for_mentee", "matchmaking.find_matches_for_mentor"]
+
+        result = benchmark_scale(engine, 40, samples=2, entry_points=entry_points)
+
+        assert (result["users"], result["mentors"], result["mentees"]) == (40, 12, 28)
+        assert list(result["entry_points"]) == entry_points
+        for report in result["entry_points"].values():
+            assert report["calls"] == 2
+            assert report["cold_queries"]["mean"] > 0
+            assert report["warm_ms"]["mean"] > 0
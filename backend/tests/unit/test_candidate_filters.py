@@ -0,0 +1,82 @@
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee
+from app.models.match_algorithm import MatchScore, MatchPreference
+from app.models.matching import Industry, UserIndustryExperience
+from app.services.candidate_filters import CandidateFilter
+
+def create_profiles(test_db: Session):
+    mentors = {
+        1: {"languages": ["es", "en"]},
+        2: {"languages": ["en"]},
+        3: {"languages": ["es"], "is_active": False},
+        4: {"languages": ["es"], "max_mentees": 2, "current_mentee_count": 2},
+        5: {"languages": ["es"]},
+        6: {"languages": ["es"]},
+        7: {"languages": None}
+    }
+    for user_id, profile in mentors.items():
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor", languages=profile["languages"],
+                         is_active=profile.get("is_active", True)))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5,
+                           max_mentees=profile.get("max_mentees"),
+                           current_mentee_count=profile.get("current_mentee_count", 0)))
+    test_db.add(User(id=10, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentee(user_id=10, bio="Test bio", goals="Learn programming"))
+
+    # Mentor 5: par rechazado; mentor 6: excluido en las preferencias del mentil
+    test_db.add(MatchScore(mentor_id=5, mentee_id=10, total_score=0.5, status="rejected"))
+    test_db.add(Industry(id=1, name="Software", category="Technical"))
+    test_db.add(UserIndustryExperience(user_id=1, industry_id=1, years_experience=5))
+    test_db.commit()
+
+class TestCandidateFilter:
+
+    def test_default_constraints(self, test_db: Session):
+        create_profiles(test_db)
+
+        assert CandidateFilter.for_user(test_db, 10, "mentor").candidate_ids(test_db) == [1, 2, 6, 7]
+
+    def test_preference_constraints(self, test_db: Session):
+        create_profiles(test_db)
+        test_db.add(MatchPreference(user_id=10, language_preferences=["es"], exclusions={"user_ids": [6]}))
+        test_db.commit()
+
+        candidate_filter = CandidateFilter.for_user(test_db, 10, "mentor")
+        assert candidate_filter.candidate_ids(test_db) == [1]
+        assert candidate_filter.candidate_ids(test_db, restrict_to=[2, 3]) == []
+
+    def test_industry_by_name_or_category(self, test_db: Session):
+        create_profiles(test_db)
+
+        for industries in (["Software"], ["Technical"]):
+            candidate_filter = CandidateFilter(10, "mentor", industries=industries)
+            assert candidate_filter.candidate_ids(test_db) == [1]
+
+    def test_mentee_candidates(self, test_db: Session):
+        create_profiles(test_db)
+
+        assert CandidateFilter.for_user(test_db, 1, "mentee").candidate_ids(test_db) == [10]
+        assert CandidateFilter.for_user(test_db, 5, "mentee").candidate_ids(test_db) == []
+
+    def test_candidate_own_exclusions(self, test_db: Session):
+        create_profiles(test_db)
+        # El mentor 2 excluyó al mentil; el mentor 1 excluyó a otro usuario
+        test_db.add(MatchPreference(user_id=2, exclusions={"user_ids": [10]}))
+        test_db.add(MatchPreference(user_id=1, exclusions={"user_ids": [99]}))
+        test_db.commit()
+
+        assert CandidateFilter.for_user(test_db, 10, "mentor").candidate_ids(test_db) == [1, 6, 7]
+
+    def test_dict_format_languages(self, test_db: Session):
+        create_profiles(test_db)
+        test_db.query(User).filter(User.id == 1).update(
+            {User.languages: [{"code": "EN", "proficiency": 4}, {"code": "de", "proficiency": 2}]}
+        )
+        test_db.query(User).filter(User.id == 2).update({User.languages: [{"code": "fr", "proficiency": 4}]})
+        test_db.add(MatchPreference(user_id=10, language_preferences=["en"]))
+        test_db.commit()
+
+        assert CandidateFilter.for_user(test_db, 10, "mentor").candidate_ids(test_db) == [1]
+        assert CandidateFilter(10, "mentor", languages=["Fr"]).candidate_ids(test_db) == [2]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from app.models.matching import MentoringStyle
+from app.services.categorical import (
+    MENTORING_STYLES, LEARNING_STYLES, CAREER_STAGES, POSITION_LEVELS,
+    LEARNING_STYLE_COMPAT, PREFERRED_STYLE_COMPAT, SENIOR_POSITION, experience_match
+)
+
+# Tablas originales por par, como referencia
+STYLE_COMPATIBILITY = {
+    "directive": {"structured": 0.9, "self_directed": 0.3, "collaborative": 0.6},
+    "collaborative": {"structured": 0.6, "self_directed": 0.8, "collaborative": 0.9},
+    "supportive": {"structured": 0.7, "self_directed": 0.7, "collaborative": 0.8}
+}
+STAGE_EXPERIENCE = {"student": (0, 3), "early-career": (2, 5), "mid-career": (4, 10), "senior": (8, float("inf"))}
+
+def reference_experience(stage, years):
+    if not years or not stage:
+        return 0.5
+    low, high = STAGE_EXPERIENCE.get(stage, (0, float("inf")))
+    return 1.0 if low <= years <= high else 0.5
+
+class TestCategorical:
+
+    def test_encoding_reserves_missing_and_other(self):
+        assert MENTORING_STYLES.encode(MentoringStyle.SUPPORTIVE) == MENTORING_STYLES.encode("supportive")
+        assert MENTORING_STYLES.encode(None) == MENTORING_STYLES.missing
+        assert MENTORING_STYLES.encode("") == MENTORING_STYLES.missing
+        assert MENTORING_STYLES.encode("unknown") == MENTORING_STYLES.other
+        assert LEARNING_STYLES.encode_many(["structured", None]).tolist() == [0, LEARNING_STYLES.missing]
+
+    def test_learning_style_table_matches_reference(self):
+        for mentor_style in ["directive", "collaborative", "supportive", "challenging", None, "other"]:
+            for mentee_style in ["structured", "self_directed", "collaborative", None, "other"]:
+                expected = STYLE_COMPATIBILITY.get(mentor_style, {}).get(mentee_style, 0.5)
+                code = (MENTORING_STYLES.encode(mentor_style), LEARNING_STYLES.encode(mentee_style))
+                assert LEARNING_STYLE_COMPAT[code] == pytest.approx(expected)
+
+    def test_preferred_style_table(self):
+        def compatible(mentee_style, mentor_style):
+            return PREFERRED_STYLE_COMPAT[MENTORING_STYLES.encode(mentee_style), MENTORING_STYLES.encode(mentor_style)]
+
+        assert compatible(MentoringStyle.DIRECTIVE, "challenging") == 1.0
+        assert compatible("collaborative", MentoringStyle.SUPPORTIVE) == 1.0
+        assert compatible("directive", "supportive") == 0.0
+        assert compatible(None, "directive") == 0.0
+
+    def test_experience_match_matches_reference(self):
+        stages = ["student", "early-career", "mid-career", "senior", None, "other"]
+        years = [0, 1, 3, 4, 6, 9, 12, None]
+
+        codes = CAREER_STAGES.encode_many(stages)
+        values = np.array([value or 0 for value in years], dtype=np.float32)
+        matrix = experience_match(codes[:, None], values[None, :])
+
+        for i, stage in enumerate(stages):
+            for j, value in enumerate(years):
+                assert matrix[i, j] == reference_experience(stage, value)
+
+    def test_senior_positions(self):
+        assert SENIOR_POSITION[POSITION_LEVELS.encode_many(["Junior", "Senior", "Lead", "Manager", None])].tolist() == [
+            False, True, True, True, False
+        ]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.models.match_algorithm import MatchScore
+from app.services.cohort_assignment import CohortAssignmentService
+
+def create_profiles(test_db: Session):
+    # Mentor 1 es el preferido de todos pero solo tiene una plaza libre
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=8, max_mentees=2, current_mentee_count=1))
+    test_db.add(Mentor(user_id=2, bio="Test bio", experience_years=3, max_mentees=3, current_mentee_count=0))
+    for user_id in (3, 4, 5):
+        test_db.add(User(id=user_id, email=f"mentee{user_id}@example.com", name=f"Mentee {user_id}",
+                         password_hash="hash", role="mentee"))
+        test_db.add(Mentee(user_id=user_id, bio="Test bio", goals="Learn programming"))
+
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(Skill(id=2, name="SQL", category="Database"))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=1, proficiency_level=5))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=2, proficiency_level=5))
+    test_db.add(MentorSkill(mentor_id=2, skill_id=2, proficiency_level=3))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=1, interest_level=5))
+    test_db.add(MenteeInterest(mentee_id=4, skill_id=1, interest_level=5))
+    test_db.add(MenteeInterest(mentee_id=4, skill_id=2, interest_level=5))
+    test_db.add(MenteeInterest(mentee_id=5, skill_id=2, interest_level=5))
+    test_db.commit()
+
+class TestCohortAssignmentService:
+
+    def test_solve_respects_capacity_and_maximizes_total(self):
+        totals = np.array([
+            [0.9, 0.8, 0.1],
+            [0.8, 0.1, 0.0],
+            [0.7, 0.6, 0.5],
+        ])
+        mentee_rows, mentor_rows = CohortAssignmentService.solve(totals, np.array([1, 1, 1]))
+
+        # El óptimo global no es el voraz (0 -> 0): 0 -> 1, 1 -> 0, 2 -> 2
+        assert dict(zip(mentee_rows.tolist(), mentor_rows.tolist())) == {0: 1, 1: 0, 2: 2}
+
+    def test_solve_leaves_mentees_unassigned_when_capacity_runs_out(self):
+        totals = np.array([[0.9, 0.2], [0.8, 0.0], [0.7, 0.0]])
+        mentee_rows, mentor_rows = CohortAssignmentService.solve(totals, np.array([2, 0]))
+
+        assert sorted(mentee_rows.tolist()) == [0, 1]
+        assert mentor_rows.tolist() == [0, 0]
+
+    def test_solve_applies_min_score(self):
+        totals = np.array([[0.9], [0.3]])
+        mentee_rows, _ = CohortAssignmentService.solve(totals, np.array([2]), min_score=0.5)
+        assert mentee_rows.tolist() == [0]
+
+    def test_assign_writes_match_scores(self, test_db: Session):
+        create_profiles(test_db)
+
+        result = CohortAssignmentService(test_db).assign()
+
+        pairs = {(a["mentor_id"], a["mentee_id"]) for a in result["assignments"]}
+        assert len(pairs) == 3
+        assert sum(1 for mentor_id, _ in pairs if mentor_id == 1) == 1
+        assert result["unassigned_mentee_ids"] == []
+
+        stored = test_db.query(MatchScore).all()
+        assert {(m.mentor_id, m.mentee_id) for m in stored} == pairs
+        assert all(m.status == "suggested" for m in stored)
+        assert stored[0].match_details == {"source": "cohort_assignment"}
+
+    def test_assign_dry_run_does_not_persist(self, test_db: Session):
+        create_profiles(test_db)
+
+        result = CohortAssignmentService(test_db).assign(mentee_ids=[3], persist=False)
+
+        assert result["assignments"][0]["mentor_id"] == 1
+        assert result["total_score"] == pytest.approx(result["assignments"][0]["total_score"])
+        assert test_db.query(MatchScore).count() == 0
@@ -0,0 +1,73 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import User, Mentor, Mentee
+from app.services.batch_scoring import BatchScoringService
+from app.services.language_features import LanguageFeatures, language_features, language_level, parse_languages
+
+def create_profiles(test_db: Session):
+    languages = {
+        1: [{"code": "es", "proficiency": "native"}, {"code": "en", "proficiency": "basic"}],
+        2: [{"code": "EN", "proficiency": "advanced"}],
+        3: ["fr"],
+        4: None
+    }
+    for user_id, value in languages.items():
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor", languages=value))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+    test_db.add(User(id=10, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee",
+                     languages=[{"code": "en", "proficiency": "intermediate"}, {"code": "es", "proficiency": 3}, "fr"]))
+    test_db.add(Mentee(user_id=10, bio="Test bio", goals="Learn programming"))
+    test_db.commit()
+
+class TestLanguageFeatures:
+
+    def test_parse_languages(self):
+        assert language_level("Native") == 4 and language_level(7) == 4 and language_level(None) == 4
+        assert parse_languages([{"code": "en", "proficiency": "basic"}, "EN", {"language": "pt", "proficiency": 2}]) == [
+            ("en", 4), ("pt", 2)
+        ]
+        assert parse_languages(None) == []
+
+    def test_rows_share_vocabulary(self, test_db: Session, monkeypatch):
+        create_profiles(test_db)
+        monkeypatch.setattr(settings, "MATCHING_LANGUAGE_FEATURES_ENABLED", True)
+        features = LanguageFeatures()
+        features.build(test_db)
+
+        codes, levels = features.rows(test_db, [2, 10, 99])
+        assert codes[0, 0] == codes[1, 2] == features.codes["en"]  # mentil: fr, es, en por nivel
+        assert levels.tolist()[0] == [3, 0, 0, 0] and (codes[2] == -1).all()
+
+        features.set_languages(2, ["de"])
+        assert features.rows(test_db, [2])[0][0, 0] == features.codes["de"]
+
+    def test_users_created_after_build(self, test_db: Session, monkeypatch):
+        create_profiles(test_db)
+        monkeypatch.setattr(settings, "MATCHING_LANGUAGE_FEATURES_ENABLED", True)
+        features = LanguageFeatures()
+        features.build(test_db)
+
+        test_db.add(User(id=11, email="new@example.com", name="New", password_hash="hash", role="mentee",
+                         languages=[{"code": "PT", "proficiency": "intermediate"}]))
+        test_db.commit()
+
+        codes, levels = features.rows(test_db, [11])
+        assert codes[0, 0] == features.codes["pt"] and levels[0, 0] == 2
+        assert 11 in features.rows_by_user
+
+    def test_best_common_language(self, test_db: Session, monkeypatch):
+        create_profiles(test_db)
+        # es: min(4, 3); en: min(3, 2); fr: sin nivel cuenta como nativo; sin idiomas: 0
+        expected = [[3 / 4, 2 / 4, 1.0, 0.0]]
+        scores = BatchScoringService(test_db).score_ids([1, 2, 3, 4], [10])["language"]
+        assert np.allclose(scores, expected)
+
+        monkeypatch.setattr(settings, "MATCHING_LANGUAGE_FEATURES_ENABLED", True)
+        language_features.clear()
+        try:
+            assert np.allclose(BatchScoringService(test_db).score_ids([1, 2, 3, 4], [10])["language"], expected)
+        finally:
+            language_features.clear()
@@ -0,0 +1,103 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.models.match_algorithm import MatchScore, MatchFeedback
+from app.services.match_history import MatchHistory
+from app.core.config import settings
+from app.services.feedback_analysis import FeedbackAnalysisService
+from app.services.learned_weights import LearnedWeights, WeightArtifactStore, WeightTrainer, learned_weights
+
+def create_history(test_db: Session, seed: int = 0, count: int = 120):
+    """Pares cuyo éxito depende sobre todo de las habilidades y algo del horario."""
+    rng = np.random.default_rng(seed)
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    for i in range(count):
+        mentee_id = 100 + i
+        test_db.add(User(id=mentee_id, email=f"mentee{i}@example.com", name=f"Mentee {i}",
+                         password_hash="hash", role="mentee"))
+        skills, schedule, style, goals = rng.random(4)
+        success = 3 * skills + schedule + rng.normal(0, 0.3) > 2
+        mentor_id = 1 if i % 4 else 2
+        test_db.add(MatchScore(
+            id=i + 1, mentor_id=mentor_id, mentee_id=mentee_id, total_score=0.5,
+            skill_match_score=skills, availability_score=schedule, style_match_score=style,
+            goals_alignment_score=goals, status="active" if success else "rejected"
+        ))
+        if i % 3 == 0:
+            test_db.add(MatchFeedback(match_id=i + 1, user_id=mentee_id, rating=5 if success else 2))
+    test_db.commit()
+
+class TestLearnedWeights:
+
+    def test_history_labels(self, test_db: Session):
+        test_db.add(MatchScore(id=1, mentor_id=1, mentee_id=3, skill_match_score=0.9, status="active"))
+        test_db.add(MatchScore(id=2, mentor_id=1, mentee_id=4, status="suggested"))
+        test_db.add(MatchScore(id=3, mentor_id=2, mentee_id=3, status="rejected"))
+        test_db.add(MatchFeedback(match_id=1, user_id=1, rating=2))
+        test_db.add(MatchFeedback(match_id=1, user_id=3, rating=5))
+        test_db.add(MatchFeedback(match_id=2, user_id=4, rating=4))
+        test_db.commit()
+
+        history = MatchHistory.load(test_db)
+        assert history.components[0].tolist() == [np.float32(0.9), 0, 0, 0]
+        assert history.rating_counts.tolist() == [[1, 1], [0, 1], [0, 0]]
+        # Media 3.5 -> fracaso; el mentil sí lo valora bien; sin valoración cuenta el estado
+        assert history.labels().tolist() == [0, 1, 0]
+        assert history.labels("mentee").tolist() == [1, 1, 0]
+        assert history.labels("mentor").tolist() == [0, -1, 0]
+
+    def test_training_publishes_versioned_segments(self, test_db: Session, tmp_path):
+        create_history(test_db)
+        store = WeightArtifactStore(str(tmp_path))
+        result = WeightTrainer(test_db, store=store, min_samples=30).train()
+
+        assert result["version"] == 1 and store.current_version() == 1
+        segments = store.load()["segments"]
+        assert {"global", "role:mentee", "role:mentor", "mentor:1"} <= set(segments)
+        weights = segments["global"]["weights"]
+        assert np.isclose(sum(weights.values()), 1.0)
+        assert weights["skill_weight"] == max(weights.values())
+        assert weights["skill_weight"] > weights["availability_weight"] > 0
+
+    def test_hot_reload_and_segment_fallback(self, test_db: Session, tmp_path):
+        store = WeightArtifactStore(str(tmp_path))
+        weights = LearnedWeights(store, reload_interval=0)
+        assert weights.for_user(1, "mentor") is None
+
+        uniform = {"skill_weight": 0.25, "availability_weight": 0.25, "style_weight": 0.25, "goals_weight": 0.25}
+        store.publish({"segments": {"global": {"weights": uniform}}})
+        assert weights.for_user(1, "mentor") == uniform and weights.version == 1
+
+        skills = dict(uniform, skill_weight=0.7, goals_weight=0.0)
+        store.publish({"segments": {"global": {"weights": uniform}, "mentor:1": {"weights": skills}}})
+        assert weights.for_user(1, "mentor") == skills and weights.version == 2
+        assert weights.for_user(5, "mentee") == uniform
+        assert np.isclose(weights.vector(1, "mentor").sum(), 1.0)
+
+    def test_bad_artifact_keeps_loaded_segments(self, tmp_path):
+        store = WeightArtifactStore(str(tmp_path))
+        weights = LearnedWeights(store, reload_interval=0)
+        uniform = {"skill_weight": 0.25, "availability_weight": 0.25, "style_weight": 0.25, "goals_weight": 0.25}
+        store.publish({"segments": {"global": {"weights": uniform}}})
+        assert weights.for_user(1, "mentee") == uniform
+
+        # CURRENT apunta a una versión que no existe y después a una a medio escribir
+        (tmp_path / "CURRENT").write_text("7")
+        assert weights.for_user(1, "mentee") == uniform and weights.version == 1
+        (tmp_path / "weights-v000007.json").write_text("{")
+        assert weights.for_user(1, "mentee") == uniform and weights.version == 1
+
+    def test_feedback_weights_follow_setting(self, test_db: Session, tmp_path, monkeypatch):
+        store = WeightArtifactStore(str(tmp_path))
+        skills = {"skill_weight": 0.7, "availability_weight": 0.1, "style_weight": 0.1, "goals_weight": 0.1}
+        store.publish({"segments": {"global": {"weights": skills}}})
+        monkeypatch.setattr(learned_weights, "store", store)
+        learned_weights.clear()
+
+        monkeypatch.setattr(settings, "MATCHING_LEARNED_WEIGHTS_ENABLED", False)
+        assert FeedbackAnalysisService(test_db).update_matching_weights(5) != skills
+        monkeypatch.setattr(settings, "MATCHING_LEARNED_WEIGHTS_ENABLED", True)
+        assert FeedbackAnalysisService(test_db).update_matching_weights(5) == skills
+        learned_weights.clear()
@@ -0,0 +1,48 @@
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.models.match_algorithm import MatchScore, MatchPreference
+from app.services.match_exclusions import MatchExclusions
+from app.services.matchmaking import MatchmakingService
+
+def create_profiles(test_db: Session):
+    for user_id in (1, 2, 3):
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor"))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+        test_db.add(MentorSkill(mentor_id=user_id, skill_id=1, proficiency_level=5))
+    test_db.add(User(id=4, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentee(user_id=4, bio="Test bio", goals="Learn programming"))
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(MenteeInterest(mentee_id=4, skill_id=1, interest_level=5))
+
+    # Mentor 1 ya tiene un match activo y el mentil excluye al mentor 2
+    test_db.add(MatchScore(mentor_id=1, mentee_id=4, total_score=0.9, status="active"))
+    test_db.add(MatchPreference(user_id=4, exclusions={"user_ids": [2]}))
+    test_db.commit()
+
+class TestMatchExclusions:
+
+    def test_load_for_user(self, test_db: Session):
+        create_profiles(test_db)
+
+        exclusions = MatchExclusions.load_for_user(test_db, 4)
+
+        assert exclusions.excludes(1, 4)
+        assert exclusions.excludes(2, 4)
+        assert not exclusions.excludes(3, 4)
+        assert exclusions.mask([1, 2, 3], [4]).tolist() == [[True, True, False]]
+
+    def test_suggested_pairs_are_not_excluded(self, test_db: Session):
+        create_profiles(test_db)
+        test_db.add(MatchScore(mentor_id=3, mentee_id=4, total_score=0.5, status="suggested"))
+        test_db.commit()
+
+        assert not MatchExclusions.load_for_users(test_db, [1, 2, 3], [4]).excludes(3, 4)
+
+    def test_matchmaking_skips_excluded_mentors(self, test_db: Session):
+        create_profiles(test_db)
+
+        matches = MatchmakingService.find_matches_for_mentee(4, test_db, limit=5)
+
+        assert [match["mentor_id"] for match in matches] == [3]
@@ -0,0 +1,36 @@
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest, Availability
+from app.services.match_explanations import MatchExplainer
+
+def create_profiles(test_db: Session):
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=5))
+    test_db.add(Mentor(user_id=2, bio="Test bio", experience_years=3))
+    test_db.add(Mentee(user_id=3, bio="Test bio", goals="Learn programming"))
+
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(Skill(id=2, name="SQL", category="Database"))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=1, proficiency_level=5))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=2, proficiency_level=4))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=1, interest_level=5))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=2, interest_level=3))
+
+    test_db.add(Availability(user_id=1, day_of_week=1, start_time="09:00", end_time="12:00", recurrence="weekly"))
+    test_db.add(Availability(user_id=3, day_of_week=1, start_time="10:00", end_time="13:00", recurrence="weekly"))
+    test_db.commit()
+
+class TestMatchExplainer:
+
+    def test_explain_pairs(self, test_db: Session):
+        create_profiles(test_db)
+
+        explanations = MatchExplainer(test_db).explain_pairs([(1, 3), (2, 3)])
+
+        assert explanations[0] == {"matching_skills": ["Python", "SQL"], "matching_availability": 2.0}
+        assert explanations[1] == {"matching_skills": [], "matching_availability": 0.0}
+
+    def test_empty_pairs(self, test_db: Session):
+        assert MatchExplainer(test_db).explain_pairs([]) == []
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.models.match_algorithm import MatchScore
+from app.services.match_store import upsert_match_scores, load_match_scores, _upsert_generic
+
+def create_users(test_db: Session):
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.commit()
+
+def suggestion(mentor_id: int, score: float):
+    return {
+        "mentor_id": mentor_id,
+        "mentee_id": 3,
+        "total_score": score,
+        "skill_match_score": score,
+        "availability_score": 0.0,
+        "style_match_score": 0.0,
+        "goals_alignment_score": 0.0,
+        "match_details": {"matching_skills": []},
+        "status": "suggested"
+    }
+
+class TestMatchStore:
+
+    def test_upsert_inserts_then_updates(self, test_db: Session):
+        create_users(test_db)
+
+        first = upsert_match_scores(test_db, [suggestion(1, 0.5), suggestion(2, 0.4)])
+        test_db.commit()
+        second = upsert_match_scores(test_db, [suggestion(2, 0.9), suggestion(1, 0.7)])
+        test_db.commit()
+
+        # Mismos ids en el orden de entrada y una sola fila por par
+        assert second == [first[1], first[0]]
+        assert test_db.query(MatchScore).count() == 2
+        assert [m.total_score for m in load_match_scores(test_db, second)] == pytest.approx([0.9, 0.7])
+
+    def test_upsert_keeps_existing_status(self, test_db: Session):
+        create_users(test_db)
+        [match_id] = upsert_match_scores(test_db, [suggestion(1, 0.5)])
+        test_db.commit()
+        test_db.query(MatchScore).filter(MatchScore.id == match_id).update({"status": "accepted"})
+        test_db.commit()
+
+        upsert_match_scores(test_db, [suggestion(1, 0.8)])
+        test_db.commit()
+
+        [match] = load_match_scores(test_db, [match_id])
+        assert match.status == "accepted"
+        assert match.total_score == pytest.approx(0.8)
+
+    def test_duplicate_pairs_in_one_call(self, test_db: Session):
+        create_users(test_db)
+        ids = upsert_match_scores(test_db, [suggestion(1, 0.5), suggestion(1, 0.6)])
+        test_db.commit()
+
+        assert ids[0] == ids[1]
+        assert load_match_scores(test_db, ids[:1])[0].total_score == pytest.approx(0.6)
+
+    def test_generic_fallback(self, test_db: Session):
+        create_users(test_db)
+        [match_id] = upsert_match_scores(test_db, [suggestion(1, 0.5)])
+        test_db.commit()
+
+        ids = _upsert_generic(test_db, [suggestion(1, 0.3), suggestion(2, 0.2)], ("total_score",))
+        test_db.commit()
+
+        assert ids[(1, 3)] == match_id
+        assert test_db.query(MatchScore).count() == 2
+        assert load_match_scores(test_db, [match_id])[0].total_score == pytest.approx(0.3)
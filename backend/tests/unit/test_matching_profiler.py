@@ -0,0 +1,66 @@
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.core.profiling import ProfilerMetrics, profile_scope, profiled, install_query_counter
+from app.services.matchmaking import MatchmakingService
+
+def create_profiles(test_db: Session):
+    for user_id in (1, 2):
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor"))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+        test_db.add(MentorSkill(mentor_id=user_id, skill_id=1, proficiency_level=user_id + 2))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentee(user_id=3, bio="Test bio", goals="Learn programming"))
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=1, interest_level=5))
+    test_db.commit()
+
+class TestMatchingProfiler:
+
+    def test_records_components_and_queries(self, test_db: Session):
+        create_profiles(test_db)
+        install_query_counter()
+
+        with profile_scope() as profile:
+            MatchmakingService.find_matches_for_mentee(3, test_db, limit=5)
+
+        components = profile.as_dict()
+        skills = components["scorers.skills"]
+        load = components["batch_scoring.BatchScoringService.load_pool"]
+        assert skills["calls"] == 1 and skills["queries"] == 0
+        assert load["queries"] > 0
+        assert profile.queries >= sum(component["queries"] for component in components.values())
+
+    def test_nothing_recorded_without_scope(self, test_db: Session):
+        create_profiles(test_db)
+        calls = []
+
+        @profiled("component")
+        def component():
+            calls.append(1)
+            return 42
+
+        assert component() == 42
+        with profile_scope() as profile:
+            component()
+            component()
+
+        assert len(calls) == 3
+        assert profile.as_dict()["component"]["calls"] == 2
+
+    def test_metrics_aggregate_requests(self):
+        metrics = ProfilerMetrics()
+        for _ in range(2):
+            with profile_scope() as profile:
+                profile.record("skills", 0.002)
+                profile.record("skills", 0.001)
+            metrics.record(profile)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["requests"] == 2
+        assert snapshot["components"]["skills"]["calls"] == 4
+        assert snapshot["components"]["skills"]["mean_ms_per_request"] == 3.0
+
+        metrics.reset()
+        assert metrics.snapshot() == {"requests": 0, "components": {}}
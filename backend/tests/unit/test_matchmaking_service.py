@@ -48,7 +48,8 @@ class TestMatchmakingService:
         # El mentil está interesado en Python (5) y SQL (3)
         # El mentor es experto en Python (5) y no conoce SQL (0)
         # Compatibilidad esperada: (5*5 + 3*0) / (5*5 + 3*5) = 25 / 40 = 0.625
-        assert compatibility == pytest.approx(0.625, 0.01)
+        assert compatibility["skills_compatibility"] == pytest.approx(0.625, 0.01)
+        assert compatibility["total"] == pytest.approx(0.25 * compatibility["skills_compatibility"], 0.01)
     
     def test_check_schedule_compatibility(self, test_db: Session):
         # Crear usuarios de prueba
@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.services.matchmaking import MatchmakingService
+
+def create_profiles(test_db: Session):
+    # Un mentor y siete mentiles con distinto grado de coincidencia
+    test_db.add(User(id=1, email="mentor@example.com", name="Mentor", password_hash="hash", role="mentor"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=5))
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(Skill(id=2, name="SQL", category="Database"))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=1, proficiency_level=5))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=2, proficiency_level=2))
+    for user_id in range(2, 9):
+        test_db.add(User(id=user_id, email=f"mentee{user_id}@example.com", name=f"Mentee {user_id}",
+                         password_hash="hash", role="mentee"))
+        test_db.add(Mentee(user_id=user_id, bio="Test bio", goals="Learn programming"))
+        test_db.add(MenteeInterest(mentee_id=user_id, skill_id=1 + user_id % 2, interest_level=1 + user_id % 5))
+    test_db.commit()
+
+class TestMatchmakingStream:
+
+    def test_stream_matches_batch_result(self, test_db: Session):
+        create_profiles(test_db)
+
+        events = list(MatchmakingService.stream_matches_for_mentor(1, test_db, limit=3, chunk_size=2))
+        expected = MatchmakingService.find_matches_for_mentor(1, test_db, limit=3)
+
+        # Cuatro bloques de candidatos y el evento final
+        assert [event["event"] for event in events] == ["progress"] * 4 + ["done"]
+        assert [event["scored"] for event in events] == [2, 4, 6, 7, 7]
+        assert events[-1]["matches"] == expected
+
+    def test_progress_is_sorted_and_bounded(self, test_db: Session):
+        create_profiles(test_db)
+
+        for event in MatchmakingService.stream_matches_for_mentor(1, test_db, limit=2, chunk_size=3):
+            totals = [match["total_score"] for match in event["matches"]]
+            assert len(totals) <= 2
+            assert totals == sorted(totals, reverse=True)
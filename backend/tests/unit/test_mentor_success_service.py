@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User
+from app.models.match_algorithm import MatchScore, MatchFeedback, MentorSuccessStats, PairRejectionStats
+from app.services.mentor_success import MentorSuccessService
+
+def create_matches(test_db: Session):
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(MatchScore(id=1, mentor_id=1, mentee_id=3, total_score=0.8, status="active"))
+    test_db.add(MatchScore(id=2, mentor_id=2, mentee_id=3, total_score=0.6, status="rejected"))
+    test_db.add(MatchFeedback(match_id=1, user_id=3, rating=4))
+    test_db.add(MatchFeedback(match_id=1, user_id=1, rating=5))
+    test_db.commit()
+
+class TestMentorSuccessService:
+
+    def test_incremental_updates(self, test_db: Session):
+        create_matches(test_db)
+        service = MentorSuccessService(test_db)
+
+        service.record_feedback(1, 4)
+        service.record_feedback(1, 5)
+        service.record_status_change(2, 3, "suggested", "rejected")
+        test_db.commit()
+
+        assert list(service.historical_success([1, 2])) == pytest.approx([0.9, 0.5])
+        assert service.pair_rejections(3) == {2: 1}
+
+        # Aceptar un match rechazado descuenta el rechazo
+        service.record_status_change(2, 3, "rejected", "accepted")
+        test_db.commit()
+        assert service.pair_rejections(3) == {}
+
+    def test_unchanged_status_is_ignored(self, test_db: Session):
+        create_matches(test_db)
+        service = MentorSuccessService(test_db)
+
+        service.record_status_change(2, 3, "rejected", "rejected")
+        service.record_status_change(2, 3, "suggested", "accepted")
+        test_db.commit()
+
+        assert test_db.query(PairRejectionStats).count() == 0
+
+    def test_reconcile_rebuilds_from_source_tables(self, test_db: Session):
+        create_matches(test_db)
+        service = MentorSuccessService(test_db)
+
+        # Agregado desviado que la reconciliación debe corregir
+        test_db.add(MentorSuccessStats(mentor_id=1, rating_sum=1, rating_count=1, rejection_count=3))
+        test_db.commit()
+
+        assert service.reconcile() == {"mentors": 2, "rejected_pairs": 1}
+
+        stats = {row.mentor_id: row for row in test_db.query(MentorSuccessStats)}
+        assert (stats[1].rating_sum, stats[1].rating_count, stats[1].rejection_count) == (9, 2, 0)
+        assert stats[2].rejection_count == 1
+        assert list(service.historical_success([1, 2])) == pytest.approx([0.9, 0.5])
+        assert service.pair_rejections(2) == {3: 1}
@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.models.match_algorithm import PairScore, ProfileVersion
+from app.services.batch_scoring import BatchScoringService
+from app.services.pair_score_cache import PairScoreCache, bump_profile_version
+
+def create_profiles(test_db: Session):
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=8))
+    test_db.add(Mentor(user_id=2, bio="Test bio", experience_years=3))
+    test_db.add(Mentee(user_id=3, bio="Test bio", goals="Learn programming"))
+
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=1, proficiency_level=5))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=1, interest_level=5))
+    test_db.commit()
+
+class CountingScorer:
+    # Registra qué pares se vuelven a puntuar
+    def __init__(self, db: Session):
+        self.engine = BatchScoringService(db)
+        self.calls = []
+
+    def __call__(self, mentor_ids, mentee_ids):
+        self.calls.append((list(mentor_ids), list(mentee_ids)))
+        return self.engine.score_ids(mentor_ids, mentee_ids)
+
+class TestPairScoreCache:
+
+    def test_scores_are_cached(self, test_db: Session):
+        create_profiles(test_db)
+        scorer = CountingScorer(test_db)
+        cache = PairScoreCache(test_db)
+
+        first = cache.get_scores([1, 2], [3], scorer)
+        second = cache.get_scores([1, 2], [3], scorer)
+
+        assert scorer.calls == [([1, 2], [3])]
+        assert test_db.query(PairScore).count() == 2
+        np.testing.assert_allclose(first["total"], second["total"])
+        assert second["skills"][0, 0] == pytest.approx(1.0)
+
+    def test_only_changed_users_are_rescored(self, test_db: Session):
+        create_profiles(test_db)
+        scorer = CountingScorer(test_db)
+        cache = PairScoreCache(test_db)
+        cache.get_scores([1, 2], [3], scorer)
+
+        # El mentor 2 añade Python: solo su par se vuelve a puntuar
+        test_db.add(MentorSkill(mentor_id=2, skill_id=1, proficiency_level=3))
+        bump_profile_version(test_db, 2)
+        test_db.commit()
+
+        scores = cache.get_scores([1, 2], [3], scorer)
+
+        assert scorer.calls[-1] == ([2], [3])
+        assert scores["skills"][0, 1] == pytest.approx(0.6)
+        assert test_db.query(ProfileVersion).filter(ProfileVersion.user_id == 2).one().version == 1
+
+    def test_mentee_change_rescores_whole_row(self, test_db: Session):
+        create_profiles(test_db)
+        scorer = CountingScorer(test_db)
+        cache = PairScoreCache(test_db)
+        cache.get_scores([1, 2], [3], scorer)
+
+        bump_profile_version(test_db, 3)
+        bump_profile_version(test_db, 3)
+        test_db.commit()
+        cache.get_scores([1, 2], [3], scorer)
+
+        assert scorer.calls[-1] == ([1, 2], [3])
+        assert test_db.query(PairScore).count() == 2
+        assert {row.mentee_version for row in test_db.query(PairScore)} == {2}
+
+    def test_scorers_are_kept_apart(self, test_db: Session):
+        create_profiles(test_db)
+        scorer = CountingScorer(test_db)
+        PairScoreCache(test_db).get_scores([1], [3], scorer)
+        PairScoreCache(test_db, scorer="suggestions").get_scores([1], [3], scorer)
+
+        assert len(scorer.calls) == 2
+        assert test_db.query(PairScore).count() == 2
+
+    def test_season_change_rescores_pair(self, test_db: Session):
+        create_profiles(test_db)
+        test_db.query(User).filter(User.id == 1).update({User.timezone: "Europe/Madrid"})
+        test_db.commit()
+        scorer = CountingScorer(test_db)
+        winter = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        summer = datetime(2024, 7, 15, tzinfo=timezone.utc)
+
+        PairScoreCache(test_db, moment=winter).get_scores([1, 2], [3], scorer)
+        PairScoreCache(test_db, moment=winter).get_scores([1, 2], [3], scorer)
+        assert len(scorer.calls) == 1
+
+        # Con el horario de verano cambia el horario UTC del mentor 1; el mentor 2 está en UTC
+        PairScoreCache(test_db, moment=summer).get_scores([1, 2], [3], scorer)
+        assert scorer.calls[-1] == ([1], [3])
+        assert test_db.query(PairScore).filter(PairScore.mentor_id == 1).one().mentor_season == "july"
+
+    def test_cache_writes_join_callers_transaction(self, test_db: Session):
+        create_profiles(test_db)
+        scorer = CountingScorer(test_db)
+        PairScoreCache(test_db).get_scores([1, 2], [3], scorer)
+        assert test_db.query(PairScore).count() == 2
+
+        # Sin commit del llamador las filas no se guardan
+        test_db.rollback()
+        assert test_db.query(PairScore).count() == 0
+
+        # Upsert sobre filas existentes y sobre la versión de un usuario nuevo
+        PairScoreCache(test_db).get_scores([1, 2], [3], scorer)
+        bump_profile_version(test_db, 3)
+        bump_profile_version(test_db, 3)
+        PairScoreCache(test_db).get_scores([1, 2], [3], scorer)
+        test_db.commit()
+        assert test_db.query(PairScore).count() == 2
+        assert {row.mentee_version for row in test_db.query(PairScore)} == {2}
@@ -0,0 +1,74 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.models.matching import Industry, UserIndustryExperience, MentorshipGoal
+from app.services.batch_scoring import BatchScoringService
+from app.services.profile_embeddings import ProfileEmbeddingIndex, ProfileEncoder
+from app.services.scorers import PROFILE_SHARE, PROFILE_WEIGHTS
+
+def create_profiles(test_db: Session):
+    for skill_id, name in ((1, "Python"), (2, "SQL")):
+        test_db.add(Skill(id=skill_id, name=name, category="Programming"))
+    test_db.add(Industry(id=1, name="Software", category="Technical"))
+
+    for user_id, levels in ((1, (5, 1)), (2, (1, 5)), (3, (3, 3))):
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor"))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+        for skill_id, level in zip((1, 2), levels):
+            test_db.add(MentorSkill(mentor_id=user_id, skill_id=skill_id, proficiency_level=level))
+    test_db.add(UserIndustryExperience(user_id=1, industry_id=1, years_experience=4, is_current=True))
+
+    test_db.add(User(id=10, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentee(user_id=10, bio="Test bio", goals="Learn programming"))
+    test_db.add(MenteeInterest(mentee_id=10, skill_id=1, interest_level=4))
+    test_db.add(MenteeInterest(mentee_id=10, skill_id=2, interest_level=1))
+    test_db.add(MentorshipGoal(user_id=10, title="Backend", category="Technical", priority=5))
+    test_db.commit()
+
+class TestProfileEmbeddings:
+
+    def test_encoder_reproduces_skill_and_industry_components(self, test_db: Session):
+        create_profiles(test_db)
+        engine = BatchScoringService(test_db)
+        pool = engine.load_pool()
+        scores = engine.score_block(pool.mentors, pool.mentees)
+
+        encoder = ProfileEncoder(pool.skill_ids, pool.categories)
+        mentors = encoder.encode_mentors(pool.mentors, pool.skill_ids, pool.categories)
+        mentees = encoder.encode_mentees(pool.mentees, pool.skill_ids, pool.categories)
+        assert mentors.shape[1] == mentees.shape[1] == encoder.dimension
+
+        skills = slice(0, len(pool.skill_ids))
+        industry = slice(len(pool.skill_ids), len(pool.skill_ids) + len(pool.categories))
+        assert np.allclose(mentees[:, skills] @ mentors[:, skills].T,
+                           scores["skills"] * PROFILE_SHARE * PROFILE_WEIGHTS["skills"])
+        assert np.allclose(mentees[:, industry] @ mentors[:, industry].T,
+                           scores["industry"] * PROFILE_SHARE * PROFILE_WEIGHTS["industry"])
+
+    def test_exhaustive_search_is_exact(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.random((200, 8)).astype(np.float32)
+        index = ProfileEmbeddingIndex(n_lists=10)
+        index.fit(np.arange(100, 300), vectors, ProfileEncoder([], []))
+
+        query = rng.random(8).astype(np.float32)
+        expected = 100 + np.argsort(-(vectors @ query), kind="stable")[:5]
+        assert index.search(query, 5, nprobe=10).tolist() == expected.tolist()
+        assert len(index.search(query, 5, nprobe=1)) == 5
+
+    def test_save_and_load(self, test_db: Session, tmp_path):
+        create_profiles(test_db)
+        index = ProfileEmbeddingIndex(n_lists=2)
+        index.build(test_db)
+        path = str(tmp_path / "index.npz")
+        index.save(path)
+
+        loaded = ProfileEmbeddingIndex()
+        loaded.load(path)
+        assert loaded.user_ids.tolist() == [1, 2, 3]
+        assert loaded.encoder.skill_ids == [1, 2] and loaded.encoder.categories == ["Technical"]
+
+        query = loaded.encode_mentee(test_db, 10)
+        assert loaded.search(query, 1, nprobe=2).tolist() == [1]
@@ -0,0 +1,88 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.batch_scoring import BatchScoringService
+from app.services.pair_score_cache import PairScoreCache
+from app.services.pruned_top_k import PrunedTopK, pruning_stats
+from app.services.scorers import SCORING_PROFILES, scorer_registry
+from benchmarks.population import PopulationGenerator
+
+class TestPrunedTopK:
+
+    def test_schedule_bound_covers_exact_score(self, test_db: Session):
+        PopulationGenerator(test_db, 60, mentor_ratio=0.5, seed=2).generate()
+        engine = BatchScoringService(test_db)
+        pool = engine.load_pool(fields={"availability", "slot_counts"})
+
+        plugin = scorer_registry["schedule_slots"]
+        exact = plugin.score(pool.mentors, pool.mentees)
+        assert (plugin.upper_bound(pool.mentors, pool.mentees) >= exact).all()
+
+    def test_component_weights_sum_to_one(self):
+        weights = SCORING_PROFILES["matchmaking"].component_weights()
+        assert np.isclose(sum(weights.values()), 1.0)
+        assert np.isclose(weights["skills"], 0.7 * 0.25) and np.isclose(weights["schedule"], 0.3)
+
+    def test_same_result_as_exhaustive_scoring(self, test_db: Session, monkeypatch):
+        generator = PopulationGenerator(test_db, 200, mentor_ratio=0.5, seed=3)
+        generator.generate()
+        monkeypatch.setattr(settings, "MATCHING_PRUNING_ENABLED", True)
+        monkeypatch.setattr(settings, "MATCHING_PRUNING_MIN_CANDIDATES", 0)
+        pruning_stats.reset()
+
+        engine = BatchScoringService(test_db)
+        mentor_ids = generator.mentor_ids.tolist()
+        mentee_ids = generator.mentee_ids.tolist()
+        search = PrunedTopK(test_db, chunk_size=8)
+
+        for mentee_id in mentee_ids[:5]:
+            totals = engine.score_ids(mentor_ids, [mentee_id])["total"][0]
+            top, scores = search.search(mentor_ids, [mentee_id], 5, engine.score_ids)
+            assert top.tolist() == BatchScoringService.top_k(totals, 5).tolist()
+            assert np.allclose(scores["total"][0, top], totals[top])
+
+        for mentor_id in mentor_ids[:5]:
+            totals = engine.score_ids([mentor_id], mentee_ids)["total"][:, 0]
+            top, _ = search.search([mentor_id], mentee_ids, 5, engine.score_ids)
+            assert top.tolist() == BatchScoringService.top_k(totals, 5).tolist()
+
+        stats = pruning_stats.snapshot()
+        assert stats["searches"] == 10 and stats["exhaustive_searches"] == 0
+        assert stats["candidates"] == 1000
+        assert stats["pruned"] == stats["candidates"] - stats["scored"] > 0
+
+    def test_cached_pairs_seed_the_heap(self, test_db: Session, monkeypatch):
+        generator = PopulationGenerator(test_db, 200, mentor_ratio=0.5, seed=5)
+        generator.generate()
+        monkeypatch.setattr(settings, "MATCHING_PRUNING_ENABLED", True)
+        monkeypatch.setattr(settings, "MATCHING_PRUNING_MIN_CANDIDATES", 0)
+        pruning_stats.reset()
+
+        engine = BatchScoringService(test_db)
+        cache = PairScoreCache(test_db)
+        mentor_ids = generator.mentor_ids.tolist()
+        mentee_id = int(generator.mentee_ids[0])
+        cache.get_scores(mentor_ids[:30], [mentee_id], engine.score_ids)
+
+        totals = engine.score_ids(mentor_ids, [mentee_id])["total"][0]
+        top, _ = PrunedTopK(test_db, chunk_size=8).search(
+            mentor_ids, [mentee_id], 5,
+            lambda m, e: cache.compute_scores(m, e, engine.score_ids),
+            known=cache.lookup(mentor_ids, [mentee_id])
+        )
+        assert top.tolist() == BatchScoringService.top_k(totals, 5).tolist()
+        stats = pruning_stats.snapshot()
+        assert stats["cached"] == 30 and stats["scored"] < 70
+
+    def test_few_candidates_are_scored_exhaustively(self, test_db: Session, monkeypatch):
+        generator = PopulationGenerator(test_db, 20, mentor_ratio=0.5, seed=4)
+        generator.generate()
+        monkeypatch.setattr(settings, "MATCHING_PRUNING_ENABLED", True)
+        pruning_stats.reset()
+
+        engine = BatchScoringService(test_db)
+        top, scores = PrunedTopK(test_db).search(generator.mentor_ids.tolist(), [int(generator.mentee_ids[0])],
+                                                 3, engine.score_ids)
+        assert len(top) == 3 and scores["total"].shape == (1, 10)
+        assert pruning_stats.snapshot()["exhaustive_searches"] == 1
@@ -0,0 +1,86 @@
+import os
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.models.base import Base
+from app.models.match_algorithm import MatchScore
+from app.services.batch_scoring import FeatureBlock
+from app.services.rescoring import RescoringJob
+
+@pytest.fixture
+def database_url(tmp_path):
+    # El trabajo abre sus propias conexiones, así que necesita una base de datos en archivo
+    url = f"sqlite:///{tmp_path / 'rescoring.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    db.add(Skill(id=1, name="Python", category="Programming"))
+    for user_id in (1, 2, 3):
+        db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                    password_hash="hash", role="mentor"))
+        db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+        db.add(MentorSkill(mentor_id=user_id, skill_id=1, proficiency_level=user_id))
+    for user_id in range(4, 9):
+        db.add(User(id=user_id, email=f"mentee{user_id}@example.com", name=f"Mentee {user_id}",
+                    password_hash="hash", role="mentee"))
+        db.add(Mentee(user_id=user_id, bio="Test bio", goals="Learn programming"))
+        db.add(MenteeInterest(mentee_id=user_id, skill_id=1, interest_level=3))
+    db.add(MatchScore(mentor_id=3, mentee_id=4, total_score=0.1, status="rejected"))
+    db.commit()
+    db.close()
+    engine.dispose()
+    return url
+
+def stored_pairs(database_url):
+    engine = create_engine(database_url)
+    db = sessionmaker(bind=engine)()
+    try:
+        return {(m.mentor_id, m.mentee_id): m.status for m in db.query(MatchScore)}
+    finally:
+        db.close()
+        engine.dispose()
+
+class TestRescoringJob:
+
+    def test_feature_block_round_trip(self, tmp_path):
+        block = FeatureBlock([7, 9])
+        block.skills = np.array([[1.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+        block.save(str(tmp_path))
+
+        loaded = FeatureBlock.load(str(tmp_path))
+        assert loaded.user_ids.tolist() == [7, 9] and loaded.index == {7: 0, 9: 1}
+        assert isinstance(loaded.skills, np.memmap)
+        assert loaded.take([1]).skills.tolist() == [[0.0, 2.0]]
+
+    def test_shards_write_best_mentors(self, database_url, tmp_path):
+        progress = []
+        result = RescoringJob(database_url, state_dir=str(tmp_path / "state"), shard_size=2,
+                              per_mentee=2).run(progress=progress.append)
+
+        assert result["shards"] == 3 and result["mentees"] == 5
+        assert [update["done"] for update in progress] == [1, 2, 3]
+        pairs = stored_pairs(database_url)
+        # Los dos mentores con más dominio; el par rechazado conserva su estado y no se sustituye
+        assert {pair for pair, status in pairs.items() if status == "suggested"} == (
+            {(3, mentee_id) for mentee_id in range(5, 9)} | {(2, mentee_id) for mentee_id in range(4, 9)} | {(1, 4)}
+        )
+        assert pairs[(3, 4)] == "rejected"
+
+    def test_resume_skips_finished_shards(self, database_url, tmp_path):
+        state_dir = str(tmp_path / "state")
+        job = RescoringJob(database_url, state_dir=state_dir, shard_size=2, per_mentee=1)
+        job.run()
+        os.remove(os.path.join(state_dir, "done", "1.json"))
+
+        result = job.run(resume=True)
+        assert result["skipped"] == 2 and result["mentees"] == 2
+
+    def test_worker_processes(self, database_url, tmp_path):
+        result = RescoringJob(database_url, state_dir=str(tmp_path / "state"), workers=2, shard_size=2,
+                              per_mentee=1).run()
+        assert result["pairs"] == 5
+        assert len(stored_pairs(database_url)) == 6
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest, Availability
+from app.services.batch_scoring import BatchScoringService
+from app.services.scorers import SCORING_PROFILES, scorer_registry
+from app.services.matching_algorithm import MatchingAlgorithm
+
+def create_profiles(test_db: Session):
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=3, mentoring_style="directive",
+                       expertise_areas=["Technical", "Leadership"]))
+    test_db.add(Mentor(user_id=2, bio="Test bio", experience_years=12, mentoring_style="collaborative"))
+    test_db.add(Mentee(user_id=3, bio="Test bio", goals="Learn programming", career_stage="early-career",
+                       learning_style="structured", specific_goals=[{"category": "Technical"}, {"category": "Career"}]))
+
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(Skill(id=2, name="SQL", category="Database"))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=1, proficiency_level=5))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=2, proficiency_level=3))
+    test_db.add(MenteeInterest(mentee_id=3, skill_id=1, interest_level=4))
+
+    test_db.add(Availability(user_id=1, day_of_week=1, start_time="09:00", end_time="11:00", recurrence="weekly"))
+    test_db.add(Availability(user_id=3, day_of_week=1, start_time="10:00", end_time="11:00", recurrence="weekly"))
+    test_db.commit()
+
+class TestScorerRegistry:
+
+    def test_profiles_reference_registered_plugins(self):
+        for profile in SCORING_PROFILES.values():
+            assert set(profile.components.values()) <= set(scorer_registry)
+        assert SCORING_PROFILES["matchmaking"].fields == {"skills", "industry", "preferences", "languages", "availability"}
+        assert SCORING_PROFILES["suggestions"].fields == {"skills", "availability", "profile"}
+
+    def test_pool_loads_only_profile_fields(self, test_db: Session):
+        create_profiles(test_db)
+
+        pool = BatchScoringService(test_db, profile="suggestions").load_pool()
+        assert hasattr(pool.mentors, "skills") and hasattr(pool.mentees, "learning_style")
+        assert not hasattr(pool.mentors, "industry_has") and not hasattr(pool.mentees, "has_preferences")
+
+    def test_suggestion_components(self, test_db: Session):
+        create_profiles(test_db)
+
+        scores = BatchScoringService(test_db, profile="suggestions").score_ids([1, 2], [3])
+        # Una habilidad común de dos del mentor 1; el mentor 2 no tiene habilidades
+        assert scores["skills"][0].tolist() == pytest.approx([0.5, 0.0])
+        # Una hora común frente a las dos horas del mentor 1
+        assert scores["schedule"][0].tolist() == pytest.approx([0.5, 0.0])
+        assert scores["style"][0].tolist() == pytest.approx([0.9, 0.6])
+        # Mitad de las áreas de objetivos cubiertas; 0.5 neutral sin áreas de experiencia
+        assert scores["goals"][0].tolist() == pytest.approx([0.5, 0.5])
+        assert scores["total"][0].tolist() == pytest.approx([
+            0.3 * 0.5 + 0.2 * 0.5 + 0.2 * 0.9 + 0.3 * 0.5, 0.2 * 0.6 + 0.3 * 0.5
+        ])
+
+    def test_algorithm_matches_use_engine_scores(self, test_db: Session):
+        create_profiles(test_db)
+        mentee = test_db.query(User).get(3)
+
+        matches = MatchingAlgorithm(test_db).generate_matches(mentee, limit=2)
+        assert [match["mentor_id"] for match in matches] == [1, 2]
+        # Mentor 1: 3 años en el rango de "early-career"; mentor 2 fuera de rango
+        assert matches[0]["match_details"]["experience_compatibility"] == 1.0
+        assert matches[1]["match_details"]["experience_compatibility"] == 0.5
+        assert matches[0]["skill_match_score"] == pytest.approx(0.5)
+        assert np.isclose(matches[0]["availability_score"], 0.5)
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.services.skill_index import SkillIndex
+
+@pytest.fixture
+def small_candidate_sets(monkeypatch):
+    # Permitir conjuntos de candidatos pequeños en las pruebas
+    monkeypatch.setattr(settings, "MATCHING_CANDIDATE_INDEX_ENABLED", True)
+    monkeypatch.setattr(settings, "MATCHING_CANDIDATE_MIN", 1)
+    monkeypatch.setattr(settings, "MATCHING_CANDIDATE_RECALL_FACTOR", 1)
+
+def create_profiles(test_db: Session):
+    test_db.add(User(id=1, email="mentor1@example.com", name="Mentor 1", password_hash="hash", role="mentor"))
+    test_db.add(User(id=2, email="mentor2@example.com", name="Mentor 2", password_hash="hash", role="mentor"))
+    test_db.add(User(id=3, email="mentor3@example.com", name="Mentor 3", password_hash="hash", role="mentor"))
+    test_db.add(User(id=4, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentor(user_id=1, bio="Test bio", experience_years=5, expertise_areas=["Backend"]))
+    test_db.add(Mentor(user_id=2, bio="Test bio", experience_years=3, expertise_areas=["Leadership"]))
+    test_db.add(Mentor(user_id=3, bio="Test bio", experience_years=7, expertise_areas=["Design"]))
+    test_db.add(Mentee(user_id=4, bio="Test bio", goals="Learn programming",
+                       specific_goals=[{"category": "leadership"}]))
+
+    test_db.add(Skill(id=1, name="Python", category="Programming"))
+    test_db.add(Skill(id=2, name="Figma", category="Design"))
+    test_db.add(MentorSkill(mentor_id=1, skill_id=1, proficiency_level=5))
+    test_db.add(MentorSkill(mentor_id=3, skill_id=2, proficiency_level=4))
+    test_db.add(MenteeInterest(mentee_id=4, skill_id=1, interest_level=5))
+    test_db.commit()
+
+class TestSkillIndex:
+
+    def test_candidates_share_skill_or_topic(self, test_db: Session, small_candidate_sets):
+        create_profiles(test_db)
+        index = SkillIndex()
+
+        # Mentor 1 comparte Python; el mentor 2 comparte el tema "leadership"
+        assert index.candidate_mentors(test_db, 4, limit=1) == {1, 2}
+        assert index.candidate_mentees(test_db, 1, limit=1) == {4}
+
+    def test_incremental_maintenance(self, test_db: Session, small_candidate_sets):
+        create_profiles(test_db)
+        index = SkillIndex()
+        index.build(test_db)
+
+        index.add_mentor_skill(3, 1)
+        assert index.candidate_mentors(test_db, 4, limit=1) == {1, 2, 3}
+
+        index.remove_mentor_skill(1, 1)
+        index.remove_mentor_skill(3, 1)
+        assert index.candidate_mentors(test_db, 4, limit=1) == {2}
+
+        index.remove_mentee_interest(4, 1)
+        assert index.candidate_mentees(test_db, 1, limit=1) is None
+
+    def test_refresh_user_reads_profile_changes(self, test_db: Session, small_candidate_sets):
+        create_profiles(test_db)
+        index = SkillIndex()
+        index.build(test_db)
+
+        mentor = test_db.query(Mentor).filter(Mentor.user_id == 3).first()
+        mentor.expertise_areas = ["Leadership"]
+        test_db.commit()
+        index.refresh_user(test_db, 3)
+
+        assert index.candidate_mentors(test_db, 4, limit=1) == {1, 2, 3}
+
+    def test_low_recall_falls_back_to_full_scan(self, test_db: Session, monkeypatch):
+        create_profiles(test_db)
+        monkeypatch.setattr(settings, "MATCHING_CANDIDATE_INDEX_ENABLED", True)
+        monkeypatch.setattr(settings, "MATCHING_CANDIDATE_MIN", 10)
+
+        assert SkillIndex().candidate_mentors(test_db, 4, limit=1) is None
@@ -0,0 +1,61 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import User, Mentor, Mentee, Skill, MentorSkill, MenteeInterest
+from app.services.batch_scoring import BatchScoringService
+from app.services.skill_matrices import SkillMatrices, skill_matrices
+
+def create_profiles(test_db: Session):
+    for skill_id, name in ((1, "Python"), (2, "SQL"), (3, "Go")):
+        test_db.add(Skill(id=skill_id, name=name, category="Programming"))
+    for user_id, levels in ((1, {1: 5, 2: 2}), (2, {2: 4}), (3, {})):
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor"))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+        for skill_id, level in levels.items():
+            test_db.add(MentorSkill(mentor_id=user_id, skill_id=skill_id, proficiency_level=level))
+    test_db.add(User(id=10, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentee(user_id=10, bio="Test bio", goals="Learn programming"))
+    test_db.add(MenteeInterest(mentee_id=10, skill_id=1, interest_level=3))
+    test_db.add(MenteeInterest(mentee_id=10, skill_id=2, interest_level=1))
+    test_db.commit()
+
+class TestSkillMatrices:
+
+    def test_rows_aligned_to_vocabulary(self, test_db: Session):
+        create_profiles(test_db)
+        matrices = SkillMatrices()
+        matrices.build(test_db)
+
+        mentors = matrices.rows("mentor", [2, 1, 3, 99], [3, 2, 1])
+        assert mentors.format == "csr"
+        assert mentors.toarray().tolist() == [[0, 4, 0], [0, 2, 5], [0, 0, 0], [0, 0, 0]]
+
+    def test_incremental_edits(self, test_db: Session):
+        create_profiles(test_db)
+        matrices = SkillMatrices()
+        matrices.build(test_db)
+
+        matrices.set_mentor_skill(3, 3, 4)   # usuario y habilidad nuevos en la matriz
+        matrices.set_mentor_skill(1, 2, 3)   # cambio de nivel
+        matrices.remove_mentor_skill(2, 2)
+        matrices.set_mentee_interest(10, 4, 2)  # habilidad nueva: amplía ambas matrices
+
+        assert matrices.rows("mentor", [1, 2, 3], [1, 2, 3, 4]).toarray().tolist() == [
+            [5, 3, 0, 0], [0, 0, 0, 0], [0, 0, 4, 0]
+        ]
+        assert matrices.rows("mentee", [10], [1, 2, 4]).toarray().tolist() == [[3, 1, 2]]
+        assert matrices.matrices["mentor"].shape[1] == matrices.matrices["mentee"].shape[1] == 4
+
+    def test_engine_scores_from_shared_matrices(self, test_db: Session, monkeypatch):
+        create_profiles(test_db)
+        expected = BatchScoringService(test_db).score_ids([1, 2, 3], [10])["skills"]
+        assert np.allclose(expected, [[(3 * 5 + 1 * 2) / 20, 4 / 20, 0]])
+
+        monkeypatch.setattr(settings, "MATCHING_SKILL_MATRICES_ENABLED", True)
+        skill_matrices.clear()
+        try:
+            assert np.allclose(BatchScoringService(test_db).score_ids([1, 2, 3], [10])["skills"], expected)
+        finally:
+            skill_matrices.clear()
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.match_algorithm import MatchScore, MatchFeedback
+from app.services.match_history import MatchHistory
+from app.services.weight_simulation import WeightSimulator, relevance
+
+def brute_force(history: MatchHistory, weights: np.ndarray, k: int):
+    """precision@k y NDCG@k grupo a grupo, par a par."""
+    labels, gains = history.labels(), relevance(history)
+    hits = slots = 0
+    ndcgs = []
+    for mentee_id in np.unique(history.mentee_ids[labels >= 0]):
+        rows = np.nonzero((history.mentee_ids == mentee_id) & (labels >= 0))[0]
+        ranked = sorted(rows, key=lambda row: -float(history.components[row] @ weights))[:k]
+        hits += sum(labels[row] for row in ranked)
+        slots += len(ranked)
+        ideal = sorted(gains[rows], reverse=True)[:k]
+        idcg = sum(gain / np.log2(i + 2) for i, gain in enumerate(ideal))
+        if idcg > 0:
+            ndcgs.append(sum(gains[row] / np.log2(i + 2) for i, row in enumerate(ranked)) / idcg)
+    return hits / slots, np.mean(ndcgs)
+
+class TestWeightSimulation:
+
+    def test_ranking_follows_weights(self, test_db: Session):
+        # Mentil 100: acepta al mentor con buenas habilidades, rechaza al de buen horario
+        test_db.add(MatchScore(id=1, mentor_id=1, mentee_id=100, skill_match_score=1.0, status="accepted"))
+        test_db.add(MatchScore(id=2, mentor_id=2, mentee_id=100, availability_score=1.0, status="rejected"))
+        test_db.add(MatchScore(id=3, mentor_id=3, mentee_id=100, style_match_score=0.5, status="suggested"))
+        test_db.add(MatchFeedback(match_id=1, user_id=100, rating=5))
+        test_db.commit()
+
+        simulator = WeightSimulator.from_db(test_db)
+        assert simulator.pairs == 2 and len(simulator) == 1 and simulator.base_rate == 0.5
+
+        metrics = simulator.evaluate(np.array([[1, 0, 0, 0], [0, 1, 0, 0]]), k=1)
+        assert metrics["precision_at_k"].tolist() == [1.0, 0.0]
+        assert metrics["ndcg_at_k"].tolist() == [1.0, 0.0]
+
+        result = simulator.simulate([{"skill_weight": 1, "availability_weight": 0, "style_weight": 0,
+                                      "goals_weight": 0}], k=1)
+        assert result["results"][0]["weights"]["skill_weight"] == 1.0
+        assert result["baseline"]["precision_at_k"] == 1.0  # 0.3 de habilidades frente a 0.2 de horario
+
+    def test_matches_brute_force(self, test_db: Session):
+        rng = np.random.default_rng(7)
+        statuses = ["accepted", "rejected", "active", "suggested"]
+        # Grupos de 5 pares y uno de 40 (comparación por parejas y ordenación)
+        for i in range(300):
+            test_db.add(MatchScore(
+                id=i + 1, mentor_id=i % 40 + 1, mentee_id=99 if i < 40 else 100 + i // 5,
+                skill_match_score=float(rng.random()), availability_score=float(rng.random()),
+                style_match_score=float(rng.random()), goals_alignment_score=float(rng.random()),
+                status=statuses[int(rng.integers(0, 4))]
+            ))
+            if rng.random() < 0.3:
+                test_db.add(MatchFeedback(match_id=i + 1, user_id=0, rating=int(rng.integers(1, 6))))
+        test_db.commit()
+
+        history = MatchHistory.load(test_db)
+        simulator = WeightSimulator(history)
+        weights = rng.random((5, 4)).astype(np.float32)
+        metrics = simulator.evaluate(weights, k=3)
+        for i, vector in enumerate(weights):
+            precision, ndcg = brute_force(history, vector, 3)
+            assert metrics["precision_at_k"][i] == pytest.approx(precision)
+            assert metrics["ndcg_at_k"][i] == pytest.approx(ndcg, rel=1e-5)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import User, Mentor, Mentee
+from app.models.match_algorithm import PairScore, MatchPreference
+from app.services.matching import MatchingService
+from app.services.weighted_ranking import ComponentMatrix, ComponentMatrixStore, weight_vector
+
+def create_profiles(test_db: Session):
+    for user_id in (1, 2):
+        test_db.add(User(id=user_id, email=f"mentor{user_id}@example.com", name=f"Mentor {user_id}",
+                         password_hash="hash", role="mentor"))
+        test_db.add(Mentor(user_id=user_id, bio="Test bio", experience_years=5))
+    test_db.add(User(id=3, email="mentee@example.com", name="Mentee Test", password_hash="hash", role="mentee"))
+    test_db.add(Mentee(user_id=3, bio="Test bio", goals="Learn programming"))
+
+    # Componentes ya en caché: mentor 1 destaca en habilidades, mentor 2 en disponibilidad
+    test_db.add(PairScore(scorer="suggestions", mentor_id=1, mentee_id=3, mentor_version=0, mentee_version=0,
+                          skills_score=1.0, schedule_score=0.0, style_score=0.5, goals_score=0.5, total_score=0.55))
+    test_db.add(PairScore(scorer="suggestions", mentor_id=2, mentee_id=3, mentor_version=0, mentee_version=0,
+                          skills_score=0.0, schedule_score=1.0, style_score=0.5, goals_score=0.5, total_score=0.45))
+    test_db.commit()
+
+class TestWeightedRanking:
+
+    def test_weight_vector(self):
+        assert weight_vector().tolist() == pytest.approx([0.3, 0.2, 0.2, 0.3])
+        assert weight_vector({"skill_weight": 2, "availability_weight": 2, "style_weight": 0,
+                              "goals_weight": 0}).tolist() == pytest.approx([0.5, 0.5, 0, 0])
+        assert weight_vector({"skill_weight": 0, "availability_weight": 0, "style_weight": 0,
+                              "goals_weight": 0}).tolist() == pytest.approx([0.3, 0.2, 0.2, 0.3])
+
+    def test_rank_is_matrix_vector_product(self):
+        matrix = ComponentMatrix(3, "mentee", [4, 7, 9], np.array([
+            [1.0, 0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [1.0, 0.0, 0.0, 0.0]
+        ]))
+
+        rows, totals = matrix.rank(weight_vector({"skill_weight": 1, "availability_weight": 0,
+                                                  "style_weight": 0, "goals_weight": 0}), 2)
+        assert [matrix.pair(row) for row in rows] == [(4, 3), (9, 3)]
+        assert totals.tolist() == pytest.approx([1.0, 1.0])
+
+        rows, _ = matrix.rank(weight_vector({"skill_weight": 0, "availability_weight": 1,
+                                             "style_weight": 0, "goals_weight": 0}), 1)
+        assert [matrix.pair(row) for row in rows] == [(7, 3)]
+
+    def test_suggestions_use_preference_weights(self, test_db: Session):
+        create_profiles(test_db)
+        service = MatchingService(test_db)
+        mentee = test_db.query(User).get(3)
+
+        default = service.get_suggestions(mentee, limit=1)
+        assert [match.mentor_id for match in default] == [1]
+
+        test_db.add(MatchPreference(user_id=3, skill_weight=0.0, availability_weight=1.0,
+                                    style_weight=0.0, goals_weight=0.0))
+        test_db.commit()
+        weighted = service.get_suggestions(mentee, limit=1)
+        assert [match.mentor_id for match in weighted] == [2]
+        assert weighted[0].total_score == pytest.approx(1.0)
+
+    def test_store_reuses_matrix_until_invalidated(self):
+        store = ComponentMatrixStore()
+        builds = []
+
+        def build():
+            builds.append(1)
+            return ComponentMatrix(3, "mentee", [1], np.zeros((1, 4)))
+
+        store.get(3, build)
+        store.get(3, build)
+        store.invalidate(3)
+        store.get(3, build)
+        assert len(builds) == 2
+
+    def test_store_keys_matrices_by_recall(self):
+        store = ComponentMatrixStore()
+
+        def build(recall, candidates):
+            return lambda: ComponentMatrix(3, "mentee", list(range(candidates)), np.zeros((candidates, 4)), recall=recall)
+
+        # Un límite mayor no reutiliza la matriz construida con uno menor
+        assert len(store.get(3, build(2, 2), recall=2)) == 2
+        assert len(store.get(3, build(5, 5), recall=5)) == 5
+        assert len(store.get(3, build(2, 9), recall=2)) == 2
+        # invalidate descarta las matrices de todos los límites
+        store.invalidate(3)
+        assert len(store.get(3, build(5, 4), recall=5)) == 4